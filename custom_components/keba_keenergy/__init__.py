@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 import socket
+from functools import partial
 from typing import TYPE_CHECKING
 
 from homeassistant.const import CONF_HOST
@@ -11,15 +12,24 @@ from homeassistant.const import CONF_PASSWORD
 from homeassistant.const import CONF_SSL
 from homeassistant.const import CONF_USERNAME
 from homeassistant.const import Platform
+from homeassistant.core import callback
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
+from .cache import FixedDataCache
+from .const import CONF_RECORD_TRAFFIC
+from .const import DEFAULT_RECORD_TRAFFIC
 from .const import DOMAIN
 from .const import MANUFACTURER
+from .const import MAX_CONCURRENT_REQUESTS
+from .const import TRAFFIC_RECORD_MAX_EXCHANGES
 from .coordinator import KebaKeEnergyConfigEntry
 from .coordinator import KebaKeEnergyDataUpdateCoordinator
+from .scheduler import EntryPollScheduler
 from .services import async_setup_services
+from .traffic import TrafficRecorder
 
 if TYPE_CHECKING:
     from aiohttp import ClientSession
@@ -47,6 +57,15 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:  # noqa:
     return True
 
 
+@callback
+def _async_remove_from_poll_scheduler(hass: HomeAssistant, entry: KebaKeEnergyConfigEntry) -> None:
+    poll_scheduler: EntryPollScheduler = hass.data[DOMAIN]
+    poll_scheduler.remove(entry.entry_id)
+
+    if not poll_scheduler:
+        hass.data.pop(DOMAIN)
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: KebaKeEnergyConfigEntry) -> bool:
     """Set up the KEBA KeEnergy platform."""
     host: str = entry.data[CONF_HOST]
@@ -54,8 +73,30 @@ async def async_setup_entry(hass: HomeAssistant, entry: KebaKeEnergyConfigEntry)
     password: str | None = entry.data.get(CONF_PASSWORD)
     ssl: bool = entry.data[CONF_SSL]
 
-    # Newer software versions of the Web HMI comes with self-signed SSL certificates
-    session: ClientSession = async_get_clientsession(hass, verify_ssl=False, family=socket.AF_INET)
+    traffic_recorder: TrafficRecorder | None = None
+
+    # The poll scheduler is shared by all entries and spreads their polls over the update interval
+    poll_scheduler: EntryPollScheduler = hass.data.setdefault(
+        DOMAIN,
+        EntryPollScheduler(max_concurrent_requests=MAX_CONCURRENT_REQUESTS),
+    )
+    poll_scheduler.add(entry.entry_id)
+    entry.async_on_unload(partial(_async_remove_from_poll_scheduler, hass, entry))
+
+    if entry.options.get(CONF_RECORD_TRAFFIC, DEFAULT_RECORD_TRAFFIC):
+        # The recorder traces the requests of an own client session
+        traffic_recorder = TrafficRecorder(max_exchanges=TRAFFIC_RECORD_MAX_EXCHANGES)
+        # Newer software versions of the Web HMI comes with self-signed SSL certificates
+        session: ClientSession = async_create_clientsession(
+            hass,
+            verify_ssl=False,
+            family=socket.AF_INET,
+            trace_configs=[traffic_recorder.trace_config],
+        )
+        entry.async_on_unload(session.close)
+    else:
+        # Newer software versions of the Web HMI comes with self-signed SSL certificates
+        session = async_get_clientsession(hass, verify_ssl=False, family=socket.AF_INET)
 
     coordinator: KebaKeEnergyDataUpdateCoordinator = KebaKeEnergyDataUpdateCoordinator(
         hass,
@@ -65,6 +106,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: KebaKeEnergyConfigEntry)
         password=password,
         ssl=ssl,
         session=session,
+        traffic_recorder=traffic_recorder,
+        poll_scheduler=poll_scheduler,
     )
 
     await coordinator.async_config_entry_first_refresh()
@@ -86,9 +129,27 @@ async def async_setup_entry(hass: HomeAssistant, entry: KebaKeEnergyConfigEntry)
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    if coordinator.fixed_data_from_cache:
+        entry.async_create_background_task(
+            hass,
+            coordinator.async_revalidate_fixed_data_cache(),
+            name=f"{DOMAIN}_revalidate_fixed_data_cache",
+        )
+
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: KebaKeEnergyConfigEntry) -> bool:
     """Unload a config entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    unload_ok: bool = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+
+    if unload_ok:
+        await entry.runtime_data.async_shutdown()
+
+    return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: KebaKeEnergyConfigEntry) -> None:
+    """Remove the cached fixed data of a removed config entry."""
+    if entry.unique_id:
+        await FixedDataCache(hass, serial_number=entry.unique_id).async_remove()
@@ -0,0 +1,61 @@
+"""Flash write budget for the KEBA KeEnergy integration."""
+
+from __future__ import annotations
+
+from enum import IntEnum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from datetime import date
+    from homeassistant.core import Context
+
+
+class WritePriority(IntEnum):
+    """Priority classes of write requests (a higher value is more important)."""
+
+    AUTOMATION = 0
+    SERVICE = 1
+    USER = 2
+
+
+def get_iso_week(day: date, /) -> tuple[int, int]:
+    """Return the ISO year and week of a day."""
+    iso_calendar = day.isocalendar()
+    return iso_calendar.year, iso_calendar.week
+
+
+def get_write_priority(context: Context | None, /) -> WritePriority:
+    """Return the priority of an entity write request from the context of the service call.
+
+    A context with a user id is user-initiated (e.g. from the dashboard), all other
+    calls are handled as automations.
+    """
+    return WritePriority.USER if context and context.user_id else WritePriority.AUTOMATION
+
+
+class FlashWriteBudget:
+    """Token bucket with the flash write limit as tokens per ISO week.
+
+    Every flash write takes a token and the bucket is refilled at the start of an
+    ISO week. Lower priority classes must leave a reserve of tokens for the higher
+    priority classes: automation writes are deferred when the remaining tokens
+    reach the automation reserve, service writes are rejected when no token is
+    left. User-initiated writes are always allowed.
+    """
+
+    def __init__(self, limit: int, /, *, automation_reserve: int) -> None:
+        """Initialize."""
+        self.limit: int = limit
+        self._reserves: dict[WritePriority, int] = {
+            WritePriority.AUTOMATION: min(automation_reserve, limit),
+            WritePriority.SERVICE: 0,
+        }
+
+    def remaining(self, count: int, /) -> int:
+        """Return the remaining tokens for the number of flash writes of the week."""
+        return max(self.limit - count, 0)
+
+    def allows(self, priority: WritePriority, /, *, count: int) -> bool:
+        """Check if a write with the priority is allowed after the number of flash writes of the week."""
+        reserve: int | None = self._reserves.get(priority)
+        return reserve is None or self.remaining(count) > reserve
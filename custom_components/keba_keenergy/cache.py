@@ -0,0 +1,164 @@
+"""Warm-start cache for the fixed data of the KEBA KeEnergy integration."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import asdict
+from dataclasses import dataclass
+from typing import Any
+from typing import TYPE_CHECKING
+
+from homeassistant.helpers.storage import Store
+from keba_keenergy_api.endpoints import Position
+
+from .capabilities import CapabilityTable
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from homeassistant.core import HomeAssistant
+    from keba_keenergy_api.constants import Section
+    from keba_keenergy_api.endpoints import ValueResponse
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def get_section_name(section: Section) -> str:
+    """Return the serializable name (e.g. HeatCircuit.TARGET_TEMPERATURE) of a section."""
+    return f"{section.__class__.__name__}.{section.name}"
+
+
+def get_hmi_sw_version(hmi_info: dict[str, Any]) -> str:
+    """Return the HMI software version of the HMI info."""
+    return str(hmi_info["name"].replace("KeEnergy.WebHmi_", ""))
+
+
+@dataclass(slots=True)
+class FixedData:
+    """Data that only changes with the setup or the software of the control unit."""
+
+    device_info: dict[str, Any]
+    system_info: dict[str, Any]
+    hmi_info: dict[str, Any]
+    position: Position
+    available_heating_curves: tuple[tuple[int, str], ...]
+    request_data: list[Section]
+    fixed_data: dict[str, ValueResponse]
+
+    @property
+    def serial_number(self) -> str:
+        """Return the serial number of the control unit."""
+        return str(self.device_info["serNo"])
+
+    @property
+    def hmi_sw_version(self) -> str:
+        """Return the HMI software version of the control unit."""
+        return get_hmi_sw_version(self.hmi_info)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the fixed data as JSON serializable dictionary."""
+        return {
+            "serial_number": self.serial_number,
+            "hmi_sw_version": self.hmi_sw_version,
+            "device_info": self.device_info,
+            "system_info": self.system_info,
+            "hmi_info": self.hmi_info,
+            "position": asdict(self.position),
+            "available_heating_curves": [list(heating_curve) for heating_curve in self.available_heating_curves],
+            "request_data": [get_section_name(section) for section in self.request_data],
+            "fixed_data": self.fixed_data,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], /, *, sections: Iterable[Section]) -> FixedData:
+        """Create the fixed data from a dictionary.
+
+        Raises KeyError, TypeError or ValueError if the dictionary is invalid or
+        contains unknown sections.
+        """
+        sections_by_name: dict[str, Section] = {get_section_name(section): section for section in sections}
+
+        fixed_data: FixedData = cls(
+            device_info=dict(data["device_info"]),
+            system_info=dict(data["system_info"]),
+            hmi_info=dict(data["hmi_info"]),
+            position=Position(**data["position"]),
+            available_heating_curves=tuple(
+                (int(heating_curve[0]), str(heating_curve[1])) for heating_curve in data["available_heating_curves"]
+            ),
+            request_data=[sections_by_name[name] for name in data["request_data"]],
+            fixed_data=dict(data["fixed_data"]),
+        )
+
+        if fixed_data.serial_number != str(data["serial_number"]) or fixed_data.hmi_sw_version != str(
+            data["hmi_sw_version"],
+        ):
+            msg: str = "Cache key does not match the cached data"
+            raise ValueError(msg)
+
+        return fixed_data
+
+
+def get_fixed_data_changes(cached: FixedData, current: FixedData, /) -> list[str]:
+    """Return the names of the parts of the fixed data that differ from the cached fixed data.
+
+    The capabilities are compared instead of the raw fixed data, so attributes of
+    the fixed values (e.g. limits) do not invalidate the cache.
+    """
+    changes: list[str] = [
+        name
+        for name in (
+            "device_info",
+            "system_info",
+            "hmi_info",
+            "position",
+            "available_heating_curves",
+            "request_data",
+        )
+        if getattr(cached, name) != getattr(current, name)
+    ]
+
+    if CapabilityTable.from_fixed_data(cached.fixed_data) != CapabilityTable.from_fixed_data(current.fixed_data):
+        changes.append("capabilities")
+
+    return changes
+
+
+class FixedDataCache:
+    """Persist the fixed data of a control unit to skip the requests on the next start.
+
+    The cache is stored per serial number and is only valid for the HMI software
+    version it was created with.
+    """
+
+    def __init__(self, hass: HomeAssistant, /, *, serial_number: str) -> None:
+        """Initialize."""
+        self.serial_number: str = serial_number
+        self._store: Store[dict[str, Any]] = Store(hass, version=1, key=f"{DOMAIN}.fixed_data.{serial_number}")
+
+    async def async_load(self, *, sections: Iterable[Section]) -> FixedData | None:
+        """Load the fixed data or return None if the cache is empty or invalid."""
+        data: dict[str, Any] | None = await self._store.async_load()
+
+        if not data:
+            return None
+
+        try:
+            fixed_data: FixedData = FixedData.from_dict(data, sections=sections)
+        except (AttributeError, KeyError, TypeError, ValueError) as error:
+            _LOGGER.debug("Ignore invalid fixed data cache: %r", error)
+            return None
+
+        if fixed_data.serial_number != self.serial_number:
+            _LOGGER.debug("Ignore fixed data cache of serial number %s", fixed_data.serial_number)
+            return None
+
+        return fixed_data
+
+    async def async_save(self, fixed_data: FixedData, /) -> None:
+        """Save the fixed data."""
+        await self._store.async_save(fixed_data.as_dict())
+
+    async def async_remove(self) -> None:
+        """Remove the cached fixed data."""
+        await self._store.async_remove()
@@ -0,0 +1,144 @@
+"""Capabilities of a control unit for the KEBA KeEnergy integration."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+from typing import Final
+from typing import TYPE_CHECKING
+
+from keba_keenergy_api.constants import BoolEnum
+from keba_keenergy_api.constants import HeatCircuitMode
+from keba_keenergy_api.constants import SectionPrefix
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Mapping
+    from keba_keenergy_api.endpoints import ValueResponse
+
+ON: Final[str] = BoolEnum.ON.name.lower()
+
+COOLING_CIRCUIT_MODES: Final[frozenset[str]] = frozenset(
+    {
+        HeatCircuitMode.COOLING.name.lower(),
+        HeatCircuitMode.HEATING_AND_COOLING.name.lower(),
+        HeatCircuitMode.HEATING_AND_ACTIVE_COOLING.name.lower(),
+    },
+)
+
+HEATING_CIRCUIT_MODES: Final[frozenset[str]] = frozenset(
+    {
+        HeatCircuitMode.HEATING.name.lower(),
+        HeatCircuitMode.HEATING_AND_COOLING.name.lower(),
+        HeatCircuitMode.HEATING_AND_ACTIVE_COOLING.name.lower(),
+    },
+)
+
+
+def is_on(value: Any) -> bool:
+    """Check if a value is switched on."""
+    return bool(value == ON)
+
+
+def is_positive(value: Any) -> bool:
+    """Check if a value is greater than zero."""
+    return bool(value > 0)
+
+
+def is_cooling_mode(value: Any) -> bool:
+    """Check if a heating circuit mode supports cooling."""
+    return value in COOLING_CIRCUIT_MODES
+
+
+def is_heating_mode(value: Any) -> bool:
+    """Check if a heating circuit mode supports heating."""
+    return value in HEATING_CIRCUIT_MODES
+
+
+def _get_flag(fixed_data: Mapping[str, ValueResponse], prefix: SectionPrefix, key: str, /) -> bool:
+    data: Any = fixed_data.get(prefix, {}).get(key)
+    return is_on(data["value"]) if data else False
+
+
+def _get_flags(
+    fixed_data: Mapping[str, ValueResponse],
+    prefix: SectionPrefix,
+    key: str,
+    /,
+    *,
+    check: Callable[[Any], bool] = is_on,
+) -> tuple[bool, ...]:
+    data: Any = fixed_data.get(prefix, {}).get(key)
+    return tuple(check(value["value"]) for value in data) if data else ()
+
+
+@dataclass(frozen=True, slots=True)
+class CapabilityTable:
+    """Immutable capabilities of a control unit.
+
+    The table is computed once from the fixed data. Capabilities of devices with a
+    position (e.g. heating circuits) have one flag per index.
+    """
+
+    has_outdoor_temperature: bool = False
+    has_photovoltaics: bool = False
+    has_room_temperature: tuple[bool, ...] = ()
+    has_room_humidity: tuple[bool, ...] = ()
+    has_mixer: tuple[bool, ...] = ()
+    has_return_flow_temperature: tuple[bool, ...] = ()
+    has_pump: tuple[bool, ...] = ()
+    has_var_speed_pump: tuple[bool, ...] = ()
+    has_fresh_water_module: tuple[bool, ...] = ()
+    has_electrical_energy_meter: tuple[bool, ...] = ()
+    has_heat_meter: tuple[bool, ...] = ()
+    has_active_cooling: tuple[bool, ...] = ()
+    has_passive_cooling: tuple[bool, ...] = ()
+    is_cooling_circuit: tuple[bool, ...] = ()
+    is_heating_circuit: tuple[bool, ...] = ()
+    has_cooling_circuits: bool = False
+
+    @classmethod
+    def from_fixed_data(cls, fixed_data: Mapping[str, ValueResponse], /) -> CapabilityTable:
+        """Create the capability table from the fixed data."""
+        # Some KEBA KeEnergy software versions did not have an active or passive cooling options.
+        # Cooling support can only be detected with the heating circuit mode!
+        is_cooling_circuit: tuple[bool, ...] = _get_flags(
+            fixed_data,
+            SectionPrefix.HEAT_CIRCUIT,
+            "mode",
+            check=is_cooling_mode,
+        )
+
+        return cls(
+            has_outdoor_temperature=_get_flag(fixed_data, SectionPrefix.SYSTEM, "has_outdoor_temperature"),
+            has_photovoltaics=_get_flag(fixed_data, SectionPrefix.SYSTEM, "has_photovoltaics"),
+            has_room_temperature=_get_flags(fixed_data, SectionPrefix.HEAT_CIRCUIT, "has_room_temperature"),
+            has_room_humidity=_get_flags(fixed_data, SectionPrefix.HEAT_CIRCUIT, "has_room_humidity"),
+            has_mixer=_get_flags(fixed_data, SectionPrefix.HEAT_CIRCUIT, "has_mixer"),
+            has_return_flow_temperature=_get_flags(
+                fixed_data,
+                SectionPrefix.HEAT_CIRCUIT,
+                "has_return_flow_temperature",
+            ),
+            has_pump=_get_flags(fixed_data, SectionPrefix.HEAT_CIRCUIT, "has_pump"),
+            has_var_speed_pump=_get_flags(fixed_data, SectionPrefix.HEAT_CIRCUIT, "has_var_speed_pump"),
+            has_fresh_water_module=_get_flags(fixed_data, SectionPrefix.HOT_WATER_TANK, "has_fresh_water_module"),
+            has_electrical_energy_meter=_get_flags(
+                fixed_data,
+                SectionPrefix.HEAT_PUMP,
+                "electric_energy_meter_type",
+                check=is_positive,
+            ),
+            has_heat_meter=_get_flags(fixed_data, SectionPrefix.HEAT_PUMP, "heat_meter_type", check=is_positive),
+            has_active_cooling=_get_flags(fixed_data, SectionPrefix.HEAT_PUMP, "has_active_cooling"),
+            has_passive_cooling=_get_flags(fixed_data, SectionPrefix.HEAT_PUMP, "has_passive_cooling"),
+            is_cooling_circuit=is_cooling_circuit,
+            is_heating_circuit=_get_flags(fixed_data, SectionPrefix.HEAT_CIRCUIT, "mode", check=is_heating_mode),
+            has_cooling_circuits=any(is_cooling_circuit),
+        )
+
+    @staticmethod
+    def get(flags: tuple[bool, ...], /, *, index: int | None = None) -> bool:
+        """Return the flag of an index or False if the index is not available."""
+        index = 0 if index is None else index
+        return index < len(flags) and flags[index]
@@ -112,6 +112,19 @@ class KebaKeEnergyClimateEntity(KebaKeEnergyBaseEntity, ClimateEntity):
         self._pending_section = HeatCircuit.TARGET_TEMPERATURE_OFFSET
         self._pending_device_numbers = self.coordinator.heat_circuit_numbers
 
+    @property
+    def consumed_keys(self) -> tuple[str, ...]:
+        """Return the keys of the coordinator data that the entity reads."""
+        return (
+            "room_temperature",
+            "room_humidity",
+            "selected_target_temperature",
+            "target_temperature_offset",
+            "operating_mode",
+            "heat_request",
+            "cool_request",
+        )
+
     @cached_property
     def _is_heating(self) -> bool:
         return self.coordinator.is_heating_circuit(index=self.index) and not self.coordinator.is_cooling_circuit(
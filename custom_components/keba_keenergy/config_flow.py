@@ -22,6 +22,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.selector import BooleanSelector
 from homeassistant.helpers.selector import NumberSelector
 from homeassistant.helpers.selector import NumberSelectorConfig
 from homeassistant.helpers.selector import NumberSelectorMode
@@ -30,16 +31,36 @@ from keba_keenergy_api.constants import SectionPrefix
 from keba_keenergy_api.error import APIError
 
 from .const import CONFIG_ENTRY_VERSION
+from .const import CONF_ADAPTIVE_POLLING
+from .const import CONF_ADAPTIVE_POLLING_MAX_TICK
 from .const import CONF_BUFFER_TANK_TICK
 from .const import CONF_EXTERNAL_HEAT_SOURCE_TICK
+from .const import CONF_FLASH_WRITE_BUDGET
 from .const import CONF_HEAT_CIRCUIT_TICK
 from .const import CONF_HEAT_PUMP_TICK
 from .const import CONF_HOT_WATER_TANK_TICK
 from .const import CONF_PHOTOVOLTAICS_TICK
+from .const import CONF_POLL_ENABLED_ENTITIES_ONLY
+from .const import CONF_RECORD_TRAFFIC
+from .const import CONF_REFRESH_AFTER_WRITE
+from .const import CONF_REQUEST_CHUNK_AUTO_TUNE
+from .const import CONF_REQUEST_CHUNK_SIZE
+from .const import CONF_REQUEST_CONCURRENCY
 from .const import CONF_SOLAR_CIRCUIT_TICK
 from .const import CONF_SWITCH_VALVE_TICK
 from .const import CONF_SYSTEM_TICK
+from .const import CONF_VALUES_ONLY_POLLING
+from .const import DEFAULT_ADAPTIVE_POLLING
+from .const import DEFAULT_ADAPTIVE_POLLING_MAX_TICK
+from .const import DEFAULT_FLASH_WRITE_BUDGET
+from .const import DEFAULT_POLL_ENABLED_ENTITIES_ONLY
+from .const import DEFAULT_RECORD_TRAFFIC
+from .const import DEFAULT_REFRESH_AFTER_WRITE
+from .const import DEFAULT_REQUEST_CHUNK_AUTO_TUNE
+from .const import DEFAULT_REQUEST_CHUNK_SIZE
+from .const import DEFAULT_REQUEST_CONCURRENCY
 from .const import DEFAULT_SCAN_INTERVAL
+from .const import DEFAULT_VALUES_ONLY_POLLING
 from .const import DOMAIN
 from .const import MANUFACTURER
 from .const import MIN_SCAN_INTERVAL
@@ -312,6 +333,10 @@ class KebaKeEnergyOptionsFlow(OptionsFlowWithReload):
             CONF_PHOTOVOLTAICS_TICK,
         ]
 
+        for key in (CONF_ADAPTIVE_POLLING_MAX_TICK, CONF_REQUEST_CHUNK_SIZE, CONF_REQUEST_CONCURRENCY):
+            if key in user_input:
+                user_input[key] = int(user_input[key])
+
         ticks: list[int] = [int(user_input.get(k, 1)) for k in tick_keys if k in user_input]
 
         if ticks:
@@ -324,6 +349,12 @@ class KebaKeEnergyOptionsFlow(OptionsFlowWithReload):
                     if key in user_input:
                         user_input[key] = int(user_input[key] // gcd)
 
+                if CONF_ADAPTIVE_POLLING_MAX_TICK in user_input:
+                    user_input[CONF_ADAPTIVE_POLLING_MAX_TICK] = max(
+                        1,
+                        math.ceil(user_input[CONF_ADAPTIVE_POLLING_MAX_TICK] / gcd),
+                    )
+
         _LOGGER.debug(
             "Tick normalization: %s -> gcd=%s",
             user_input,
@@ -405,6 +436,103 @@ class KebaKeEnergyOptionsFlow(OptionsFlowWithReload):
                     ),
                 )
 
+        schema_fields[
+            vol.Required(
+                CONF_ADAPTIVE_POLLING,
+                default=self.config_entry.options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING),
+            )
+        ] = BooleanSelector()
+
+        schema_fields[
+            vol.Required(
+                CONF_ADAPTIVE_POLLING_MAX_TICK,
+                default=self.config_entry.options.get(
+                    CONF_ADAPTIVE_POLLING_MAX_TICK,
+                    DEFAULT_ADAPTIVE_POLLING_MAX_TICK,
+                ),
+            )
+        ] = NumberSelector(
+            NumberSelectorConfig(
+                min=1,
+                max=180,
+                step=1,
+                mode=NumberSelectorMode.BOX,
+            ),
+        )
+
+        schema_fields[
+            vol.Required(
+                CONF_REQUEST_CHUNK_SIZE,
+                default=self.config_entry.options.get(CONF_REQUEST_CHUNK_SIZE, DEFAULT_REQUEST_CHUNK_SIZE),
+            )
+        ] = NumberSelector(
+            NumberSelectorConfig(
+                min=0,
+                max=1000,
+                step=1,
+                mode=NumberSelectorMode.BOX,
+            ),
+        )
+
+        schema_fields[
+            vol.Required(
+                CONF_REQUEST_CONCURRENCY,
+                default=self.config_entry.options.get(CONF_REQUEST_CONCURRENCY, DEFAULT_REQUEST_CONCURRENCY),
+            )
+        ] = NumberSelector(
+            NumberSelectorConfig(
+                min=1,
+                max=8,
+                step=1,
+                mode=NumberSelectorMode.BOX,
+            ),
+        )
+
+        schema_fields[
+            vol.Required(
+                CONF_REQUEST_CHUNK_AUTO_TUNE,
+                default=self.config_entry.options.get(CONF_REQUEST_CHUNK_AUTO_TUNE, DEFAULT_REQUEST_CHUNK_AUTO_TUNE),
+            )
+        ] = BooleanSelector()
+
+        schema_fields[
+            vol.Required(
+                CONF_POLL_ENABLED_ENTITIES_ONLY,
+                default=self.config_entry.options.get(
+                    CONF_POLL_ENABLED_ENTITIES_ONLY,
+                    DEFAULT_POLL_ENABLED_ENTITIES_ONLY,
+                ),
+            )
+        ] = BooleanSelector()
+
+        schema_fields[
+            vol.Required(
+                CONF_VALUES_ONLY_POLLING,
+                default=self.config_entry.options.get(CONF_VALUES_ONLY_POLLING, DEFAULT_VALUES_ONLY_POLLING),
+            )
+        ] = BooleanSelector()
+
+        schema_fields[
+            vol.Required(
+                CONF_FLASH_WRITE_BUDGET,
+                default=self.config_entry.options.get(CONF_FLASH_WRITE_BUDGET, DEFAULT_FLASH_WRITE_BUDGET),
+            )
+        ] = BooleanSelector()
+
+        schema_fields[
+            vol.Required(
+                CONF_REFRESH_AFTER_WRITE,
+                default=self.config_entry.options.get(CONF_REFRESH_AFTER_WRITE, DEFAULT_REFRESH_AFTER_WRITE),
+            )
+        ] = BooleanSelector()
+
+        schema_fields[
+            vol.Required(
+                CONF_RECORD_TRAFFIC,
+                default=self.config_entry.options.get(CONF_RECORD_TRAFFIC, DEFAULT_RECORD_TRAFFIC),
+            )
+        ] = BooleanSelector()
+
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema(schema_fields),
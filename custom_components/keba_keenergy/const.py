@@ -4,30 +4,63 @@ from __future__ import annotations
 
 from typing import Final
 
+ADAPTIVE_POLLING_STABLE_POLLS: Final[int] = 3
 ATTR_CONFIG_ENTRY: Final = "config_entry"
 ATTR_OFFSET: Final[str] = "offset"
+ATTRIBUTE_REFRESH_TICKS: Final[int] = 720
+CHUNK_SIZE_CANDIDATES: Final[tuple[int, ...]] = (0, 50, 100, 200)
+CHUNK_SIZE_TUNER_RETUNE_INTERVAL: Final[int] = 1000
+CHUNK_SIZE_TUNER_SAMPLES: Final[int] = 3
+CONF_ADAPTIVE_POLLING: Final[str] = "adaptive_polling"
+CONF_ADAPTIVE_POLLING_MAX_TICK: Final[str] = "adaptive_polling_max_tick"
 CONF_EXTERNAL_HEAT_SOURCE_TICK: Final[str] = "scan_interval_tick_external_heat_source"
 CONF_BUFFER_TANK_TICK: Final[str] = "scan_interval_tick_buffer_tank"
+CONF_FLASH_WRITE_BUDGET: Final[str] = "flash_write_budget"
 CONF_HEAT_CIRCUIT_TICK: Final[str] = "scan_interval_tick_heat_circuit"
 CONF_HEAT_PUMP_TICK: Final[str] = "scan_interval_tick_heat_pump"
 CONF_HOT_WATER_TANK_TICK: Final[str] = "scan_interval_tick_hot_water_tank"
 CONF_PHOTOVOLTAICS_TICK: Final[str] = "scan_interval_tick_photovoltaics"
+CONF_POLL_ENABLED_ENTITIES_ONLY: Final[str] = "poll_enabled_entities_only"
+CONF_RECORD_TRAFFIC: Final[str] = "record_traffic"
+CONF_REFRESH_AFTER_WRITE: Final[str] = "refresh_after_write"
+CONF_REQUEST_CHUNK_AUTO_TUNE: Final[str] = "request_chunk_auto_tune"
+CONF_REQUEST_CHUNK_SIZE: Final[str] = "request_chunk_size"
+CONF_REQUEST_CONCURRENCY: Final[str] = "request_concurrency"
 CONF_SOLAR_CIRCUIT_TICK: Final[str] = "scan_interval_tick_solar_circuit"
 CONF_SWITCH_VALVE_TICK: Final[str] = "scan_interval_tick_switch_valve"
 CONF_SYSTEM_TICK: Final[str] = "scan_interval_tick_system"
+CONF_VALUES_ONLY_POLLING: Final[str] = "values_only_polling"
 CONFIG_ENTRY_VERSION: Final[int] = 1
+DEFAULT_ADAPTIVE_POLLING: Final[bool] = False
+DEFAULT_ADAPTIVE_POLLING_MAX_TICK: Final[int] = 8
+DEFAULT_FLASH_WRITE_BUDGET: Final[bool] = False
+DEFAULT_POLL_ENABLED_ENTITIES_ONLY: Final[bool] = False
+DEFAULT_RECORD_TRAFFIC: Final[bool] = False
+DEFAULT_REFRESH_AFTER_WRITE: Final[bool] = False
+DEFAULT_REQUEST_CHUNK_AUTO_TUNE: Final[bool] = False
+DEFAULT_REQUEST_CHUNK_SIZE: Final[int] = 0
+DEFAULT_REQUEST_CONCURRENCY: Final[int] = 2
 DEFAULT_SCAN_INTERVAL = 20
 DEFAULT_SSL: Final[bool] = False
+DEFAULT_VALUES_ONLY_POLLING: Final[bool] = False
 DOMAIN: Final[str] = "keba_keenergy"
+FLASH_WRITE_BUDGET_AUTOMATION_RESERVE: Final[int] = 10
+FLASH_WRITE_BUDGET_KEY: Final[str] = "remaining_flash_writes"
+FLASH_WRITE_COUNTER_SAVE_DELAY: Final[int] = 10
 FLASH_WRITE_LIMIT_PER_WEEK: Final[int] = 30
 FLASH_WRITE_DELAY: Final[float] = 1
 MANUFACTURER: Final = "KEBA"
 MANUFACTURER_MTEC: Final = "M-TEC"
 MANUFACTURER_INO: Final = "ino"
+MAX_CONCURRENT_REQUESTS: Final[int] = 4
+MAX_REQUEST_PLANS: Final[int] = 720
+MAX_STORED_ATTRIBUTES: Final[int] = 4096
 MIN_SCAN_INTERVAL = 20
 NAME: Final = "KeEnergy"
 REQUEST_REFRESH_COOLDOWN: Final[float] = 0.5
 SCAN_INTERVAL: Final[int] = 20
+TRAFFIC_RECORD_MAX_EXCHANGES: Final[int] = 500
+WRITE_COALESCING_WINDOW: Final[float] = 0.1
 
 SERVICE_SET_AWAY_DATE_RANGE: Final[str] = "set_away_date_range"
 SERVICE_SET_HEATING_CURVE_POINTS: Final[str] = "set_heating_curve_points"
@@ -3,11 +3,16 @@
 from __future__ import annotations
 
 import logging
+from asyncio import CancelledError
 from asyncio import Lock
-from copy import deepcopy
-from datetime import date
+from asyncio import Task
+from asyncio import create_task
+from asyncio import sleep
+from collections import Counter
+from contextlib import nullcontext
 from datetime import timedelta
 from functools import cached_property
+from pathlib import Path
 from typing import Any
 from typing import TYPE_CHECKING
 from typing import TypeGuard
@@ -16,6 +21,7 @@ from zoneinfo import ZoneInfo
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_SCAN_INTERVAL
+from homeassistant.core import callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import issue_registry as ir
@@ -25,11 +31,9 @@ from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.helpers.update_coordinator import UpdateFailed
 from homeassistant.util.dt import now
 from keba_keenergy_api.api import KebaKeEnergyAPI
-from keba_keenergy_api.constants import BoolEnum
 from keba_keenergy_api.constants import BufferTank
 from keba_keenergy_api.constants import ExternalHeatSource
 from keba_keenergy_api.constants import HeatCircuit
-from keba_keenergy_api.constants import HeatCircuitMode
 from keba_keenergy_api.constants import HeatPump
 from keba_keenergy_api.constants import HotWaterTank
 from keba_keenergy_api.constants import PassiveCooling
@@ -45,16 +49,74 @@ from keba_keenergy_api.endpoints import ValueResponse
 from keba_keenergy_api.error import APIError
 from keba_keenergy_api.error import AuthenticationError
 
+from .budget import FlashWriteBudget
+from .budget import WritePriority
+from .budget import get_iso_week
+from .cache import FixedData
+from .cache import FixedDataCache
+from .cache import get_fixed_data_changes
+from .cache import get_hmi_sw_version
+from .capabilities import CapabilityTable
+from .const import ADAPTIVE_POLLING_STABLE_POLLS
+from .const import ATTRIBUTE_REFRESH_TICKS
+from .const import CHUNK_SIZE_CANDIDATES
+from .const import CHUNK_SIZE_TUNER_RETUNE_INTERVAL
+from .const import CHUNK_SIZE_TUNER_SAMPLES
+from .const import CONF_ADAPTIVE_POLLING
+from .const import CONF_ADAPTIVE_POLLING_MAX_TICK
+from .const import CONF_FLASH_WRITE_BUDGET
+from .const import CONF_POLL_ENABLED_ENTITIES_ONLY
+from .const import CONF_REFRESH_AFTER_WRITE
+from .const import CONF_REQUEST_CHUNK_AUTO_TUNE
+from .const import CONF_REQUEST_CHUNK_SIZE
+from .const import CONF_REQUEST_CONCURRENCY
+from .const import CONF_VALUES_ONLY_POLLING
+from .const import DEFAULT_ADAPTIVE_POLLING
+from .const import DEFAULT_ADAPTIVE_POLLING_MAX_TICK
+from .const import DEFAULT_FLASH_WRITE_BUDGET
+from .const import DEFAULT_POLL_ENABLED_ENTITIES_ONLY
+from .const import DEFAULT_REFRESH_AFTER_WRITE
+from .const import DEFAULT_REQUEST_CHUNK_AUTO_TUNE
+from .const import DEFAULT_REQUEST_CHUNK_SIZE
+from .const import DEFAULT_REQUEST_CONCURRENCY
 from .const import DEFAULT_SCAN_INTERVAL
+from .const import DEFAULT_VALUES_ONLY_POLLING
 from .const import DOMAIN
+from .const import FLASH_WRITE_BUDGET_AUTOMATION_RESERVE
+from .const import FLASH_WRITE_BUDGET_KEY
+from .const import FLASH_WRITE_COUNTER_SAVE_DELAY
 from .const import FLASH_WRITE_LIMIT_PER_WEEK
+from .const import MAX_REQUEST_PLANS
+from .const import MAX_STORED_ATTRIBUTES
 from .const import REQUEST_REFRESH_COOLDOWN
+from .const import WRITE_COALESCING_WINDOW
+from .scheduler import AdaptiveTickScheduler
+from .scheduler import RequestPlan
+from .scheduler import RequestPlanner
+from .scheduler import get_request_size
+from .scheduler import get_section_id
+from .scheduler import has_changed
+from .snapshot import AttributeStore
+from .snapshot import carry_forward_attributes
+from .snapshot import merge_snapshot
+from .snapshot import replace_value
+from .transport import ChunkSizeTuner
+from .transport import KebaKeEnergyTransport
+from .transport import RequestLane
+from .transport import gather_or_cancel
+from .writes import WriteBatch
+from .writes import merge_write_request
 
 if TYPE_CHECKING:
     from collections.abc import Callable
     from collections.abc import Awaitable
+    from collections.abc import Iterable
+    from collections.abc import Mapping
     from aiohttp import ClientSession
+    from homeassistant.core import CALLBACK_TYPE
     from homeassistant.core import HomeAssistant
+    from .scheduler import EntryPollScheduler
+    from .traffic import TrafficRecorder
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -250,6 +312,29 @@ REQUEST_DATA_GROUPS: dict[SectionPrefix, list[Section]] = {
     ],
 }
 
+# Sections that the integration reads from the coordinator data without an entity
+INTERNAL_REQUEST_DATA: frozenset[Section] = frozenset(
+    {
+        HeatCircuit.AWAY_START_DATE,
+        HeatCircuit.AWAY_END_DATE,
+        HeatPump.NAME,
+    },
+)
+
+SECTIONS_BY_KEY: dict[tuple[str, str], Section] = {
+    (get_section_id(section), section.name.lower()): section
+    for sections in REQUEST_DATA_GROUPS.values()
+    for section in sections
+}
+
+
+def get_data_value(section: Section, value: Any, /) -> Any:
+    """Convert a write value into the value of the coordinator data (e.g. 1 to "on")."""
+    if section.value.human_readable:
+        return section.value.human_readable(value).name.lower()
+
+    return value
+
 
 def is_int_value_list(value: object) -> TypeGuard[list[int]]:
     """Check if the value list only contains integer values."""
@@ -272,12 +357,18 @@ class KebaKeEnergyDataUpdateCoordinator(DataUpdateCoordinator[dict[str, ValueRes
         password: str | None,
         ssl: bool,
         session: ClientSession,
+        traffic_recorder: TrafficRecorder | None = None,
+        poll_scheduler: EntryPollScheduler | None = None,
     ) -> None:
         """Initialize."""
         self.config_entry: KebaKeEnergyConfigEntry = entry
+        self.traffic_recorder: TrafficRecorder | None = traffic_recorder
+        self.poll_scheduler: EntryPollScheduler | None = poll_scheduler
+        self.scan_interval: timedelta = timedelta(seconds=entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL))
 
         self._store: Store[dict[str, Any]] = Store(hass, version=1, key=DOMAIN)
         self._write_lock: Lock = Lock()
+        self._write_batch: WriteBatch | None = None
 
         self.api: KebaKeEnergyAPI = KebaKeEnergyAPI(
             host,
@@ -287,21 +378,78 @@ class KebaKeEnergyDataUpdateCoordinator(DataUpdateCoordinator[dict[str, ValueRes
             skip_ssl_verification=True,
             session=session,
         )
+        self.transport: KebaKeEnergyTransport = KebaKeEnergyTransport(
+            self.api,
+            chunk_size=int(entry.options.get(CONF_REQUEST_CHUNK_SIZE, DEFAULT_REQUEST_CHUNK_SIZE)),
+            max_concurrency=int(entry.options.get(CONF_REQUEST_CONCURRENCY, DEFAULT_REQUEST_CONCURRENCY)),
+            tuner=(
+                ChunkSizeTuner(
+                    CHUNK_SIZE_CANDIDATES,
+                    samples=CHUNK_SIZE_TUNER_SAMPLES,
+                    retune_interval=CHUNK_SIZE_TUNER_RETUNE_INTERVAL,
+                )
+                if entry.options.get(CONF_REQUEST_CHUNK_AUTO_TUNE, DEFAULT_REQUEST_CHUNK_AUTO_TUNE)
+                else None
+            ),
+            request_limit=poll_scheduler.request_limit if poll_scheduler else None,
+        )
         self._api_device_info: dict[str, Any] = {}
         self._api_system_info: dict[str, Any] = {}
         self._api_hmi_info: dict[str, Any] = {}
 
         self._weekly_write_count: int = 0
         self._write_count_week: tuple[int, int] | None = None
+        # The counter is saved delayed, so that rapid writes cause one disk write
+        self._flash_write_counter_save_pending: bool = False
         self._flash_issue_active: bool = False
+        self.flash_write_budget: FlashWriteBudget | None = (
+            FlashWriteBudget(FLASH_WRITE_LIMIT_PER_WEEK, automation_reserve=FLASH_WRITE_BUDGET_AUTOMATION_RESERVE)
+            if entry.options.get(CONF_FLASH_WRITE_BUDGET, DEFAULT_FLASH_WRITE_BUDGET)
+            else None
+        )
+        # Collapsed write requests that are deferred until the budget allows the write
+        self._deferred_write_request: dict[Section, Any] = {}
+        self.deferred_writes: int = 0
+        # Writes that are skipped, because the control unit already holds the values
+        self.skipped_writes: int = 0
+        # Optimistic values by section ID, key, index and key index, that are not confirmed by a write or read
+        self._unconfirmed_values: dict[tuple[str, str, int, int | None], Any] = {}
 
         self._fixed_data: dict[str, ValueResponse] = {}
+        self.capabilities: CapabilityTable = CapabilityTable()
+        self._fixed_data_cache: FixedDataCache | None = (
+            FixedDataCache(hass, serial_number=entry.unique_id) if entry.unique_id else None
+        )
+        self.fixed_data_from_cache: bool = False
+        self._cached_fixed_data: FixedData | None = None
+        self._attribute_store: AttributeStore = AttributeStore(max_size=MAX_STORED_ATTRIBUTES)
         self._tick_counter: int = 0
 
+        self._poll_enabled_entities_only: bool = bool(
+            entry.options.get(CONF_POLL_ENABLED_ENTITIES_ONLY, DEFAULT_POLL_ENABLED_ENTITIES_ONLY),
+        )
+        self._consumers: Counter[Section] = Counter()
+        self._request_plans_outdated: bool = False
+        self._values_only_polling: bool = bool(
+            entry.options.get(CONF_VALUES_ONLY_POLLING, DEFAULT_VALUES_ONLY_POLLING),
+        )
+        self._refresh_after_write: bool = bool(
+            entry.options.get(CONF_REFRESH_AFTER_WRITE, DEFAULT_REFRESH_AFTER_WRITE),
+        )
+
+        # State writes of the entities on the last coordinator update
+        self.state_writes: int = 0
+        self.skipped_state_writes: int = 0
+        # Listeners of single values by section, key and index (for optimistic updates)
+        self._value_listeners: dict[tuple[str, str, int], list[CALLBACK_TYPE]] = {}
+
         self.request_data: list[Section] = [
             section for sections in REQUEST_DATA_GROUPS.values() for section in sections
         ]
         self.request_data_groups: dict[SectionPrefix, list[Section]] = {}
+        self.polled_request_data_groups: dict[SectionPrefix, list[Section]] = {}
+        self.adaptive_scheduler: AdaptiveTickScheduler | None = None
+        self.request_planner: RequestPlanner = RequestPlanner({}, {}, max_cycle=MAX_REQUEST_PLANS)
 
         self.position: Position | None = None
         self.available_heating_curves: tuple[tuple[int, str], ...] = ()
@@ -310,7 +458,7 @@ class KebaKeEnergyDataUpdateCoordinator(DataUpdateCoordinator[dict[str, ValueRes
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)),
+            update_interval=self.scan_interval,
             request_refresh_debouncer=Debouncer(
                 hass,
                 _LOGGER,
@@ -356,47 +504,142 @@ class KebaKeEnergyDataUpdateCoordinator(DataUpdateCoordinator[dict[str, ValueRes
                 self._write_count_week = tuple(counter["week"])
                 self._weekly_write_count = counter["count"]
 
-        await self._api_call_for_update(self._async_fixed_data())
+        fixed_data: FixedData | None = (
+            await self._fixed_data_cache.async_load(sections=self.request_data) if self._fixed_data_cache else None
+        )
+
+        if fixed_data:
+            _LOGGER.debug("Load fixed data from cache (HMI software version: %s)", fixed_data.hmi_sw_version)
+            self.fixed_data_from_cache = True
+            self._cached_fixed_data = fixed_data
+        else:
+            # The fixed data reads share the request limit, so the setups of many control units do not flood them
+            async with self.poll_scheduler.request_limit if self.poll_scheduler else nullcontext():
+                fixed_data = await self._api_call_for_update(self._async_fixed_data())
+
+            if self._fixed_data_cache:
+                await self._fixed_data_cache.async_save(fixed_data)
+
+        self._set_fixed_data(fixed_data)
+
+    async def _async_fixed_data(self, *, lane: RequestLane | None = None) -> FixedData:
+        """Read the data that only changes with the setup or the software of the control unit.
+
+        The requests run concurrently along their dependencies. The device, system and
+        HMI info, the positions and the heating curve names are independent of each other.
+        The request filter and the capability detection start as soon as the positions
+        are known. With a lane, every request is sent by the transport in the lane and
+        waits for its slot and the shared request limit.
+        """
+        device_info_task: Task[dict[str, Any]] = create_task(
+            self._fixed_data_request(self.api.system.get_device_info, lane=lane),
+        )
+        system_info_task: Task[dict[str, Any]] = create_task(
+            self._fixed_data_request(self.api.system.get_info, lane=lane),
+        )
+        hmi_info_task: Task[dict[str, Any]] = create_task(
+            self._fixed_data_request(self.api.system.get_hmi_info, lane=lane),
+        )
+        position_task: Task[Position] = create_task(
+            self._fixed_data_request(self.api.system.get_positions, lane=lane),
+        )
+        available_heating_curves_task: Task[tuple[tuple[int, str], ...]] = create_task(
+            self._fixed_data_request(self.api.heat_circuit.get_available_heating_curves, lane=lane),
+        )
+        capabilities_task: Task[tuple[list[Section], dict[str, ValueResponse]]] = create_task(
+            self._async_capabilities(position_task, lane=lane),
+        )
 
-    async def _async_fixed_data(self) -> None:
-        self._api_device_info = await self.api.system.get_device_info()
-        self._api_system_info = await self.api.system.get_info()
-        self._api_hmi_info = await self.api.system.get_hmi_info()
-        self.position = await self.api.system.get_positions()
-        self.available_heating_curves = await self.api.heat_circuit.get_available_heating_curves()
+        await gather_or_cancel(
+            device_info_task,
+            system_info_task,
+            hmi_info_task,
+            position_task,
+            available_heating_curves_task,
+            capabilities_task,
+        )
 
-        _LOGGER.debug("Position: %s", self.position)
+        request_data, fixed_data = capabilities_task.result()
 
-        self.request_data = await self.api.filter_request(
-            request=self.request_data,
-            position=self.position,
+        return FixedData(
+            device_info=device_info_task.result(),
+            system_info=system_info_task.result(),
+            hmi_info=hmi_info_task.result(),
+            position=position_task.result(),
+            available_heating_curves=available_heating_curves_task.result(),
+            request_data=request_data,
+            fixed_data=fixed_data,
         )
 
-        fixed_request_data: list[Section] = await self.api.filter_request(
-            request=[
-                System.HAS_OUTDOOR_TEMPERATURE,
-                System.HAS_PHOTOVOLTAICS,
-                HeatCircuit.MODE,
-                HeatCircuit.HAS_ROOM_TEMPERATURE,
-                HeatCircuit.HAS_ROOM_HUMIDITY,
-                HeatCircuit.HAS_MIXER,
-                HeatCircuit.HAS_RETURN_FLOW_TEMPERATURE,
-                HeatCircuit.HAS_PUMP,
-                HeatCircuit.HAS_VAR_SPEED_PUMP,
-                HotWaterTank.HAS_FRESH_WATER_MODULE,
-                HeatPump.HAS_ACTIVE_COOLING,
-                HeatPump.HAS_PASSIVE_COOLING,
-                HeatPump.ELECTRIC_ENERGY_METER_TYPE,
-                HeatPump.HEAT_METER_TYPE,
-            ],
-            position=self.position,
+    async def _fixed_data_request(self, fn: Callable[[], Awaitable[Any]], /, *, lane: RequestLane | None) -> Any:
+        """Send a fixed data request directly or by the transport in the lane."""
+        return await (fn() if lane is None else self.transport.call(fn, lane=lane))
+
+    async def _async_capabilities(
+        self,
+        position_task: Awaitable[Position],
+        /,
+        *,
+        lane: RequestLane | None = None,
+    ) -> tuple[list[Section], dict[str, ValueResponse]]:
+        """Filter the request data and read the capabilities as soon as the positions are known."""
+        position: Position = await position_task
+
+        _LOGGER.debug("Position: %s", position)
+
+        request_data, fixed_request_data = await gather_or_cancel(
+            self._fixed_data_request(
+                lambda: self.api.filter_request(
+                    request=self.request_data,
+                    position=position,
+                ),
+                lane=lane,
+            ),
+            self._fixed_data_request(
+                lambda: self.api.filter_request(
+                    request=[
+                        System.HAS_OUTDOOR_TEMPERATURE,
+                        System.HAS_PHOTOVOLTAICS,
+                        HeatCircuit.MODE,
+                        HeatCircuit.HAS_ROOM_TEMPERATURE,
+                        HeatCircuit.HAS_ROOM_HUMIDITY,
+                        HeatCircuit.HAS_MIXER,
+                        HeatCircuit.HAS_RETURN_FLOW_TEMPERATURE,
+                        HeatCircuit.HAS_PUMP,
+                        HeatCircuit.HAS_VAR_SPEED_PUMP,
+                        HotWaterTank.HAS_FRESH_WATER_MODULE,
+                        HeatPump.HAS_ACTIVE_COOLING,
+                        HeatPump.HAS_PASSIVE_COOLING,
+                        HeatPump.ELECTRIC_ENERGY_METER_TYPE,
+                        HeatPump.HEAT_METER_TYPE,
+                    ],
+                    position=position,
+                ),
+                lane=lane,
+            ),
         )
 
-        self._fixed_data = await self.api.read_data(
-            request=fixed_request_data,
-            position=self.position,
+        fixed_data: dict[str, ValueResponse] = await self._fixed_data_request(
+            lambda: self.api.read_data(
+                request=fixed_request_data,
+                position=position,
+            ),
+            lane=lane,
         )
 
+        return request_data, fixed_data
+
+    def _set_fixed_data(self, fixed_data: FixedData, /) -> None:
+        """Apply the fixed data and compile the request plans."""
+        self._api_device_info = fixed_data.device_info
+        self._api_system_info = fixed_data.system_info
+        self._api_hmi_info = fixed_data.hmi_info
+        self.position = fixed_data.position
+        self.available_heating_curves = fixed_data.available_heating_curves
+        self.request_data = list(fixed_data.request_data)
+        self._fixed_data = self._attribute_store.deduplicate(fixed_data.fixed_data)
+        self.capabilities = CapabilityTable.from_fixed_data(self._fixed_data)
+
         _LOGGER.debug("Options: %s", self._fixed_data)
 
         if System.OUTDOOR_TEMPERATURE in self.request_data and not self.has_outdoor_temperature():  # pragma: nocover
@@ -414,48 +657,299 @@ class KebaKeEnergyDataUpdateCoordinator(DataUpdateCoordinator[dict[str, ValueRes
             or (self.position and getattr(self.position, prefix.value, 0) > 0)
         }
 
+        if self.config_entry.options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING):
+            self.adaptive_scheduler = AdaptiveTickScheduler(
+                {prefix: self._get_tick_multiplier(prefix) for prefix in self.request_data_groups},
+                max_multiplier=int(
+                    self.config_entry.options.get(CONF_ADAPTIVE_POLLING_MAX_TICK, DEFAULT_ADAPTIVE_POLLING_MAX_TICK),
+                ),
+                stable_polls=ADAPTIVE_POLLING_STABLE_POLLS,
+            )
+
+        self._compile_request_plans()
+
+    async def async_revalidate_fixed_data_cache(self) -> None:
+        """Check the fixed data cache against the control unit and reload the entry if it is outdated.
+
+        All fixed data is read again, so a changed HMI software version, changed
+        positions (e.g. an added heat circuit), capabilities, heating curve names or
+        available request data invalidate the cache. The requests are sent in the
+        background lane of the transport, so they wait for interactive requests and
+        count against the shared request limit.
+        """
+        if not self._cached_fixed_data or not self._fixed_data_cache:
+            return
+
+        try:
+            fixed_data: FixedData = await self._async_fixed_data(lane=RequestLane.BACKGROUND)
+        except APIError as error:
+            _LOGGER.debug("Skip revalidation of the fixed data cache: %s", error)
+            return
+
+        if not (changes := get_fixed_data_changes(self._cached_fixed_data, fixed_data)):
+            _LOGGER.debug("Fixed data cache is up to date")
+            return
+
+        _LOGGER.debug(
+            "Fixed data cache is outdated (changed: %s, HMI software version: %s), reload entry",
+            ", ".join(changes),
+            fixed_data.hmi_sw_version,
+        )
+
+        await self._fixed_data_cache.async_remove()
+        self.hass.config_entries.async_schedule_reload(self.config_entry.entry_id)
+
+    @callback
+    def async_add_consumer(self, section_id: str, keys: Iterable[str], /) -> CALLBACK_TYPE:
+        """Register the keys that an entity reads from the coordinator data.
+
+        Returns a callback to remove the consumer again. If only enabled entities are
+        polled, the request plans are recompiled before the next poll when a key is
+        consumed for the first time or is no longer consumed.
+        """
+        sections: list[Section] = [
+            section for key in keys if (section := SECTIONS_BY_KEY.get((section_id, key))) is not None
+        ]
+
+        for section in sections:
+            self._consumers[section] += 1
+
+            if self._consumers[section] == 1:
+                self._request_plans_outdated = self._poll_enabled_entities_only
+
+        @callback
+        def remove_consumer() -> None:
+            for section in sections:
+                self._consumers[section] -= 1
+
+                if self._consumers[section] <= 0:
+                    del self._consumers[section]
+                    self._request_plans_outdated = self._poll_enabled_entities_only
+
+        return remove_consumer
+
+    @callback
+    def async_add_value_listener(
+        self,
+        update_callback: CALLBACK_TYPE,
+        /,
+        *,
+        section_id: str,
+        keys: Iterable[str],
+        index: int,
+    ) -> CALLBACK_TYPE:
+        """Listen for optimistic updates of the values of a position.
+
+        Returns a callback to remove the listener again.
+        """
+        value_keys: list[tuple[str, str, int]] = [(section_id, key, index) for key in keys]
+
+        for value_key in value_keys:
+            self._value_listeners.setdefault(value_key, []).append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            for value_key in value_keys:
+                listeners: list[CALLBACK_TYPE] = self._value_listeners[value_key]
+                listeners.remove(update_callback)
+
+                if not listeners:
+                    del self._value_listeners[value_key]
+
+        return remove_listener
+
+    def _get_polled_request_data_groups(self) -> dict[SectionPrefix, list[Section]]:
+        """Return the request data groups with the sections that are polled.
+
+        Before the first update all available sections are polled, because the
+        entities are created from the first coordinator data.
+        """
+        if not self._poll_enabled_entities_only or self.data is None:
+            return self.request_data_groups
+
+        groups: dict[SectionPrefix, list[Section]] = {
+            prefix: [section for section in sections if section in self._consumers or section in INTERNAL_REQUEST_DATA]
+            for prefix, sections in self.request_data_groups.items()
+        }
+
+        return {prefix: sections for prefix, sections in groups.items() if sections}
+
+    def _compile_request_plans(self) -> None:
+        """Compile the request plans and phase offsets for every phase of the tick cycle."""
+        self._request_plans_outdated = False
+        self.polled_request_data_groups = self._get_polled_request_data_groups()
+        self.request_planner = RequestPlanner(
+            self.polled_request_data_groups,
+            {
+                prefix: (
+                    self.adaptive_scheduler.multiplier(prefix)
+                    if self.adaptive_scheduler
+                    else self._get_tick_multiplier(prefix)
+                )
+                for prefix in self.polled_request_data_groups
+            },
+            max_cycle=MAX_REQUEST_PLANS,
+            weights={
+                prefix: get_request_size(sections, position=self.position)
+                for prefix, sections in self.polled_request_data_groups.items()
+            },
+        )
+
+        _LOGGER.debug("Request plans: %s", self.request_planner.as_dict())
+
+    def _get_tick_multiplier(self, prefix: SectionPrefix, /) -> int:
+        """Return the configured tick multiplier of a section group."""
+        return int(self.config_entry.options.get(f"scan_interval_tick_{prefix.value}", 1))
+
     async def _async_update_data(self) -> dict[str, ValueResponse]:
         """Read all values from API to update coordinator data."""
         first_run: bool = self._tick_counter == 0
         self._tick_counter = (self._tick_counter + 1) % 1_000_000
 
-        request: list[Section] = []
+        if self._request_plans_outdated and not first_run:
+            self._compile_request_plans()
 
-        for section, section_data in self.request_data_groups.items():
-            multiplier: int = self.config_entry.options.get(f"scan_interval_tick_{section.value}", 1)
+        if self._deferred_write_request and self._write_count_week != get_iso_week(now().date()):
+            # The budget of a new week allows the deferred writes again
+            self.config_entry.async_create_task(
+                self.hass,
+                self._async_write_deferred_data(),
+                f"{DOMAIN}_write_deferred_data",
+            )
 
-            if not first_run and self._tick_counter % multiplier != 0:
-                _LOGGER.debug(
-                    "Skipping section '%s' this tick (multiplier=%d)",
-                    section.value,
-                    multiplier,
-                )
-                continue
+        # Values only polls carry forward the attributes of the previous data. The attributes
+        # of all sections are read again every few hours, the written sections after a write.
+        refresh_attributes: bool = (
+            self._values_only_polling and not first_run and self._tick_counter % ATTRIBUTE_REFRESH_TICKS == 0
+        )
+        extra_attributes: bool = not self._values_only_polling or first_run or refresh_attributes
+
+        plan: RequestPlan = (
+            self.request_planner.full_plan
+            if first_run or refresh_attributes
+            else self.request_planner.get(self._tick_counter)
+        )
 
-            request.extend(section_data)
+        if not plan.request and self.data is not None:
+            _LOGGER.debug("Skipping tick %d, no section is due", self._tick_counter)
+            return self.data
 
-            _LOGGER.debug(
-                "Requesting section '%s' (multiplier=%d, position=%d)",
-                section.value,
-                multiplier,
-                getattr(self.position, section.value, 0),
-            )
+        _LOGGER.debug(
+            "Requesting sections %s (tick=%d, keys=%d, attributes=%s)",
+            [prefix.value for prefix in plan.prefixes],
+            self._tick_counter,
+            len(plan.request),
+            extra_attributes,
+        )
 
         response: dict[str, ValueResponse] = await self._api_call_for_update(
-            self.api.read_data(
-                request=request,
+            self.transport.read_data(plan.request, position=self.position, extra_attributes=extra_attributes),
+        )
+
+        if not extra_attributes:
+            carry_forward_attributes(self.data, response)
+
+        if self.data and self.adaptive_scheduler:
+            adapted: bool = False
+
+            for prefix in plan.prefixes:
+                adapted |= self.adaptive_scheduler.observe(
+                    prefix,
+                    changed=has_changed(
+                        self.polled_request_data_groups[prefix],
+                        previous=self.data,
+                        current=response,
+                    ),
+                )
+
+            if adapted:
+                self._compile_request_plans()
+
+        if first_run and self._poll_enabled_entities_only:
+            # Prune the request to the consumed sections from the next update on
+            self._request_plans_outdated = True
+
+        self._confirm_read_values(response)
+        return merge_snapshot(self.data, self._attribute_store.deduplicate(response))
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule the next poll on the poll slot of the entry."""
+        self._align_update_interval()
+        super()._schedule_refresh()
+
+    def _align_update_interval(self) -> None:
+        """Set the update interval to the delay until the next poll slot if more than one entry polls.
+
+        The delay is counted from the time the next poll is scheduled with, which is
+        the loop time rounded down to the second plus the random microsecond of the
+        coordinator. So the polls start exactly on the phase of the entry and the
+        duration of a poll does not shift the next one.
+        """
+        if self.poll_scheduler is None or len(self.poll_scheduler) < 2:  # noqa: PLR2004
+            self.update_interval = self.scan_interval
+            return
+
+        self.update_interval = timedelta(
+            seconds=self.poll_scheduler.get_delay(
+                self.config_entry.entry_id,
+                now=int(self.hass.loop.time()) + self._microsecond,
+                interval=self.scan_interval.total_seconds(),
+            ),
+        )
+
+    async def async_refresh_sections(self, sections: Iterable[Section], /, *, extra_attributes: bool = False) -> None:
+        """Read only the sections and merge them into the current coordinator data.
+
+        The listeners are updated without resetting the schedule of the regular
+        polls, so the tick cycle continues as planned. The sections are read in the
+        interactive lane ahead of the polls. The attributes are read with the values
+        unless values only polling is enabled and no extra attributes are requested.
+        """
+        extra_attributes = extra_attributes or not self._values_only_polling
+        request: list[Section] = list(dict.fromkeys(sections))
+
+        if not request or self.data is None:
+            return
+
+        _LOGGER.debug("Refresh sections %s", [section.name for section in request])
+
+        response: dict[str, ValueResponse] = await self._api_call_for_user(
+            self.transport.read_data(
+                request,
                 position=self.position,
+                extra_attributes=extra_attributes,
+                lane=RequestLane.INTERACTIVE,
             ),
         )
 
-        if self.data:
-            previous_data: dict[str, ValueResponse] = deepcopy(self.data)
+        if not extra_attributes:
+            carry_forward_attributes(self.data, response)
+
+        self._confirm_read_values(response)
+        self.data = merge_snapshot(self.data, self._attribute_store.deduplicate(response))
+        self.async_update_listeners()
+
+    async def async_refresh_keys(self, section_id: str, keys: Iterable[str], /) -> None:
+        """Read only the keys of a section and merge them into the current coordinator data."""
+        await self.async_refresh_sections(
+            section for key in keys if (section := SECTIONS_BY_KEY.get((section_id, key))) is not None
+        )
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners and count the state writes of the entities."""
+        self.state_writes = 0
+        self.skipped_state_writes = 0
 
-            for section_id, previous_section_data in previous_data.items():
-                if not response[section_id]:
-                    response[section_id] = previous_section_data
+        super().async_update_listeners()
 
-        return response
+        _LOGGER.debug(
+            "State writes on tick %d: %d (skipped: %d)",
+            self._tick_counter,
+            self.state_writes,
+            self.skipped_state_writes,
+        )
 
     def async_update_value(
         self,
@@ -467,48 +961,154 @@ class KebaKeEnergyDataUpdateCoordinator(DataUpdateCoordinator[dict[str, ValueRes
         index: int,
         key_index: int | None,
     ) -> None:
-        """Optimistically update a single value into coordinator data."""
-        data: dict[str, ValueResponse] = deepcopy(self.data)
+        """Optimistically update a single value into coordinator data.
+
+        Only the listeners of the value are updated and the schedule of the regular
+        polls is not reset. The value is not used to skip writes until it is
+        confirmed by a successful write or a read.
+        """
+        key: str = section.name.lower()
+        data_value: Any = get_data_value(section, value)
+
+        self.data = replace_value(
+            self.data,
+            data_value,
+            section_id=section_id,
+            key=key,
+            index=index,
+            key_index=key_index,
+        )
+        self._unconfirmed_values[(section_id, key, index, key_index)] = data_value
+        self._async_notify_value_listeners(section_id, key, index)
+
+    @callback
+    def _async_notify_value_listeners(self, section_id: str, key: str, index: int, /) -> None:
+        """Call every listener of a value exactly once, even if it is registered for more keys."""
+        for update_callback in dict.fromkeys(self._value_listeners.get((section_id, key, index), ())):
+            update_callback()
+
+    def is_current_value(
+        self,
+        value: Any,
+        /,
+        *,
+        section_id: str,
+        section: Section,
+        index: int,
+        key_index: int | None,
+    ) -> bool:
+        """Check if the control unit already holds the value of a position.
+
+        Optimistic values of failed or pending writes are not confirmed and never
+        match, so the write is retried.
+        """
         key: str = section.name.lower()
 
-        if section.value.human_readable:
-            value = section.value.human_readable(value).name.lower()
+        if (section_id, key, index, key_index) in self._unconfirmed_values:
+            return False
+
+        data: Any = self.data.get(section_id, {}).get(key) if self.data else None
 
-        values: list[list[Value]] | list[Value] | Value = data[section_id][key]
+        if isinstance(data, list):
+            data = data[index] if index < len(data) else None
 
-        if isinstance(values, list):
-            value_by_index: list[Value] | Value = values[index]
+        if isinstance(data, list):
+            data = data[key_index] if key_index is not None and key_index < len(data) else None
 
-            if isinstance(value_by_index, list) and key_index is not None:
-                value_by_index[key_index]["value"] = value
-            elif isinstance(value_by_index, dict):
-                value_by_index["value"] = value
-        elif isinstance(values, dict):
-            values["value"] = value
+        return isinstance(data, dict) and data.get("value") == get_data_value(section, value)
+
+    @callback
+    def async_confirm_value(
+        self,
+        value: Any,
+        /,
+        *,
+        section_id: str,
+        section: Section,
+        index: int,
+        key_index: int | None,
+    ) -> None:
+        """Confirm the optimistic value of a position after a successful write.
+
+        A newer optimistic value of a concurrent write stays unconfirmed.
+        """
+        position: tuple[str, str, int, int | None] = (section_id, section.name.lower(), index, key_index)
+        data_value: Any = get_data_value(section, value)
+
+        if position in self._unconfirmed_values and self._unconfirmed_values[position] == data_value:
+            del self._unconfirmed_values[position]
+
+    def _confirm_read_values(self, response: Mapping[str, ValueResponse], /) -> None:
+        """Confirm the optimistic values of all keys of a read response, the read values replace them."""
+        if self._unconfirmed_values:
+            self._unconfirmed_values = {
+                position: value
+                for position, value in self._unconfirmed_values.items()
+                if position[1] not in response.get(position[0], {})
+            }
+
+    def _get_flash_write_counter_data(self) -> dict[str, Any]:
+        self._flash_write_counter_save_pending = False
+
+        return {
+            "flash_write_counter": {
+                "week": list(self._write_count_week) if self._write_count_week else [],
+                "count": self._weekly_write_count,
+            },
+        }
 
-        self.async_set_updated_data(data)
+    @callback
+    def _async_delay_save_flash_write_counter(self) -> None:
+        """Schedule a delayed save of the flash write counter.
+
+        The data is collected when the save is executed, so rapid writes are saved
+        with one disk write. Pending saves are flushed on shutdown.
+        """
+        self._flash_write_counter_save_pending = True
+        self._store.async_delay_save(self._get_flash_write_counter_data, FLASH_WRITE_COUNTER_SAVE_DELAY)
+
+    async def async_save_flash_write_counter(self) -> None:
+        """Save a pending flash write counter immediately."""
+        if self._flash_write_counter_save_pending:
+            await self._store.async_save(self._get_flash_write_counter_data())
+
+    async def async_save_traffic(self) -> None:
+        """Save the recorded traffic to the configuration directory."""
+        if self.traffic_recorder:
+            path: Path = Path(self.hass.config.path(f"{DOMAIN}.traffic.{self.config_entry.unique_id}.jsonl.gz"))
+            await self.hass.async_add_executor_job(self.traffic_recorder.save, path)
+
+    async def async_shutdown(self) -> None:
+        """Cancel any scheduled call and save the flash write counter and the recorded traffic."""
+        await super().async_shutdown()
+        await self.async_save_flash_write_counter()
+        await self.async_save_traffic()
 
     async def async_execute_write(
         self,
         *,
         write_fn: Callable[[], Awaitable[None]],
         ignore_weekly_write_count: bool = False,
+        priority: WritePriority = WritePriority.USER,
     ) -> None:
-        """Set the weekly counter and write to the NAND."""
+        """Set the weekly counter and write to the NAND.
+
+        Raises HomeAssistantError if the flash write budget does not allow a write
+        with the priority.
+        """
         async with self._write_lock:
-            await self._async_reset_weekly_counter_if_needed()
+            self._async_reset_weekly_counter_if_needed()
+
+            if (
+                self.flash_write_budget
+                and not ignore_weekly_write_count
+                and not self.flash_write_budget.allows(priority, count=self._weekly_write_count)
+            ):
+                raise self._flash_write_budget_exhausted_error()
 
             if not ignore_weekly_write_count:
                 self._weekly_write_count += 1
-
-                await self._store.async_save(
-                    {
-                        "flash_write_counter": {
-                            "week": list(self._write_count_week) if self._write_count_week else [],
-                            "count": self._weekly_write_count,
-                        },
-                    },
-                )
+                self._async_delay_save_flash_write_counter()
 
             _LOGGER.debug(
                 "API write request (writes this week: %s)",
@@ -519,15 +1119,198 @@ class KebaKeEnergyDataUpdateCoordinator(DataUpdateCoordinator[dict[str, ValueRes
                 self._flash_issue_active = True
                 self._create_issue()
 
-            await self._api_call_for_user(write_fn())
+            # Writes are sent in the interactive lane ahead of the polls
+            await self._api_call_for_user(self.transport.call(write_fn, lane=RequestLane.INTERACTIVE))
+
+        if self.flash_write_budget:
+            # Update only the sensor of the remaining flash write budget
+            self._async_notify_value_listeners(SectionPrefix.SYSTEM, FLASH_WRITE_BUDGET_KEY, 0)
+
+    async def async_write_data(
+        self,
+        request: dict[Section, Any],
+        *,
+        ignore_weekly_write_count: bool = False,
+        priority: WritePriority = WritePriority.USER,
+    ) -> bool:
+        """Write data to the NAND from the KEBA KeEnergy control unit.
+
+        Requests within the coalescing window are merged into one API write, that
+        counts as one flash write. Every caller waits for the result of this write.
+        If the flash write budget does not allow an automation write, the request is
+        deferred, sent with the next allowed write and False is returned. Service
+        writes raise HomeAssistantError instead.
+        """
+        if self._write_batch is None:
+            self._write_batch = WriteBatch()
+            self.config_entry.async_create_task(
+                self.hass,
+                self._async_flush_write_batch(),
+                f"{DOMAIN}_flush_write_batch",
+            )
 
-    async def async_write_data(self, request: dict[Section, Any], *, ignore_weekly_write_count: bool = False) -> None:
-        """Write data to the NAND from the KEBA KeEnergy control unit."""
-        await self.async_execute_write(
-            write_fn=lambda: self.api.write_data(request=request),
+        return await self._write_batch.add(
+            request,
             ignore_weekly_write_count=ignore_weekly_write_count,
+            priority=priority,
+        )
+
+    async def _async_flush_write_batch(self) -> None:
+        await sleep(WRITE_COALESCING_WINDOW)
+
+        batch: WriteBatch | None = self._write_batch
+        self._write_batch = None
+
+        if batch is None:  # pragma: no cover
+            return
+
+        if self._async_is_write_deferred(batch):
+            if batch.priority > WritePriority.AUTOMATION:
+                # Service calls report the exhausted budget instead of a silent deferral
+                batch.set_exception(self._flash_write_budget_exhausted_error())
+            else:
+                self._defer_write_request(batch.request)
+                batch.set_result(written=False)
+
+            return
+
+        deferred_request: dict[Section, Any] = self._deferred_write_request
+        request: dict[Section, Any] = {}
+
+        try:
+            # Deferred requests are sent with the next allowed write, newer values win
+            self._deferred_write_request = {}
+            merge_write_request(request, deferred_request)
+            merge_write_request(request, batch.request)
+
+            if not request:
+                batch.set_result()
+                return
+
+            _LOGGER.debug("Merge %d write requests into one API write", len(batch) + bool(deferred_request))
+
+            await self.async_execute_write(
+                write_fn=lambda: self.api.write_data(request=request),
+                ignore_weekly_write_count=batch.ignore_weekly_write_count,
+                priority=batch.priority,
+            )
+        except CancelledError:
+            self._restore_deferred_write_request(deferred_request)
+            batch.cancel()
+            raise
+        except Exception as error:  # noqa: BLE001
+            self._restore_deferred_write_request(deferred_request)
+            # The error is raised by the write requests of all callers
+            batch.set_exception(error)
+        else:
+            batch.set_result()
+
+            if deferred_request:
+                self._delete_deferred_writes_issue()
+
+            if self._refresh_after_write or self._values_only_polling:
+                await self._async_refresh_written_sections(request)
+
+    async def _async_refresh_written_sections(self, request: dict[Section, Any], /) -> None:
+        """Read back the written sections, the next regular poll updates them otherwise.
+
+        Limits and selectable values can depend on the written values, so the
+        attributes of the written sections are read again with values only polling.
+        """
+        try:
+            await self.async_refresh_sections(request, extra_attributes=True)
+        except HomeAssistantError as error:
+            _LOGGER.debug("Refresh of the written sections failed: %s", error)
+
+    @callback
+    def is_write_deferred(self, priority: WritePriority, /, *, ignore_weekly_write_count: bool = False) -> bool:
+        """Check if the flash write budget does not allow a write with the priority."""
+        if self.flash_write_budget is None or ignore_weekly_write_count:
+            return False
+
+        self._async_reset_weekly_counter_if_needed()
+        return not self.flash_write_budget.allows(priority, count=self._weekly_write_count)
+
+    @callback
+    def _async_is_write_deferred(self, batch: WriteBatch, /) -> bool:
+        return self.is_write_deferred(batch.priority, ignore_weekly_write_count=batch.ignore_weekly_write_count)
+
+    def _flash_write_budget_exhausted_error(self) -> HomeAssistantError:
+        return HomeAssistantError(
+            translation_domain=DOMAIN,
+            translation_key="flash_write_budget_exhausted",
+            translation_placeholders={
+                "limit": str(self.flash_write_budget.limit if self.flash_write_budget else FLASH_WRITE_LIMIT_PER_WEEK),
+            },
+        )
+
+    def _defer_write_request(self, request: dict[Section, Any], /) -> None:
+        """Collapse a write request into the deferred request, newer values replace older ones."""
+        merge_write_request(self._deferred_write_request, request)
+        self.deferred_writes += 1
+
+        _LOGGER.debug(
+            "Defer write request, the flash write budget is low (remaining: %s, deferred sections: %d)",
+            self.remaining_flash_writes,
+            len(self._deferred_write_request),
+        )
+
+        # Show the deferred values on the sensor of the remaining flash write budget
+        self._async_notify_value_listeners(SectionPrefix.SYSTEM, FLASH_WRITE_BUDGET_KEY, 0)
+
+        ir.async_create_issue(
+            self.hass,
+            domain=DOMAIN,
+            issue_id="deferred_flash_writes",
+            is_fixable=False,
+            translation_key="deferred_flash_writes",
+            translation_placeholders={
+                "sections": ", ".join(self.deferred_values),
+            },
+            severity=ir.IssueSeverity.WARNING,
+        )
+
+    def _delete_deferred_writes_issue(self) -> None:
+        ir.async_delete_issue(
+            self.hass,
+            domain=DOMAIN,
+            issue_id="deferred_flash_writes",
         )
 
+    def _restore_deferred_write_request(self, deferred_request: dict[Section, Any], /) -> None:
+        """Keep the deferred request of a failed write for the next write."""
+        if deferred_request is not self._deferred_write_request:
+            merge_write_request(deferred_request, self._deferred_write_request)
+            self._deferred_write_request = deferred_request
+
+    async def _async_write_deferred_data(self) -> None:
+        try:
+            await self.async_write_data({}, priority=WritePriority.AUTOMATION)
+        except HomeAssistantError as error:
+            _LOGGER.warning("Cannot write deferred data: %s", error)
+
+    @property
+    def remaining_flash_writes(self) -> int | None:
+        """Return the remaining flash writes of the budget in the current week."""
+        if self.flash_write_budget is None:
+            return None
+
+        count: int = self._weekly_write_count if self._write_count_week == get_iso_week(now().date()) else 0
+        return self.flash_write_budget.remaining(count)
+
+    @property
+    def pending_deferred_writes(self) -> int:
+        """Return the number of sections with a deferred write."""
+        return len(self._deferred_write_request)
+
+    @property
+    def deferred_values(self) -> dict[str, Any]:
+        """Return the deferred values by section ID and key, they are not applied to the coordinator data."""
+        return {
+            f"{get_section_id(section)}.{section.name.lower()}": value
+            for section, value in self._deferred_write_request.items()
+        }
+
     def _create_issue(self) -> None:
         ir.async_create_issue(
             self.hass,
@@ -541,9 +1324,9 @@ class KebaKeEnergyDataUpdateCoordinator(DataUpdateCoordinator[dict[str, ValueRes
             severity=ir.IssueSeverity.WARNING,
         )
 
-    async def _async_reset_weekly_counter_if_needed(self) -> None:
-        today: date = now().date()
-        current_week: tuple[int, int] = today.isocalendar().year, today.isocalendar().week
+    @callback
+    def _async_reset_weekly_counter_if_needed(self) -> None:
+        current_week: tuple[int, int] = get_iso_week(now().date())
 
         if self._write_count_week != current_week:
             self._write_count_week = current_week
@@ -556,18 +1339,13 @@ class KebaKeEnergyDataUpdateCoordinator(DataUpdateCoordinator[dict[str, ValueRes
                 issue_id="frequent_flash_writes",
             )
 
-            await self._store.async_save(
-                {
-                    "flash_write_counter": {
-                        "week": list(self._write_count_week),
-                        "count": self._weekly_write_count,
-                    },
-                },
-            )
+            self._async_delay_save_flash_write_counter()
 
     async def get_timezone(self) -> ZoneInfo:
         """Get the timezone from the Web HMI."""
-        timezone: str = await self._api_call_for_user(self.api.system.get_timezone())
+        timezone: str = await self._api_call_for_user(
+            self.transport.call(self.api.system.get_timezone, lane=RequestLane.INTERACTIVE),
+        )
         return ZoneInfo(timezone)
 
     async def set_away_date_range(self, *, start_timestamp: float, end_timestamp: float) -> None:
@@ -590,6 +1368,7 @@ class KebaKeEnergyDataUpdateCoordinator(DataUpdateCoordinator[dict[str, ValueRes
                             HeatCircuit.AWAY_START_DATE: away_start_date,
                             HeatCircuit.AWAY_END_DATE: away_end_date,
                         },
+                        priority=WritePriority.SERVICE,
                     )
 
     @cached_property
@@ -610,13 +1389,18 @@ class KebaKeEnergyDataUpdateCoordinator(DataUpdateCoordinator[dict[str, ValueRes
     @cached_property
     def device_hmi_sw_version(self) -> str:
         """Return HMI software version."""
-        return str(self._api_hmi_info["name"].replace("KeEnergy.WebHmi_", ""))
+        return get_hmi_sw_version(self._api_hmi_info)
 
     @cached_property
     def device_serial_number(self) -> str:
         """Return serial number."""
         return str(self._api_device_info["serNo"])
 
+    @property
+    def tick(self) -> int:
+        """Return the current poll tick."""
+        return self._tick_counter
+
     @property
     def heat_pump_names(self) -> list[Value]:
         """Return heat pump names."""
@@ -654,172 +1438,64 @@ class KebaKeEnergyDataUpdateCoordinator(DataUpdateCoordinator[dict[str, ValueRes
 
     def has_outdoor_temperature(self) -> bool:
         """Check if outdoor temperature sensor is available."""
-        data: Value | None = cast("Value | None", self._fixed_data[SectionPrefix.SYSTEM].get("has_outdoor_temperature"))
-        return bool(BoolEnum.ON.name.lower() == data["value"]) if data else False
+        return self.capabilities.has_outdoor_temperature
 
     def has_room_temperature(self, *, index: int | None = None) -> bool:
         """Check if room temperature sensor is available."""
-        index = 0 if index is None else index
-
-        data: list[Value] | None = cast(
-            "list[Value] | None",
-            self._fixed_data[SectionPrefix.HEAT_CIRCUIT].get("has_room_temperature"),
-        )
-        return bool(BoolEnum.ON.name.lower() == data[index]["value"]) if data else False
+        return self.capabilities.get(self.capabilities.has_room_temperature, index=index)
 
     def has_room_humidity(self, *, index: int | None = None) -> bool:
         """Check if room humidity sensor is available."""
-        index = 0 if index is None else index
-
-        data: list[Value] | None = cast(
-            "list[Value] | None",
-            self._fixed_data[SectionPrefix.HEAT_CIRCUIT].get("has_room_humidity"),
-        )
-        return bool(BoolEnum.ON.name.lower() == data[index]["value"]) if data else False
+        return self.capabilities.get(self.capabilities.has_room_humidity, index=index)
 
     def has_photovoltaics(self) -> bool:
         """Check if photovoltaics is available."""
-        data: Value | None = cast("Value | None", self._fixed_data[SectionPrefix.SYSTEM].get("has_photovoltaics"))
-        return bool(BoolEnum.ON.name.lower() == data["value"]) if data else False
+        return self.capabilities.has_photovoltaics
 
     def has_mixer(self, *, index: int | None = None) -> bool:
         """Check if heating circuit mixer is available."""
-        index = 0 if index is None else index
-
-        data: list[Value] | None = cast(
-            "list[Value] | None",
-            self._fixed_data[SectionPrefix.HEAT_CIRCUIT].get("has_mixer"),
-        )
-        return bool(BoolEnum.ON.name.lower() == data[index]["value"]) if data else False
+        return self.capabilities.get(self.capabilities.has_mixer, index=index)
 
     def has_return_flow_temperature(self, *, index: int | None = None) -> bool:
         """Check if heating circuit return flow temperature sensor is available."""
-        index = 0 if index is None else index
-
-        data: list[Value] | None = cast(
-            "list[Value] | None",
-            self._fixed_data[SectionPrefix.HEAT_CIRCUIT].get("has_return_flow_temperature"),
-        )
-        return bool(BoolEnum.ON.name.lower() == data[index]["value"]) if data else False
+        return self.capabilities.get(self.capabilities.has_return_flow_temperature, index=index)
 
     def has_pump(self, *, index: int | None = None) -> bool:
         """Check if heating circuit pump is available."""
-        index = 0 if index is None else index
-
-        data: list[Value] | None = cast(
-            "list[Value] | None",
-            self._fixed_data[SectionPrefix.HEAT_CIRCUIT].get("has_pump"),
-        )
-        return bool(BoolEnum.ON.name.lower() == data[index]["value"]) if data else False
+        return self.capabilities.get(self.capabilities.has_pump, index=index)
 
     def has_var_speed_pump(self, *, index: int | None = None) -> bool:
         """Check if heating circuit variable speed pump is available."""
-        index = 0 if index is None else index
-
-        data: list[Value] | None = cast(
-            "list[Value] | None",
-            self._fixed_data[SectionPrefix.HEAT_CIRCUIT].get("has_var_speed_pump"),
-        )
-        return bool(BoolEnum.ON.name.lower() == data[index]["value"]) if data else False
+        return self.capabilities.get(self.capabilities.has_var_speed_pump, index=index)
 
     def has_fresh_water_module(self, *, index: int | None = None) -> bool:
         """Check if fresh water module is available."""
-        index = 0 if index is None else index
-
-        data: list[Value] | None = cast(
-            "list[Value] | None",
-            self._fixed_data[SectionPrefix.HOT_WATER_TANK].get("has_fresh_water_module"),
-        )
-        return bool(BoolEnum.ON.name.lower() == data[index]["value"]) if data else False
+        return self.capabilities.get(self.capabilities.has_fresh_water_module, index=index)
 
     def has_electrical_energy_meter(self, *, index: int | None = None) -> bool:
         """Check if electrical energy meter is available."""
-        index = 0 if index is None else index
-
-        data: list[Value] | None = cast(
-            "list[Value] | None",
-            self._fixed_data[SectionPrefix.HEAT_PUMP].get("electric_energy_meter_type"),
-        )
-        return bool(data[index]["value"] > 0) if data else False
+        return self.capabilities.get(self.capabilities.has_electrical_energy_meter, index=index)
 
     def has_heat_meter(self, *, index: int | None = None) -> bool:
         """Check if heat meter is available."""
-        index = 0 if index is None else index
-
-        data: list[Value] | None = cast(
-            "list[Value] | None",
-            self._fixed_data[SectionPrefix.HEAT_PUMP].get("heat_meter_type"),
-        )
-        return bool(data[index]["value"] > 0) if data else False
+        return self.capabilities.get(self.capabilities.has_heat_meter, index=index)
 
     def has_active_cooling(self, *, index: int | None = None) -> bool:
         """Check if active cooling is available."""
-        index = 0 if index is None else index
-
-        data: list[Value] | None = cast(
-            "list[Value] | None",
-            self._fixed_data[SectionPrefix.HEAT_PUMP].get("has_active_cooling"),
-        )
-        return bool(BoolEnum.ON.name.lower() == data[index]["value"]) if data else False
+        return self.capabilities.get(self.capabilities.has_active_cooling, index=index)
 
     def has_passive_cooling(self, *, index: int | None = None) -> bool:
         """Check if passive cooling is available."""
-        index = 0 if index is None else index
-
-        data: list[Value] | None = cast(
-            "list[Value] | None",
-            self._fixed_data[SectionPrefix.HEAT_PUMP].get("has_passive_cooling"),
-        )
-        return bool(BoolEnum.ON.name.lower() == data[index]["value"]) if data else False
+        return self.capabilities.get(self.capabilities.has_passive_cooling, index=index)
 
     def has_cooling_circuits(self) -> bool:
         """Check if one heating circuit support cooling."""
-        has_cooling: bool = False
-
-        # Some KEBA KeEnergy software versions did not have an active or passive cooling options.
-        # Cooling support can only be detected with the heating circuit mode!
-        if self.position:
-            for index in range(self.position.heat_circuit):
-                is_cooling_circuit: bool = self.is_cooling_circuit(index=index)
-
-                if is_cooling_circuit:
-                    has_cooling = True
-                    break
-
-        return has_cooling
+        return self.capabilities.has_cooling_circuits
 
     def is_cooling_circuit(self, *, index: int | None = None) -> bool:
         """Check if heating circuit mode is cooling."""
-        index = 0 if index is None else index
-
-        data: list[Value] | None = cast("list[Value] | None", self._fixed_data[SectionPrefix.HEAT_CIRCUIT].get("mode"))
-        return (
-            bool(
-                data[index]["value"]
-                in [
-                    HeatCircuitMode.COOLING.name.lower(),
-                    HeatCircuitMode.HEATING_AND_COOLING.name.lower(),
-                    HeatCircuitMode.HEATING_AND_ACTIVE_COOLING.name.lower(),
-                ],
-            )
-            if data
-            else False
-        )
+        return self.capabilities.get(self.capabilities.is_cooling_circuit, index=index)
 
     def is_heating_circuit(self, *, index: int | None = None) -> bool:
         """Check if heating circuit mode is heating."""
-        index = 0 if index is None else index
-
-        data: list[Value] | None = cast("list[Value] | None", self._fixed_data[SectionPrefix.HEAT_CIRCUIT].get("mode"))
-        return (
-            bool(
-                data[index]["value"]
-                in [
-                    HeatCircuitMode.HEATING.name.lower(),
-                    HeatCircuitMode.HEATING_AND_COOLING.name.lower(),
-                    HeatCircuitMode.HEATING_AND_ACTIVE_COOLING.name.lower(),
-                ],
-            )
-            if data
-            else False
-        )
+        return self.capabilities.get(self.capabilities.is_heating_circuit, index=index)
@@ -0,0 +1,63 @@
+"""Diagnostics support for the KEBA KeEnergy integration."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+from typing import TYPE_CHECKING
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_HOST
+from homeassistant.const import CONF_PASSWORD
+from homeassistant.const import CONF_USERNAME
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from .coordinator import KebaKeEnergyConfigEntry
+    from .coordinator import KebaKeEnergyDataUpdateCoordinator
+
+TO_REDACT: set[str] = {CONF_HOST, CONF_PASSWORD, CONF_USERNAME}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,  # noqa: ARG001
+    entry: KebaKeEnergyConfigEntry,
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: KebaKeEnergyDataUpdateCoordinator = entry.runtime_data
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "device": {
+            "model": coordinator.device_model,
+            "hmi_sw_version": coordinator.device_hmi_sw_version,
+            "position": asdict(coordinator.position) if coordinator.position else None,
+        },
+        "polling": {
+            "tick": coordinator.tick,
+            "adaptive_multipliers": (
+                coordinator.adaptive_scheduler.as_dict() if coordinator.adaptive_scheduler else None
+            ),
+            "request_plans": coordinator.request_planner.as_dict(),
+            "poll_scheduler": (
+                coordinator.poll_scheduler.as_dict(
+                    entry.entry_id,
+                    interval=coordinator.scan_interval.total_seconds(),
+                )
+                if coordinator.poll_scheduler
+                else None
+            ),
+            "state_writes": coordinator.state_writes,
+            "skipped_state_writes": coordinator.skipped_state_writes,
+        },
+        "writes": {
+            "remaining_flash_writes": coordinator.remaining_flash_writes,
+            "deferred_writes": coordinator.deferred_writes,
+            "pending_deferred_writes": coordinator.pending_deferred_writes,
+            "skipped_writes": coordinator.skipped_writes,
+        },
+        "transport": coordinator.transport.as_dict(),
+    }
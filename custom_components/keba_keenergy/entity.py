@@ -10,6 +10,7 @@ from typing import TYPE_CHECKING
 from typing import TypeVar
 from typing import overload
 
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from keba_keenergy_api.constants import BufferTank
@@ -22,6 +23,8 @@ from keba_keenergy_api.constants import SectionPrefix
 from keba_keenergy_api.constants import SolarCircuit
 from keba_keenergy_api.constants import System
 
+from .budget import WritePriority
+from .budget import get_write_priority
 from .const import DOMAIN
 from .const import MANUFACTURER
 from .const import MANUFACTURER_INO
@@ -37,11 +40,58 @@ if TYPE_CHECKING:
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
     from homeassistant.helpers.typing import StateType
     from keba_keenergy_api.endpoints import Value
+    from keba_keenergy_api.endpoints import ValueResponse
 
 _LOGGER = logging.getLogger(__name__)
 
 T = TypeVar("T", str, int, float)
 
+SECTION_TYPES: dict[str, type[Section]] = {
+    SectionPrefix.SYSTEM: System,
+    SectionPrefix.HEAT_CIRCUIT: HeatCircuit,
+    SectionPrefix.SOLAR_CIRCUIT: SolarCircuit,
+    SectionPrefix.HEAT_PUMP: HeatPump,
+    SectionPrefix.BUFFER_TANK: BufferTank,
+    SectionPrefix.HOT_WATER_TANK: HotWaterTank,
+    SectionPrefix.EXTERNAL_HEAT_SOURCE: ExternalHeatSource,
+}
+
+
+class ValueAccessor:
+    """Resolve the value of an entity key from the coordinator data.
+
+    The position and key index are bound once. The resolved value is kept for the
+    current coordinator data, so repeated reads of the same snapshot (e.g. while
+    the state of an entity is rendered) cost a single identity check.
+    """
+
+    __slots__ = ("_data", "_index", "_key", "_key_index", "_section_id", "_value")
+
+    def __init__(self, section_id: str, key: str, /, *, index: int, key_index: int | None) -> None:
+        """Initialize."""
+        self._section_id: str = section_id
+        self._key: str = key
+        self._index: int = index
+        self._key_index: int | None = key_index
+        self._data: Mapping[str, ValueResponse] | None = None
+        self._value: Value | None = None
+
+    def get(self, data: Mapping[str, ValueResponse], /) -> Value | None:
+        """Return the value of the key from the coordinator data."""
+        if data is not self._data:
+            value: list[list[Value]] | list[Value] | Value | None = data[self._section_id].get(self._key)
+
+            if isinstance(value, list):
+                value = value[self._index]
+
+            if isinstance(value, list) and self._key_index is not None:
+                value = value[self._key_index]
+
+            assert not isinstance(value, list)
+            self._data, self._value = data, value
+
+        return self._value
+
 
 @dataclass(frozen=True)
 class KebaKeEnergyEntityDescriptionMixin:
@@ -88,6 +138,81 @@ class KebaKeEnergyBaseEntity(
         self._pending_key: str = ""
         self._pending_section: Section | None = None
         self._pending_device_numbers: int | None = None
+        self._state_fingerprint: tuple[Any, ...] | None = None
+        self._accessors: dict[str, ValueAccessor] = {
+            key: ValueAccessor(section_id, key, index=index or 0, key_index=key_index) for key in self.consumed_keys
+        }
+
+    def _get_state_fingerprint(self) -> tuple[Any, ...]:
+        """Render everything that is written to the state machine on a coordinator update.
+
+        The capability attributes contain the limits (e.g. the minimum and maximum of a
+        number), that are read from the attributes of the values.
+        """
+        return (
+            self.available,
+            self.state,
+            self.icon,
+            self.unit_of_measurement,
+            self.supported_features,
+            self.capability_attributes,
+            self.state_attributes,
+            self.extra_state_attributes,
+        )
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state and forget the fingerprint of the last coordinator update."""
+        self._state_fingerprint = None
+        super().async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if the rendered state or attributes have changed."""
+        if self._async_write_changed_state():
+            self.coordinator.state_writes += 1
+        else:
+            self.coordinator.skipped_state_writes += 1
+
+    @callback
+    def _handle_value_update(self) -> None:
+        """Write the state on an optimistic update, it is not counted as a state write of a coordinator update."""
+        self._async_write_changed_state()
+
+    @callback
+    def _async_write_changed_state(self) -> bool:
+        """Write the state if the fingerprint has changed and return True if the state was written."""
+        fingerprint: tuple[Any, ...] = self._get_state_fingerprint()
+
+        if fingerprint == self._state_fingerprint:
+            return False
+
+        super()._handle_coordinator_update()
+        self._state_fingerprint = fingerprint
+
+        return True
+
+    async def async_added_to_hass(self) -> None:
+        """Register the consumed keys when the entity is added to Home Assistant."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.async_add_consumer(self.section_id, self.consumed_keys))
+        self.async_on_remove(
+            self.coordinator.async_add_value_listener(
+                self._handle_value_update,
+                section_id=self.section_id,
+                keys=self.consumed_keys,
+                index=self.index or 0,
+            ),
+        )
+
+    @property
+    def consumed_keys(self) -> tuple[str, ...]:
+        """Return the keys of the coordinator data that the entity reads."""
+        return tuple(
+            key
+            for key in (self.entity_description.key, getattr(self.entity_description, "new_key", None))
+            if key is not None
+        )
 
     @property
     def position(self) -> int | None:
@@ -257,8 +382,22 @@ class KebaKeEnergyBaseEntity(
         device_numbers: int | None = None,
         ignore_daily_write_count: bool = False,
     ) -> None:
-        """Write data to the KEBA KeEnergy API."""
+        """Write data to the KEBA KeEnergy API.
+
+        The write is skipped if the control unit already holds the value.
+        """
         if section:
+            if self.coordinator.is_current_value(
+                value,
+                section_id=self.section_id,
+                section=section,
+                index=self.index or 0,
+                key_index=self.key_index,
+            ):
+                self.coordinator.skipped_writes += 1
+                _LOGGER.debug("Skip write of %s, the value %s is already set", section.name, value)
+                return
+
             current_index: int = self.index or 0
             _range: int | None = device_numbers
 
@@ -275,15 +414,44 @@ class KebaKeEnergyBaseEntity(
                 ),
             }
 
-            self.coordinator.async_update_value(
-                value,
-                section_id=self.section_id,
-                section=section,
-                index=self.index or 0,
-                key_index=self.key_index,
+            priority: WritePriority = get_write_priority(self._context)
+
+            # Deferred writes keep the value of the control unit until they are written
+            optimistic: bool = not self.coordinator.is_write_deferred(
+                priority,
+                ignore_weekly_write_count=ignore_daily_write_count,
+            )
+
+            if optimistic:
+                self.coordinator.async_update_value(
+                    value,
+                    section_id=self.section_id,
+                    section=section,
+                    index=self.index or 0,
+                    key_index=self.key_index,
+                )
+
+                if section.name.lower() not in self.consumed_keys:
+                    # The entity is not a listener of the written value (e.g. climate modes)
+                    self._handle_value_update()
+
+            written: bool = await self.coordinator.async_write_data(
+                request=request,
+                ignore_weekly_write_count=ignore_daily_write_count,
+                priority=priority,
             )
 
-            await self.coordinator.async_write_data(request=request, ignore_weekly_write_count=ignore_daily_write_count)
+            if optimistic and written:
+                self.coordinator.async_confirm_value(
+                    value,
+                    section_id=self.section_id,
+                    section=section,
+                    index=self.index or 0,
+                    key_index=self.key_index,
+                )
+            elif optimistic:
+                # The budget was exhausted within the coalescing window, read back the value
+                await self.coordinator.async_refresh_sections(request)
 
     async def _async_debounced_write_data(self, _: datetime) -> None:
         """Write data (debounced) to the KEBA KeEnergy API."""
@@ -300,16 +468,17 @@ class KebaKeEnergyBaseEntity(
 
     def get_entity_data(self, key: str, /) -> Value | None:
         """Get the real entity data from the coordinator data."""
-        entity_data: list[list[Value]] | list[Value] | Value | None = self.coordinator.data[self.section_id].get(key)
-
-        if isinstance(entity_data, list):
-            entity_data = entity_data[self.index or 0]
+        accessor: ValueAccessor | None = self._accessors.get(key)
 
-        if isinstance(entity_data, list) and self.key_index is not None:
-            entity_data = entity_data[self.key_index]
+        if accessor is None:
+            accessor = self._accessors[key] = ValueAccessor(
+                self.section_id,
+                key,
+                index=self.index or 0,
+                key_index=self.key_index,
+            )
 
-        assert not isinstance(entity_data, list)
-        return entity_data
+        return accessor.get(self.coordinator.data)
 
     def get_attribute(self, key: str, /, *, attr: str) -> str:
         """Get extra attribute from the API by key."""
@@ -356,7 +525,14 @@ class KebaKeEnergyEntity(KebaKeEnergyBaseEntity):
         super().__init__(coordinator, entry=entry, section_id=section_id, index=index, key_index=key_index)
 
         self._attr_unique_id: str | None = self.get_unique_id(self.entity_description.key)
-        self.device_numbers: int | None = None
+        self.device_numbers: int | None = {
+            SectionPrefix.HEAT_CIRCUIT: self.coordinator.heat_circuit_numbers,
+            SectionPrefix.SOLAR_CIRCUIT: self.coordinator.solar_circuit_numbers,
+            SectionPrefix.HEAT_PUMP: self.coordinator.heat_pump_numbers,
+            SectionPrefix.BUFFER_TANK: self.coordinator.buffer_tank_numbers,
+            SectionPrefix.HOT_WATER_TANK: self.coordinator.hot_water_tank_numbers,
+            SectionPrefix.EXTERNAL_HEAT_SOURCE: self.coordinator.external_heat_source_numbers,
+        }.get(self.section_id)
 
     def get_unique_id(self, key: str, /) -> str | None:
         """Generate unique id."""
@@ -373,33 +549,31 @@ class KebaKeEnergyEntity(KebaKeEnergyBaseEntity):
 
         return unique_id
 
-    @property
+    @cached_property
     def section(self) -> Section | None:
         """Get the current section."""
-        section: Section | None = None
+        section_type: type[Section] | None = SECTION_TYPES.get(self.section_id)
+        return section_type[self.entity_description.key.upper()] if section_type else None
 
-        if self.is_system_device:
-            section = System[self.entity_description.key.upper()]
-        elif self.is_heat_circuit:
-            section = HeatCircuit[self.entity_description.key.upper()]
-            self.device_numbers = self.coordinator.heat_circuit_numbers
-        elif self.is_solar_circuit:
-            section = SolarCircuit[self.entity_description.key.upper()]
-            self.device_numbers = self.coordinator.solar_circuit_numbers
-        elif self.is_heat_pump:
-            section = HeatPump[self.entity_description.key.upper()]
-            self.device_numbers = self.coordinator.heat_pump_numbers
-        elif self.is_buffer_tank:
-            section = BufferTank[self.entity_description.key.upper()]
-            self.device_numbers = self.coordinator.buffer_tank_numbers
-        elif self.is_hot_water_tank:
-            section = HotWaterTank[self.entity_description.key.upper()]
-            self.device_numbers = self.coordinator.hot_water_tank_numbers
-        elif self.is_external_heat_source:
-            section = ExternalHeatSource[self.entity_description.key.upper()]
-            self.device_numbers = self.coordinator.external_heat_source_numbers
 
-        return section
+def get_description_index(
+    entity_types: dict[str, tuple[Any, ...]],
+    entity_cls: type[Any] | None,
+) -> dict[str, dict[str, list[tuple[Any, type[Any] | None]]]]:
+    """Index the entity descriptions and entity classes of a platform by section id and key."""
+    description_index: dict[str, dict[str, list[tuple[Any, type[Any] | None]]]] = {}
+
+    for section_id, descriptions in entity_types.items():
+        section_index: dict[str, list[tuple[Any, type[Any] | None]]] = description_index.setdefault(section_id, {})
+
+        for description in descriptions:
+            cls: type[Any] | None = getattr(description, "entity_class", entity_cls)
+
+            for key in dict.fromkeys((description.key, description.new_key)):
+                if key is not None:
+                    section_index.setdefault(key, []).append((description, cls))
+
+    return description_index
 
 
 async def _async_setup_entities(
@@ -411,16 +585,22 @@ async def _async_setup_entities(
 ) -> None:
     """Set up KEBA KeEnergy entities."""
     coordinator: KebaKeEnergyDataUpdateCoordinator = entry.runtime_data
+    description_index: dict[str, dict[str, list[tuple[Any, type[Any] | None]]]] = get_description_index(
+        entity_types,
+        entity_cls,
+    )
     entities: list[Any] = []
 
     for section_id, section_data in coordinator.data.items():
-        for description in entity_types.get(section_id, ()):
-            for key, values in section_data.items():
-                if key not in (description.key, description.new_key):
-                    continue
+        section_index: dict[str, list[tuple[Any, type[Any] | None]]] | None = description_index.get(section_id)
 
-                device_numbers = len(values) if isinstance(values, list) else 1
+        if not section_index:
+            continue
 
+        for key, values in section_data.items():
+            device_numbers = len(values) if isinstance(values, list) else 1
+
+            for description, cls in section_index.get(key, ()):
                 for index in range(device_numbers):
                     if description.condition is not None and not description.condition(coordinator, index):
                         _LOGGER.debug(
@@ -438,10 +618,6 @@ async def _async_setup_entities(
                         index,
                     )
 
-                    cls: type[Any] | None = (
-                        description.entity_class if hasattr(description, "entity_class") else entity_cls
-                    )
-
                     if cls:
                         entities.append(
                             cls(
@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
-from functools import cached_property
 from typing import Final
 from typing import TYPE_CHECKING
 
@@ -76,14 +75,14 @@ class KebaKeEnergyNumberEntity(KebaKeEnergyEntity, NumberEntity):
         self._pending_section = self.section
         self._pending_device_numbers = self.device_numbers
 
-    @cached_property
+    @property
     def native_min_value(self) -> float:
-        """Return the maximum value."""
+        """Return the minimum value."""
         return (
             float(self.get_attribute(self.entity_description.key, attr="lower_limit")) * self.entity_description.scale
         )
 
-    @cached_property
+    @property
     def native_max_value(self) -> float:
         """Return the maximum value."""
         return (
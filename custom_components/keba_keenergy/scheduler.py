@@ -0,0 +1,338 @@
+"""Poll scheduling for the KEBA KeEnergy integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import re
+from bisect import insort
+from dataclasses import dataclass
+from re import Pattern
+from typing import Any
+from typing import Final
+from typing import TYPE_CHECKING
+
+from keba_keenergy_api.constants import SectionPrefix
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Mapping
+    from keba_keenergy_api.constants import Section
+    from keba_keenergy_api.endpoints import Position
+    from keba_keenergy_api.endpoints import ValueResponse
+
+_LOGGER = logging.getLogger(__name__)
+
+KEY_PATTERN: Final[Pattern[str]] = re.compile(r"(?<!^)(?=[A-Z])")
+
+
+def get_section_id(section: Section) -> str:
+    """Return the response section id (e.g. passive_cooling) of a section."""
+    return KEY_PATTERN.sub("_", section.__class__.__name__).lower()
+
+
+def get_request_size(sections: Iterable[Section], /, *, position: Position | None) -> int:
+    """Return the number of values that are read from the API for the sections."""
+    size: int = 0
+
+    for section in sections:
+        section_id: str = get_section_id(section)
+        count: int = (
+            1 if section_id in {SectionPrefix.SYSTEM, SectionPrefix.PHOTOVOLTAICS} else getattr(position, section_id, 0)
+        )
+        size += count * section.value.quantity
+
+    return size
+
+
+def strip_attributes(values: Any) -> Any:
+    """Return only the values of a response entry without the attributes."""
+    if isinstance(values, list):
+        return [strip_attributes(value) for value in values]
+
+    if isinstance(values, dict):
+        return values.get("value")
+
+    return values
+
+
+def has_changed(
+    sections: Iterable[Section],
+    /,
+    *,
+    previous: Mapping[str, ValueResponse],
+    current: Mapping[str, ValueResponse],
+) -> bool:
+    """Check if at least one value of the sections has changed between two responses."""
+    for section in sections:
+        section_id: str = get_section_id(section)
+        key: str = section.name.lower()
+
+        if strip_attributes(previous.get(section_id, {}).get(key)) != strip_attributes(
+            current.get(section_id, {}).get(key),
+        ):
+            return True
+
+    return False
+
+
+@dataclass(slots=True)
+class SectionSchedule:
+    """Scheduling state of a section group."""
+
+    min_multiplier: int
+    max_multiplier: int
+    multiplier: int
+    stable_polls: int = 0
+
+
+class AdaptiveTickScheduler:
+    """Adapt the tick multiplier of each section group to the observed value volatility.
+
+    A section group starts with the multiplier from the options (lower bound).
+    After a number of polls without any value change the multiplier is doubled
+    up to the configured maximum. A single change halves the multiplier again.
+    """
+
+    def __init__(
+        self,
+        min_multipliers: Mapping[SectionPrefix, int],
+        /,
+        *,
+        max_multiplier: int,
+        stable_polls: int,
+    ) -> None:
+        """Initialize."""
+        self._stable_polls: int = stable_polls
+        self._schedules: dict[SectionPrefix, SectionSchedule] = {
+            prefix: SectionSchedule(
+                min_multiplier=min_multiplier,
+                max_multiplier=max(min_multiplier, max_multiplier),
+                multiplier=min_multiplier,
+            )
+            for prefix, min_multiplier in min_multipliers.items()
+        }
+
+    def multiplier(self, prefix: SectionPrefix, /) -> int:
+        """Return the current tick multiplier of a section group."""
+        schedule: SectionSchedule | None = self._schedules.get(prefix)
+        return schedule.multiplier if schedule else 1
+
+    def observe(self, prefix: SectionPrefix, /, *, changed: bool) -> bool:
+        """Record the result of a poll and adapt the multiplier of a section group.
+
+        Returns True if the multiplier was adapted.
+        """
+        schedule: SectionSchedule | None = self._schedules.get(prefix)
+
+        if schedule is None:
+            return False
+
+        multiplier: int = schedule.multiplier
+
+        if changed:
+            schedule.stable_polls = 0
+            schedule.multiplier = max(schedule.multiplier // 2, schedule.min_multiplier)
+        else:
+            schedule.stable_polls += 1
+
+            if schedule.stable_polls >= self._stable_polls:
+                schedule.stable_polls = 0
+                schedule.multiplier = min(schedule.multiplier * 2, schedule.max_multiplier)
+
+        if multiplier == schedule.multiplier:
+            return False
+
+        _LOGGER.debug(
+            "Adapt multiplier of section '%s' from %d to %d",
+            prefix.value,
+            multiplier,
+            schedule.multiplier,
+        )
+
+        return True
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the current multipliers of all section groups."""
+        return {prefix.value: schedule.multiplier for prefix, schedule in self._schedules.items()}
+
+
+@dataclass(frozen=True, slots=True)
+class RequestPlan:
+    """Section groups and the request that is sent on a phase of the tick cycle."""
+
+    prefixes: tuple[SectionPrefix, ...]
+    request: list[Section]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the request plan as dictionary."""
+        return {
+            "sections": [prefix.value for prefix in self.prefixes],
+            "keys": len(self.request),
+        }
+
+
+class RequestPlanner:
+    """Precompiled request plans for every phase of the tick cycle.
+
+    The tick cycle is the least common multiple of all tick multipliers. Each section
+    group gets a phase offset, so that groups with shared multiplier factors are not
+    requested on the same ticks and the number of requested values per tick stays
+    as even as possible. If the cycle is longer than the maximum, the offsets are
+    zero and the plans are compiled on demand instead. Plans with the same section
+    groups share one instance.
+    """
+
+    def __init__(
+        self,
+        groups: Mapping[SectionPrefix, list[Section]],
+        multipliers: Mapping[SectionPrefix, int],
+        /,
+        *,
+        max_cycle: int,
+        weights: Mapping[SectionPrefix, int] | None = None,
+    ) -> None:
+        """Initialize."""
+        self._groups: Mapping[SectionPrefix, list[Section]] = groups
+        self._multipliers: dict[SectionPrefix, int] = {prefix: max(multipliers.get(prefix, 1), 1) for prefix in groups}
+        self._weights: dict[SectionPrefix, int] = {
+            prefix: weights.get(prefix, len(sections)) if weights else len(sections)
+            for prefix, sections in groups.items()
+        }
+        self._plans_by_prefixes: dict[tuple[SectionPrefix, ...], RequestPlan] = {}
+
+        self.cycle: int = math.lcm(*self._multipliers.values()) if self._multipliers else 1
+        self.offsets: dict[SectionPrefix, int] = (
+            self._assign_offsets() if self.cycle <= max_cycle else dict.fromkeys(groups, 0)
+        )
+        self.full_plan: RequestPlan = self._get_plan(tuple(groups))
+        self.plans: tuple[RequestPlan, ...] = (
+            tuple(self._compile_phase(phase) for phase in range(self.cycle)) if self.cycle <= max_cycle else ()
+        )
+
+    def _assign_offsets(self) -> dict[SectionPrefix, int]:
+        """Assign the phase offsets greedily, starting with the largest section group.
+
+        Each group is placed on the offset with the lowest peak load, then the lowest
+        total load of its phases. On a tie the smaller offset wins, so a single
+        multiplier keeps the behaviour without offsets.
+        """
+        loads: list[int] = [0] * self.cycle
+        offsets: dict[SectionPrefix, int] = {}
+
+        for prefix in sorted(self._groups, key=lambda p: self._weights[p], reverse=True):
+            multiplier: int = self._multipliers[prefix]
+            best_offset: int = 0
+            best_score: tuple[int, int] | None = None
+
+            for offset in range(multiplier):
+                phase_loads: list[int] = loads[offset::multiplier]
+                score: tuple[int, int] = max(phase_loads), sum(phase_loads)
+
+                if best_score is None or score < best_score:
+                    best_offset, best_score = offset, score
+
+            for phase in range(best_offset, self.cycle, multiplier):
+                loads[phase] += self._weights[prefix]
+
+            offsets[prefix] = best_offset
+
+        return {prefix: offsets[prefix] for prefix in self._groups}
+
+    def get(self, tick: int, /) -> RequestPlan:
+        """Return the request plan for a tick."""
+        phase: int = tick % self.cycle
+        return self.plans[phase] if self.plans else self._compile_phase(phase)
+
+    def get_load(self, phase: int, /) -> int:
+        """Return the number of requested values on a phase of the tick cycle."""
+        return sum(self._weights[prefix] for prefix in self.get(phase).prefixes)
+
+    def _compile_phase(self, phase: int, /) -> RequestPlan:
+        return self._get_plan(
+            tuple(prefix for prefix in self._groups if self._is_due(prefix, phase)),
+        )
+
+    def _is_due(self, prefix: SectionPrefix, phase: int, /) -> bool:
+        return (phase - self.offsets[prefix]) % self._multipliers[prefix] == 0
+
+    def _get_plan(self, prefixes: tuple[SectionPrefix, ...], /) -> RequestPlan:
+        plan: RequestPlan | None = self._plans_by_prefixes.get(prefixes)
+
+        if plan is None:
+            plan = self._plans_by_prefixes[prefixes] = RequestPlan(
+                prefixes=prefixes,
+                request=[section for prefix in prefixes for section in self._groups[prefix]],
+            )
+
+        return plan
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the request plans as dictionary."""
+        return {
+            "cycle": self.cycle,
+            "multipliers": {prefix.value: multiplier for prefix, multiplier in self._multipliers.items()},
+            "offsets": {prefix.value: offset for prefix, offset in self.offsets.items()},
+            "plans": [
+                {"phase": phase, **plan.as_dict(), "values": self.get_load(phase)}
+                for phase, plan in enumerate(self.plans)
+            ],
+        }
+
+
+class EntryPollScheduler:
+    """Spread the polls of all config entries of the domain over the update interval.
+
+    Every entry polls on an own phase of the interval, the phases are spread evenly
+    by the order of the entry ids. The poll slots are anchored to the event loop
+    clock, so the phases do not drift with the poll durations. A semaphore limits
+    the concurrent read requests of all entries, it also gates the fixed data reads
+    and the first refreshes of entries that are set up at the same time.
+    """
+
+    def __init__(self, *, max_concurrent_requests: int) -> None:
+        """Initialize."""
+        self.max_concurrent_requests: int = max(max_concurrent_requests, 1)
+        self.request_limit: asyncio.Semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        self._entry_ids: list[str] = []
+
+    def __len__(self) -> int:
+        """Return the number of scheduled entries."""
+        return len(self._entry_ids)
+
+    def add(self, entry_id: str, /) -> None:
+        """Add an entry, the phases of all entries are spread again."""
+        if entry_id not in self._entry_ids:
+            insort(self._entry_ids, entry_id)
+
+    def remove(self, entry_id: str, /) -> None:
+        """Remove an entry, the phases of all entries are spread again."""
+        if entry_id in self._entry_ids:
+            self._entry_ids.remove(entry_id)
+
+    def get_phase(self, entry_id: str, /, *, interval: float) -> float:
+        """Return the phase of an entry within the interval in seconds."""
+        if entry_id not in self._entry_ids:
+            return 0
+
+        return interval * self._entry_ids.index(entry_id) / len(self._entry_ids)
+
+    def get_delay(self, entry_id: str, /, *, now: float, interval: float) -> float:
+        """Return the delay until the next poll slot of an entry.
+
+        The next slot is at least half an interval away, so a poll shortly after a
+        phase change does not poll again right away.
+        """
+        phase: float = self.get_phase(entry_id, interval=interval)
+        slot: float = phase + math.ceil((now + interval / 2 - phase) / interval) * interval
+
+        return slot - now
+
+    def as_dict(self, entry_id: str, /, *, interval: float) -> dict[str, Any]:
+        """Return the schedule of an entry as dictionary."""
+        return {
+            "entries": len(self._entry_ids),
+            "phase": round(self.get_phase(entry_id, interval=interval), 3),
+            "max_concurrent_requests": self.max_concurrent_requests,
+        }
@@ -40,6 +40,7 @@ from keba_keenergy_api.constants import SwitchValvePosition
 from keba_keenergy_api.constants import SystemOperatingMode
 
 from .const import DOMAIN
+from .const import FLASH_WRITE_BUDGET_KEY
 from .entity import KebaKeEnergyEntity
 from .entity import KebaKeEnergyEntityDescriptionMixin
 from .entity import _async_setup_entities
@@ -115,6 +116,31 @@ class KebaKeEnergySensorEntity(KebaKeEnergyEntity, SensorEntity):
         return self.entity_description.attributes(attributes)
 
 
+class KebaKeEnergyFlashWriteBudgetSensorEntity(KebaKeEnergySensorEntity):
+    """KEBA KeEnergy sensor entity for the remaining flash write budget of the week."""
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the remaining flash writes of the current week."""
+        return self.coordinator.remaining_flash_writes
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return the weekly limit and the deferred writes."""
+        return {
+            "limit": self.coordinator.flash_write_budget.limit if self.coordinator.flash_write_budget else None,
+            "deferred_writes": self.coordinator.pending_deferred_writes,
+            "deferred_values": self.coordinator.deferred_values,
+        }
+
+
+FLASH_WRITE_BUDGET_SENSOR_DESCRIPTION: Final = KebaKeEnergySensorEntityDescription[int](
+    entity_category=EntityCategory.DIAGNOSTIC,
+    key=FLASH_WRITE_BUDGET_KEY,
+    state_class=SensorStateClass.MEASUREMENT,
+    translation_key="remaining_flash_writes",
+)
+
 SENSOR_TYPES: dict[str, tuple[KebaKeEnergySensorEntityDescription[Any], ...]] = {
     SectionPrefix.SYSTEM: (
         KebaKeEnergySensorEntityDescription[float](
@@ -1277,3 +1303,18 @@ async def async_setup_entry(
         KebaKeEnergySensorEntity,
         "sensor",
     )
+
+    coordinator: KebaKeEnergyDataUpdateCoordinator = entry.runtime_data
+
+    if coordinator.flash_write_budget:
+        async_add_entities(
+            [
+                KebaKeEnergyFlashWriteBudgetSensorEntity(
+                    coordinator,
+                    description=FLASH_WRITE_BUDGET_SENSOR_DESCRIPTION,
+                    entry=entry,
+                    section_id=SectionPrefix.SYSTEM,
+                    index=None,
+                ),
+            ],
+        )
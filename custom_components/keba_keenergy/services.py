@@ -20,10 +20,12 @@ from keba_keenergy_api.endpoints import HeatingCurvePoint
 from keba_keenergy_api.endpoints import HeatingCurvePoints
 from keba_keenergy_api.endpoints import HeatingCurves
 
+from .budget import WritePriority
 from .const import ATTR_CONFIG_ENTRY
 from .const import DOMAIN
 from .const import SERVICE_SET_AWAY_DATE_RANGE
 from .const import SERVICE_SET_HEATING_CURVE_POINTS
+from .transport import RequestLane
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
@@ -147,7 +149,10 @@ async def _async_set_heating_curve_points(call: ServiceCall) -> None:
     coordinator: KebaKeEnergyDataUpdateCoordinator = __get_coordinator(call)
 
     heating_curve: str = call.data[ATTR_HEATING_CURVE]
-    heating_curves: HeatingCurves = await coordinator.api.heat_circuit.get_heating_curve_points()
+    heating_curves: HeatingCurves = await coordinator.transport.call(
+        coordinator.api.heat_circuit.get_heating_curve_points,
+        lane=RequestLane.INTERACTIVE,
+    )
 
     if heating_curve not in heating_curves:
         raise ServiceValidationError(
@@ -173,11 +178,21 @@ async def _async_set_heating_curve_points(call: ServiceCall) -> None:
             translation_key="duplicate_outdoor_temperature_values",
         )
 
+    current_points: HeatingCurvePoints = tuple(
+        HeatingCurvePoint(outdoor=round(p.outdoor, 2), flow=round(p.flow, 2)) for p in heating_curves[heating_curve]
+    )
+
+    if points == current_points:
+        coordinator.skipped_writes += 1
+        _LOGGER.debug("Skip write of heating curve %s, the points are already set", heating_curve)
+        return
+
     await coordinator.async_execute_write(
         write_fn=lambda: coordinator.api.heat_circuit.set_heating_curve_points(
             heating_curve=heating_curve,
             points=points,
         ),
+        priority=WritePriority.SERVICE,
     )
 
 
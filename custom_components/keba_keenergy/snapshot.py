@@ -0,0 +1,180 @@
+"""Copy-on-write helpers for the coordinator data of the KEBA KeEnergy integration.
+
+Coordinator data snapshots are treated as immutable. A new snapshot only creates
+new containers along the path of the changed values and shares everything else
+with the previous snapshot.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any
+from typing import TYPE_CHECKING
+from typing import cast
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from keba_keenergy_api.endpoints import Value
+    from keba_keenergy_api.endpoints import ValueResponse
+
+
+def merge_snapshot(
+    previous: Mapping[str, ValueResponse] | None,
+    response: dict[str, ValueResponse],
+    /,
+) -> dict[str, ValueResponse]:
+    """Carry forward the sections and keys of the previous snapshot that are missing in the response.
+
+    The response is updated in place. Missing sections of the previous snapshot are
+    shared without copying them, missing keys of a requested section are added to
+    the section of the response.
+    """
+    if previous:
+        for section_id, previous_section_data in previous.items():
+            section_data: ValueResponse | None = response.get(section_id)
+
+            if not section_data:
+                response[section_id] = previous_section_data
+            elif len(section_data) < len(previous_section_data):
+                for key, values in previous_section_data.items():
+                    section_data.setdefault(key, values)
+
+    return response
+
+
+def carry_forward_attributes(
+    previous: Mapping[str, ValueResponse] | None,
+    response: dict[str, ValueResponse],
+    /,
+) -> dict[str, ValueResponse]:
+    """Add the attributes of the previous snapshot to a response that was read without attributes.
+
+    The response is updated in place. Attributes that are part of the response
+    (e.g. the raw value of human-readable values) are merged into the previous
+    attributes. If they are equal, the previous attribute dictionary is shared.
+    """
+    if previous:
+        for section_id, section_data in response.items():
+            previous_section_data: ValueResponse | None = previous.get(section_id)
+
+            if previous_section_data:
+                for key, values in section_data.items():
+                    _carry_forward_values(previous_section_data.get(key), values)
+
+    return response
+
+
+def _carry_forward_values(previous: Any, values: Any, /) -> None:
+    if isinstance(values, list):
+        if isinstance(previous, list) and len(previous) == len(values):
+            for previous_value, value in zip(previous, values, strict=True):
+                _carry_forward_values(previous_value, value)
+    elif isinstance(values, dict) and isinstance(previous, dict):
+        previous_attributes: dict[str, Any] = previous.get("attributes", {})
+        attributes: dict[str, Any] = values.get("attributes", {})
+
+        if all(previous_attributes.get(attr) == attr_value for attr, attr_value in attributes.items()):
+            values["attributes"] = previous_attributes
+        else:
+            values["attributes"] = {**previous_attributes, **attributes}
+
+
+def replace_value(
+    data: Mapping[str, ValueResponse],
+    value: Any,
+    /,
+    *,
+    section_id: str,
+    key: str,
+    index: int,
+    key_index: int | None,
+) -> dict[str, ValueResponse]:
+    """Return a new snapshot with a single replaced value.
+
+    Only the containers on the path to the value are copied. The attributes and all
+    other sections, keys and positions are shared with the original snapshot.
+    """
+    values: list[list[Value]] | list[Value] | Value = data[section_id][key]
+    new_values: list[list[Value]] | list[Value] | Value
+
+    if isinstance(values, list):
+        value_list: list[Any] = list(values)
+        value_by_index: list[Value] | Value = value_list[index]
+
+        if isinstance(value_by_index, list) and key_index is not None:
+            value_by_key_index: list[Value] = list(value_by_index)
+            value_by_key_index[key_index] = _with_value(value_by_key_index[key_index], value)
+            value_list[index] = value_by_key_index
+        elif isinstance(value_by_index, dict):
+            value_list[index] = _with_value(value_by_index, value)
+
+        new_values = cast("list[list[Value]] | list[Value]", value_list)
+    else:
+        new_values = _with_value(values, value)
+
+    section_data: dict[str, Any] = dict(data[section_id])
+    section_data[key] = new_values
+
+    snapshot: dict[str, ValueResponse] = dict(data)
+    snapshot[section_id] = cast("ValueResponse", section_data)
+
+    return snapshot
+
+
+def _with_value(item: Value, value: Any, /) -> Value:
+    return cast("Value", {**item, "value": value})
+
+
+class AttributeStore:
+    """Store equal attribute dictionaries only once.
+
+    The API returns a new attribute dictionary for every value and every poll, although
+    the attributes (limits, units, selectable values) almost never change. All values
+    with equal attributes share one dictionary instance. When the maximum size is
+    reached, the least recently used dictionary is evicted.
+    """
+
+    __slots__ = ("_attributes", "_max_size")
+
+    def __init__(self, *, max_size: int) -> None:
+        """Initialize."""
+        self._attributes: OrderedDict[tuple[tuple[str, Any], ...], dict[str, Any]] = OrderedDict()
+        self._max_size: int = max_size
+
+    def __len__(self) -> int:
+        """Return the number of stored attribute dictionaries."""
+        return len(self._attributes)
+
+    def deduplicate(self, response: dict[str, ValueResponse], /) -> dict[str, ValueResponse]:
+        """Replace the attribute dictionaries of a response in place with the stored ones."""
+        for section_data in response.values():
+            for values in section_data.values():
+                self._deduplicate_values(values)
+
+        return response
+
+    def _deduplicate_values(self, values: list[list[Value]] | list[Value] | Value, /) -> None:
+        if isinstance(values, list):
+            for value in values:
+                self._deduplicate_values(value)
+        elif isinstance(values, dict) and (attributes := values.get("attributes")) is not None:
+            values["attributes"] = self.get(attributes)
+
+    def get(self, attributes: dict[str, Any], /) -> dict[str, Any]:
+        """Return the stored attribute dictionary that is equal to the given one."""
+        try:
+            fingerprint: tuple[tuple[str, Any], ...] = tuple(attributes.items())
+            stored: dict[str, Any] | None = self._attributes.get(fingerprint)
+        except TypeError:
+            # Attributes with unhashable values (e.g. heating curve points) are kept as they are
+            return attributes
+
+        if stored is None:
+            if len(self._attributes) >= self._max_size:
+                self._attributes.popitem(last=False)
+
+            stored = self._attributes[fingerprint] = attributes
+        else:
+            self._attributes.move_to_end(fingerprint)
+
+        return stored
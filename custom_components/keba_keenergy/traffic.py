@@ -0,0 +1,162 @@
+"""Record of the raw Web HMI traffic for the KEBA KeEnergy integration."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+from collections import deque
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any
+from typing import Final
+from typing import TYPE_CHECKING
+
+from aiohttp import ClientError
+from aiohttp import TraceConfig
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+    from types import SimpleNamespace
+    from aiohttp import ClientSession
+    from aiohttp import TraceRequestChunkSentParams
+    from aiohttp import TraceRequestEndParams
+    from aiohttp import TraceRequestStartParams
+
+_LOGGER = logging.getLogger(__name__)
+
+TRAFFIC_FORMAT_VERSION: Final[int] = 1
+
+
+@dataclass(frozen=True, slots=True)
+class TrafficExchange:
+    """A recorded request to the Web HMI and its response.
+
+    The time is the start of the request in seconds since the start of the
+    recording and the duration is the time until the response is read.
+    """
+
+    time: float
+    duration: float
+    method: str
+    path: str
+    request: str | None
+    status: int
+    response: str
+
+    def as_list(self) -> list[Any]:
+        """Return the exchange as compact JSON serializable list."""
+        return [
+            round(self.time, 4),
+            round(self.duration, 4),
+            self.method,
+            self.path,
+            self.request,
+            self.status,
+            self.response,
+        ]
+
+    @classmethod
+    def from_list(cls, data: list[Any], /) -> TrafficExchange:
+        """Create the exchange from a compact list."""
+        time, duration, method, path, request, status, response = data
+        return cls(
+            time=float(time),
+            duration=float(duration),
+            method=str(method),
+            path=str(path),
+            request=request,
+            status=int(status),
+            response=str(response),
+        )
+
+
+def save_traffic(path: Path, exchanges: Iterable[TrafficExchange], /) -> None:
+    """Save exchanges as gzip compressed JSON lines (do not call from the event loop).
+
+    The first line is a header with the format version, every other line is one
+    exchange as compact list.
+    """
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        file.write(json.dumps({"version": TRAFFIC_FORMAT_VERSION}) + "\n")
+
+        for exchange in exchanges:
+            file.write(json.dumps(exchange.as_list(), separators=(",", ":")) + "\n")
+
+
+def load_traffic(path: Path, /) -> list[TrafficExchange]:
+    """Load the exchanges of a recording (do not call from the event loop)."""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        header: dict[str, Any] = json.loads(file.readline())
+
+        if header.get("version") != TRAFFIC_FORMAT_VERSION:
+            msg: str = f"Unsupported traffic format version: {header.get('version')}"
+            raise ValueError(msg)
+
+        return [TrafficExchange.from_list(json.loads(line)) for line in file if line.strip()]
+
+
+class TrafficRecorder:
+    """Record the exchanges of a client session with an aiohttp trace config.
+
+    Only the last exchanges up to the maximum are kept in memory.
+    """
+
+    def __init__(self, *, max_exchanges: int) -> None:
+        """Initialize."""
+        self.exchanges: deque[TrafficExchange] = deque(maxlen=max_exchanges)
+        self._start: float = monotonic()
+
+        self.trace_config: TraceConfig = TraceConfig()
+        self.trace_config.on_request_start.append(self._on_request_start)
+        self.trace_config.on_request_chunk_sent.append(self._on_request_chunk_sent)
+        self.trace_config.on_request_end.append(self._on_request_end)
+
+    async def _on_request_start(
+        self,
+        _session: ClientSession,
+        context: SimpleNamespace,
+        _params: TraceRequestStartParams,
+    ) -> None:
+        context.start = monotonic()
+        context.chunks = []
+
+    async def _on_request_chunk_sent(
+        self,
+        _session: ClientSession,
+        context: SimpleNamespace,
+        params: TraceRequestChunkSentParams,
+    ) -> None:
+        context.chunks.append(params.chunk)
+
+    async def _on_request_end(
+        self,
+        _session: ClientSession,
+        context: SimpleNamespace,
+        params: TraceRequestEndParams,
+    ) -> None:
+        # The body is cached by the response, so the API can read it again
+        try:
+            response: str = await params.response.text()
+        except (ClientError, TimeoutError, UnicodeDecodeError) as error:
+            # The API reports the failed read, the recording must not fail the request
+            _LOGGER.debug("Skip recording of %s %s: %s", params.method, params.url.path_qs, error)
+            return
+
+        self.exchanges.append(
+            TrafficExchange(
+                time=context.start - self._start,
+                duration=monotonic() - context.start,
+                method=params.method,
+                path=params.url.path_qs,
+                request=b"".join(context.chunks).decode() if context.chunks else None,
+                status=params.response.status,
+                response=response,
+            ),
+        )
+
+    def save(self, path: Path, /) -> None:
+        """Save the recorded exchanges (do not call from the event loop)."""
+        save_traffic(path, list(self.exchanges))
+        _LOGGER.debug("Saved %d recorded exchanges to %s", len(self.exchanges), path)
@@ -0,0 +1,408 @@
+"""Request transport for the KEBA KeEnergy integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from contextlib import nullcontext
+from enum import IntEnum
+from statistics import median
+from typing import Any
+from typing import TYPE_CHECKING
+
+from .scheduler import get_request_size
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from collections.abc import Awaitable
+    from collections.abc import Callable
+    from collections.abc import Hashable
+    from keba_keenergy_api.api import KebaKeEnergyAPI
+    from keba_keenergy_api.constants import Section
+    from keba_keenergy_api.endpoints import Position
+    from keba_keenergy_api.endpoints import ValueResponse
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RequestLane(IntEnum):
+    """Priority lanes of the requests to a control unit (a lower value is served first)."""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+async def gather_or_cancel(*aws: Awaitable[Any]) -> list[Any]:
+    """Run the awaitables concurrently and return their results in order.
+
+    If one awaitable fails, all others are cancelled and the error is raised
+    unchanged (unlike a task group, which raises an exception group).
+    """
+    tasks: list[asyncio.Future[Any]] = [asyncio.ensure_future(aw) for aw in aws]
+
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+def split_request(request: list[Section], /, *, chunk_size: int, position: Position | None) -> list[list[Section]]:
+    """Split a request into chunks with at most chunk size values.
+
+    A chunk size of zero disables the splitting. A single section with more values
+    than the chunk size is never split and becomes an own chunk.
+    """
+    if chunk_size <= 0:
+        return [request] if request else []
+
+    chunks: list[list[Section]] = []
+    chunk: list[Section] = []
+    size: int = 0
+
+    for section in request:
+        section_size: int = get_request_size([section], position=position)
+
+        if chunk and size + section_size > chunk_size:
+            chunks.append(chunk)
+            chunk, size = [], 0
+
+        chunk.append(section)
+        size += section_size
+
+    if chunk:
+        chunks.append(chunk)
+
+    return chunks
+
+
+def merge_responses(responses: list[dict[str, ValueResponse]], /) -> dict[str, ValueResponse]:
+    """Merge the responses of all chunks into one response."""
+    if len(responses) == 1:
+        return responses[0]
+
+    merged: dict[str, ValueResponse] = {}
+
+    for response in responses:
+        for section_id, section_data in response.items():
+            merged.setdefault(section_id, {}).update(section_data)
+
+    return merged
+
+
+class ChunkSizeTuner:
+    """Pick the chunk size with the lowest read latency per value for a control unit.
+
+    The request sizes vary per tick, so the candidates are only compared on reads of
+    the same request plan. The reads of a plan take turns between the candidates
+    until every candidate has enough samples for the plan, then the candidate with
+    the lowest median latency per value is used. The measurement is repeated after
+    the retune interval to follow changes of the control unit load.
+    """
+
+    def __init__(self, candidates: tuple[int, ...], /, *, samples: int, retune_interval: int) -> None:
+        """Initialize."""
+        self._candidates: tuple[int, ...] = candidates
+        self._samples: int = samples
+        self._retune_interval: int = retune_interval
+        self._measurements: dict[Hashable, dict[int, list[float]]] = {}
+        self._latency_per_value: dict[int, float | None] = dict.fromkeys(candidates)
+        self._tuning: bool = True
+        self._reads_since_tuning: int = 0
+        self.best_chunk_size: int | None = None
+
+    @property
+    def chunk_size(self) -> int:
+        """Return the selected chunk size."""
+        return self.best_chunk_size or 0
+
+    def get_chunk_size(self, plan: Hashable, /) -> int:
+        """Return the chunk size for the next read of a request plan."""
+        if not self._tuning:
+            return self.chunk_size
+
+        measurements: dict[int, list[float]] = self._measurements.get(plan, {})
+
+        # The candidate with the fewest samples of the plan is measured next
+        return min(self._candidates, key=lambda candidate: len(measurements.get(candidate, ())))
+
+    def record(self, chunk_size: int, /, *, plan: Hashable, values: int, duration: float) -> None:
+        """Record the duration of a read of a request plan with a chunk size."""
+        if values <= 0:
+            return
+
+        if not self._tuning:
+            self._reads_since_tuning += 1
+
+            if self._reads_since_tuning >= self._retune_interval:
+                self._start_trial()
+
+            return
+
+        if chunk_size not in self._candidates:  # pragma: no cover
+            return
+
+        measurements: dict[int, list[float]] = self._measurements.setdefault(
+            plan,
+            {candidate: [] for candidate in self._candidates},
+        )
+        measurements[chunk_size].append(duration / values)
+
+        if all(len(samples) >= self._samples for samples in measurements.values()):
+            self._finish_trial(measurements)
+
+    def _start_trial(self) -> None:
+        self._measurements = {}
+        self._tuning = True
+        self._reads_since_tuning = 0
+
+    def _finish_trial(self, measurements: dict[int, list[float]], /) -> None:
+        self._measurements = {}
+        self._tuning = False
+        self._latency_per_value = {candidate: median(samples) for candidate, samples in measurements.items()}
+        self.best_chunk_size = min(self._candidates, key=lambda candidate: median(measurements[candidate]))
+
+        _LOGGER.debug(
+            "Select chunk size %s (latency per value: %s)",
+            self.best_chunk_size,
+            self._latency_per_value,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the tuner state as dictionary."""
+        return {
+            "best_chunk_size": self.best_chunk_size,
+            "tuning": self._tuning,
+            "latency_per_value": {
+                str(candidate): latency_per_value for candidate, latency_per_value in self._latency_per_value.items()
+            },
+        }
+
+
+class RequestLaneStats:
+    """Queue depth and wait time of the requests in a lane."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.requests: int = 0
+        self.queue_depth: int = 0
+        self.max_queue_depth: int = 0
+        self.wait_time: float = 0
+        self.max_wait_time: float = 0
+
+    def record_wait(self, wait_time: float, /) -> None:
+        """Record the wait time of a request until it was sent."""
+        self.requests += 1
+        self.wait_time += wait_time
+        self.max_wait_time = max(self.max_wait_time, wait_time)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the lane statistics as dictionary."""
+        return {
+            "requests": self.requests,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "mean_wait_ms": round(self.wait_time / self.requests * 1000, 3) if self.requests else 0,
+            "max_wait_ms": round(self.max_wait_time * 1000, 3),
+        }
+
+
+class RequestScheduler:
+    """Grant the request slots of a control unit by priority lanes.
+
+    The Web HMI serves one request at a time, so a request that is sent while a
+    long poll is running waits behind it. Every request takes a slot, a free slot
+    is granted to the waiting request of the most important lane first and in
+    order of arrival within a lane. A chunked poll takes a slot per chunk, so it
+    yields to interactive requests between the chunks. A running request cannot be
+    interrupted, so a poll without chunks is never interrupted by interactive
+    requests.
+    """
+
+    def __init__(self, *, max_concurrency: int) -> None:
+        """Initialize."""
+        self.max_concurrency: int = max(max_concurrency, 1)
+        self.stats: dict[RequestLane, RequestLaneStats] = {lane: RequestLaneStats() for lane in RequestLane}
+        self._waiters: dict[RequestLane, deque[asyncio.Future[None]]] = {lane: deque() for lane in RequestLane}
+        self._running: int = 0
+
+    def _wake_up(self) -> None:
+        for lane in RequestLane:
+            waiters: deque[asyncio.Future[None]] = self._waiters[lane]
+
+            while waiters and self._running < self.max_concurrency:
+                waiter: asyncio.Future[None] = waiters.popleft()
+
+                if not waiter.done():
+                    self._running += 1
+                    waiter.set_result(None)
+
+    def _release(self) -> None:
+        self._running -= 1
+        self._wake_up()
+
+    async def _acquire(self, lane: RequestLane, /) -> None:
+        if self._running < self.max_concurrency and not any(self._waiters[other] for other in RequestLane):
+            self._running += 1
+            return
+
+        stats: RequestLaneStats = self.stats[lane]
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters[lane].append(waiter)
+        stats.queue_depth += 1
+        stats.max_queue_depth = max(stats.max_queue_depth, stats.queue_depth)
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was granted while the request was cancelled
+                self._release()
+            elif waiter in self._waiters[lane]:
+                self._waiters[lane].remove(waiter)
+
+            raise
+        finally:
+            stats.queue_depth -= 1
+
+    @asynccontextmanager
+    async def slot(self, lane: RequestLane, /) -> AsyncIterator[None]:
+        """Wait for a request slot in the lane and hold it while the request runs."""
+        start: float = time.monotonic()
+        await self._acquire(lane)
+
+        try:
+            self.stats[lane].record_wait(time.monotonic() - start)
+            yield
+        finally:
+            self._release()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics of all lanes as dictionary."""
+        return {lane.name.lower(): stats.as_dict() for lane, stats in self.stats.items()}
+
+
+class KebaKeEnergyTransport:
+    """Send requests in bounded chunks with a concurrency limit to the API.
+
+    The requests are ordered by the priority lanes of the request scheduler. The
+    optional request limit is shared by the transports of all config entries and
+    bounds the concurrent background requests to all control units, interactive
+    requests never wait for other control units.
+    """
+
+    def __init__(
+        self,
+        api: KebaKeEnergyAPI,
+        /,
+        *,
+        chunk_size: int,
+        max_concurrency: int,
+        tuner: ChunkSizeTuner | None = None,
+        request_limit: asyncio.Semaphore | None = None,
+    ) -> None:
+        """Initialize."""
+        self._api: KebaKeEnergyAPI = api
+        self._chunk_size: int = chunk_size
+        self.scheduler: RequestScheduler = RequestScheduler(max_concurrency=max_concurrency)
+        self._request_limit: asyncio.Semaphore | None = request_limit
+        self.tuner: ChunkSizeTuner | None = tuner
+
+    @property
+    def chunk_size(self) -> int:
+        """Return the chunk size for the next read."""
+        return self.tuner.chunk_size if self.tuner else self._chunk_size
+
+    async def read_data(
+        self,
+        request: list[Section],
+        /,
+        *,
+        position: Position | None,
+        extra_attributes: bool = True,
+        lane: RequestLane = RequestLane.BACKGROUND,
+    ) -> dict[str, ValueResponse]:
+        """Read the request from the API and merge the responses of all chunks.
+
+        Only the background reads (the polls) are measured by the chunk size tuner,
+        the small interactive reads use the selected chunk size.
+        """
+        tuner: ChunkSizeTuner | None = self.tuner if lane is RequestLane.BACKGROUND else None
+        plan: tuple[tuple[Section, ...], bool] = (tuple(request), extra_attributes)
+        chunk_size: int = tuner.get_chunk_size(plan) if tuner else self.chunk_size
+        chunks: list[list[Section]] = split_request(request, chunk_size=chunk_size, position=position)
+        results: list[tuple[dict[str, ValueResponse], float]]
+
+        if len(chunks) <= 1:
+            results = [await self._read(request, position=position, extra_attributes=extra_attributes, lane=lane)]
+        else:
+            _LOGGER.debug("Read %d sections in %d chunks (chunk size: %d)", len(request), len(chunks), chunk_size)
+
+            results = await gather_or_cancel(
+                *(
+                    self._read(chunk, position=position, extra_attributes=extra_attributes, lane=lane)
+                    for chunk in chunks
+                ),
+            )
+
+        if tuner:
+            # The requests are timed in their slots, the waits for a slot and for the shared
+            # request limit measure the load of other requests and not of the control unit.
+            tuner.record(
+                chunk_size,
+                plan=plan,
+                values=get_request_size(request, position=position),
+                duration=sum(duration for _, duration in results),
+            )
+
+        return merge_responses([response for response, _ in results])
+
+    async def _read(
+        self,
+        request: list[Section],
+        /,
+        *,
+        position: Position | None,
+        extra_attributes: bool,
+        lane: RequestLane,
+    ) -> tuple[dict[str, ValueResponse], float]:
+        return await self._timed_call(
+            lambda: self._api.read_data(request=request, position=position, extra_attributes=extra_attributes),
+            lane=lane,
+        )
+
+    async def call(self, fn: Callable[[], Awaitable[Any]], /, *, lane: RequestLane) -> Any:
+        """Send a request to the API in a slot of the lane and return the result.
+
+        A background request waits for the shared request limit before it takes a
+        slot, so it never holds a slot of the control unit while other control
+        units are served.
+        """
+        result, _ = await self._timed_call(fn, lane=lane)
+        return result
+
+    async def _timed_call(self, fn: Callable[[], Awaitable[Any]], /, *, lane: RequestLane) -> tuple[Any, float]:
+        """Send a request like call and return the result and the duration in the slot."""
+        async with (
+            self._request_limit if self._request_limit and lane is RequestLane.BACKGROUND else nullcontext(),
+            self.scheduler.slot(lane),
+        ):
+            start: float = time.monotonic()
+            result: Any = await fn()
+
+            return result, time.monotonic() - start
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the transport state as dictionary."""
+        return {
+            "chunk_size": self.chunk_size,
+            "max_concurrency": self.scheduler.max_concurrency,
+            "tuner": self.tuner.as_dict() if self.tuner else None,
+            "lanes": self.scheduler.as_dict(),
+        }
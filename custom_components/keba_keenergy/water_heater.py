@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-from functools import cached_property
 from typing import Any
 from typing import Final
 from typing import TYPE_CHECKING
@@ -110,6 +109,11 @@ class KebaKeEnergyHotWaterTankEntity(KebaKeEnergyWaterHeaterTankEntity, WaterHea
         self._pending_section = HotWaterTank.TARGET_TEMPERATURE
         self._pending_device_numbers = self.coordinator.hot_water_tank_numbers
 
+    @property
+    def consumed_keys(self) -> tuple[str, ...]:
+        """Return the keys of the coordinator data that the entity reads."""
+        return "current_temperature", "standby_temperature", "target_temperature", "operating_mode"
+
     @property
     def current_temperature(self) -> float | None:
         """Return the current temperature."""
@@ -127,12 +131,12 @@ class KebaKeEnergyHotWaterTankEntity(KebaKeEnergyWaterHeaterTankEntity, WaterHea
 
         return target_temperature
 
-    @cached_property
+    @property
     def min_temp(self) -> float:
         """Return the minimum temperature."""
         return float(self.get_attribute("target_temperature", attr="lower_limit"))
 
-    @cached_property
+    @property
     def max_temp(self) -> float:
         """Return the maximum temperature."""
         return float(self.get_attribute("target_temperature", attr="upper_limit"))
@@ -225,6 +229,17 @@ class KebaKeEnergyBufferTankEntity(KebaKeEnergyWaterHeaterTankEntity, WaterHeate
 
         self.entity_id: str = f"{WATER_HEATER_DOMAIN}.{DOMAIN}_{self._attr_unique_id}"
 
+    @property
+    def consumed_keys(self) -> tuple[str, ...]:
+        """Return the keys of the coordinator data that the entity reads."""
+        return (
+            "current_top_temperature",
+            "current_bottom_temperature",
+            "standby_temperature",
+            "target_temperature",
+            "operating_mode",
+        )
+
     @property
     def current_temperature(self) -> float | None:
         """Return the current temperature."""
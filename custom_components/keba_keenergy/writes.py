@@ -0,0 +1,87 @@
+"""Coalesced writes for the KEBA KeEnergy integration."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from typing import TYPE_CHECKING
+
+from .budget import WritePriority
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from keba_keenergy_api.constants import Section
+
+
+def merge_write_request(target: dict[Section, Any], request: Mapping[Section, Any], /) -> None:
+    """Merge a write request into the target request.
+
+    Per-position value lists (or tuples) are merged position by position, a position
+    without a value (None) keeps the value of the target. All other values replace
+    the value of the target, so the last request wins.
+    """
+    for section, value in request.items():
+        current: Any = target.get(section)
+
+        if isinstance(current, list | tuple) and isinstance(value, list | tuple) and len(current) == len(value):
+            target[section] = [c if v is None else v for c, v in zip(current, value, strict=True)]
+        else:
+            target[section] = value
+
+
+class WriteBatch:
+    """Write requests that are merged into one API write.
+
+    Every caller gets an own future, that reports the result of the merged write.
+    The result is False if the write was deferred by the flash write budget.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.request: dict[Section, Any] = {}
+        self.ignore_weekly_write_count: bool = True
+        self.priority: WritePriority = WritePriority.AUTOMATION
+        self._futures: list[asyncio.Future[bool]] = []
+
+    def __len__(self) -> int:
+        """Return the number of merged write requests."""
+        return len(self._futures)
+
+    def add(
+        self,
+        request: Mapping[Section, Any],
+        /,
+        *,
+        ignore_weekly_write_count: bool,
+        priority: WritePriority = WritePriority.USER,
+    ) -> asyncio.Future[bool]:
+        """Merge a write request and return a future for the result of the write."""
+        merge_write_request(self.request, request)
+
+        # The merged write has the highest priority of all requests
+        self.priority = max(self.priority, priority)
+
+        # The merged write is counted if at least one request must be counted
+        self.ignore_weekly_write_count = self.ignore_weekly_write_count and ignore_weekly_write_count
+
+        future: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        self._futures.append(future)
+
+        return future
+
+    def set_result(self, *, written: bool = True) -> None:
+        """Report a successful or deferred write to all callers."""
+        for future in self._futures:
+            if not future.done():
+                future.set_result(written)
+
+    def set_exception(self, error: BaseException, /) -> None:
+        """Report a failed write to all callers."""
+        for future in self._futures:
+            if not future.done():
+                future.set_exception(error)
+
+    def cancel(self) -> None:
+        """Cancel the futures of all callers."""
+        for future in self._futures:
+            future.cancel()
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+from typing import Any
 from typing import TYPE_CHECKING
 
 from homeassistant.helpers.translation import async_get_translations
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
     from homeassistant.core import HomeAssistant
     from pytest_homeassistant_custom_component.common import MockConfigEntry
 
@@ -27,3 +29,15 @@ async def init_translations(hass: HomeAssistant, config_entry: MockConfigEntry,
     )
 
     return translations
+
+
+def scale_positions(data: dict[str, Any], /, *, factor: int, section_ids: Iterable[str]) -> dict[str, Any]:
+    """Create synthetic data with the positions of the sections repeated by the factor."""
+    return {
+        section_id: (
+            {key: values * factor if isinstance(values, list) else values for key, values in section_data.items()}
+            if section_id in section_ids
+            else section_data
+        )
+        for section_id, section_data in data.items()
+    }
@@ -0,0 +1,224 @@
+"""Soak benchmark for many control units in one Home Assistant instance.
+
+The benchmark drives the poll cycles of all set up config entries with a
+virtual event loop clock and measures the event loop lag, the CPU time and the
+allocations per tick and the memory growth over the cycles.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import tracemalloc
+from contextlib import suppress
+from dataclasses import asdict
+from dataclasses import dataclass
+from statistics import quantiles
+from typing import Any
+from typing import Final
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from homeassistant.core import HomeAssistant
+    from custom_components.keba_keenergy.coordinator import KebaKeEnergyDataUpdateCoordinator
+
+LOOP_LAG_INTERVAL: Final[float] = 0.005
+MEMORY_GROWTH_TOP_LOCATIONS: Final[int] = 10
+
+
+class LoopLagMonitor:
+    """Measure how late the event loop wakes up a periodic sleep.
+
+    The lag is measured with the monotonic clock, because the event loop clock is
+    advanced by the benchmark.
+    """
+
+    def __init__(self, *, interval: float = LOOP_LAG_INTERVAL) -> None:
+        """Initialize."""
+        self.interval: float = interval
+        self.samples: list[float] = []
+        self._task: asyncio.Task[None] | None = None
+
+    async def _async_run(self) -> None:
+        while True:
+            start: float = time.monotonic()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(time.monotonic() - start - self.interval, 0))
+
+    def start(self) -> None:
+        """Start the measurement."""
+        self._task = asyncio.get_running_loop().create_task(self._async_run())
+
+    async def async_stop(self) -> None:
+        """Stop the measurement."""
+        if self._task:
+            self._task.cancel()
+
+            with suppress(asyncio.CancelledError):
+                await self._task
+
+            self._task = None
+
+    def percentiles(self) -> dict[str, float]:
+        """Return the lag percentiles in milliseconds."""
+        if len(self.samples) < 2:
+            return {"p50": 0, "p95": 0, "p99": 0, "max": 0}
+
+        cuts: list[float] = quantiles(self.samples, n=100, method="inclusive")
+
+        return {
+            "p50": round(cuts[49] * 1000, 3),
+            "p95": round(cuts[94] * 1000, 3),
+            "p99": round(cuts[98] * 1000, 3),
+            "max": round(max(self.samples) * 1000, 3),
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class SoakBenchmarkResult:
+    """The machine-readable result of a soak benchmark.
+
+    The allocation peak is the traced memory high-water mark above the memory at
+    the start of a cycle. The retained blocks and the memory growth are the
+    traced blocks and bytes that are still allocated after the traced cycles.
+    """
+
+    controllers: int
+    cycles: int
+    ticks: int
+    duration: float
+    loop_lag_ms: dict[str, float]
+    cpu_time_per_tick_ms: float
+    allocation_peak_bytes_per_tick: float
+    retained_blocks_per_tick: float
+    memory_growth_bytes: int
+    memory_growth_top: list[dict[str, Any]]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the result as JSON serializable dictionary."""
+        return asdict(self)
+
+
+class SoakBenchmark:
+    """Run accelerated poll cycles for the coordinators of all config entries.
+
+    Every cycle advances the event loop clock by the update interval in steps, so
+    due polls fire at their phase within the cycle and are scheduled again on the
+    advanced clock. The first pass measures the loop lag and
+    the CPU time. The second pass traces the allocations, because the tracing
+    slows down the event loop.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinators: list[KebaKeEnergyDataUpdateCoordinator],
+        /,
+        *,
+        cycles: int,
+        steps_per_cycle: int = 4,
+        warmup_cycles: int = 2,
+    ) -> None:
+        """Initialize."""
+        self.hass: HomeAssistant = hass
+        self.coordinators: list[KebaKeEnergyDataUpdateCoordinator] = coordinators
+        self.cycles: int = cycles
+        self.steps_per_cycle: int = steps_per_cycle
+        self.warmup_cycles: int = warmup_cycles
+        self._clock_offset: float = 0
+
+    @property
+    def _ticks(self) -> int:
+        return sum(coordinator.tick for coordinator in self.coordinators)
+
+    async def _async_run_cycles(self, cycles: int, /) -> None:
+        interval: float = max(
+            (coordinator.scan_interval.total_seconds() for coordinator in self.coordinators),
+            default=1,
+        )
+
+        for _ in range(cycles):
+            for _ in range(self.steps_per_cycle):
+                self._clock_offset += interval / self.steps_per_cycle
+                async_fire_time_changed(self.hass)
+                await self.hass.async_block_till_done(wait_background_tasks=True)
+
+    async def async_run(self) -> SoakBenchmarkResult:
+        """Run the benchmark and return the result."""
+        loop_time: Callable[[], float] = self.hass.loop.time
+
+        with patch.object(self.hass.loop, "time", new=lambda: loop_time() + self._clock_offset):
+            return await self._async_run()
+
+    async def _async_run(self) -> SoakBenchmarkResult:
+        await self._async_run_cycles(self.warmup_cycles)
+
+        # Loop lag and CPU time
+        monitor: LoopLagMonitor = LoopLagMonitor()
+        ticks: int = self._ticks
+        cpu_start: float = time.process_time()
+        start: float = time.monotonic()
+
+        monitor.start()
+
+        try:
+            await self._async_run_cycles(self.cycles)
+        finally:
+            await monitor.async_stop()
+
+        duration: float = time.monotonic() - start
+        cpu_time: float = time.process_time() - cpu_start
+        measured_ticks: int = self._ticks - ticks
+
+        # Allocations and memory growth
+        tracemalloc.start()
+
+        try:
+            await self._async_run_cycles(1)
+
+            snapshot_start: tracemalloc.Snapshot = tracemalloc.take_snapshot()
+            memory_start: int = tracemalloc.get_traced_memory()[0]
+            ticks = self._ticks
+            allocation_peak: int = 0
+
+            for _ in range(self.cycles):
+                current: int = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                await self._async_run_cycles(1)
+                allocation_peak += tracemalloc.get_traced_memory()[1] - current
+
+            traced_ticks: int = max(self._ticks - ticks, 1)
+            memory_growth: int = tracemalloc.get_traced_memory()[0] - memory_start
+            statistics: list[tracemalloc.StatisticDiff] = tracemalloc.take_snapshot().compare_to(
+                snapshot_start,
+                "lineno",
+            )
+        finally:
+            tracemalloc.stop()
+
+        return SoakBenchmarkResult(
+            controllers=len(self.coordinators),
+            cycles=self.cycles,
+            ticks=measured_ticks,
+            duration=round(duration, 3),
+            loop_lag_ms=monitor.percentiles(),
+            cpu_time_per_tick_ms=round(cpu_time / max(measured_ticks, 1) * 1000, 3),
+            allocation_peak_bytes_per_tick=round(allocation_peak / traced_ticks, 1),
+            retained_blocks_per_tick=round(
+                sum(statistic.count_diff for statistic in statistics if statistic.count_diff > 0) / traced_ticks,
+                1,
+            ),
+            memory_growth_bytes=memory_growth,
+            memory_growth_top=[
+                {
+                    "location": str(statistic.traceback),
+                    "size_diff": statistic.size_diff,
+                    "count_diff": statistic.count_diff,
+                }
+                for statistic in statistics[:MEMORY_GROWTH_TOP_LOCATIONS]
+            ],
+        )
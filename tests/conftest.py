@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import logging
+from functools import partial
 from typing import Any
 from typing import TYPE_CHECKING
 from unittest.mock import patch
@@ -28,6 +29,8 @@ if TYPE_CHECKING:
     from _pytest.fixtures import SubRequest
     from homeassistant.core import HomeAssistant
     from syrupy.assertion import SnapshotAssertion
+    from custom_components.keba_keenergy.traffic import TrafficExchange
+    from tests.replay import TrafficReplay
 
 
 @pytest.fixture
@@ -174,6 +177,30 @@ class FakeKebaKeEnergyAPI:
 
         return AiohttpClientMockResponse(method, url=url)
 
+    def register_replay(self, host: str, replay: TrafficReplay, /, *, ssl: bool = False) -> None:
+        schema: str = "https" if ssl else "http"
+
+        # Paths with a query must be matched before the same path without a query
+        for path in sorted(replay.paths, key=len, reverse=True):
+            self.aioclient_mock.post(f"{schema}://{host}{path}", side_effect=partial(self._replay_sideeffect, replay))
+
+    @staticmethod
+    async def _replay_sideeffect(
+        replay: TrafficReplay,
+        method: str,
+        url: URL,
+        data: str | None = None,
+    ) -> AiohttpClientMockResponse:
+        exchange: TrafficExchange = await replay.async_respond(method, url.path_qs, data)
+
+        return AiohttpClientMockResponse(
+            method,
+            url=url,
+            status=exchange.status,
+            text=exchange.response,
+            headers={"Content-Type": "application/json;charset=utf-8"},
+        )
+
     def assert_called_write_with(self, data: str, /) -> None:
         assert (
             "POST",
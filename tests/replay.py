@@ -0,0 +1,64 @@
+"""Replay of recorded Web HMI traffic for tests."""
+
+from __future__ import annotations
+
+from asyncio import sleep
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from custom_components.keba_keenergy.traffic import TrafficExchange
+
+
+class TrafficReplay:
+    """Serve recorded exchanges back in the recorded order.
+
+    A request is answered with the next exchange of the same method and path with
+    an equal request body, or with the next exchange of the path if there is no
+    equal request. The last exchange of a path is repeated when all exchanges are
+    served. The response is delayed by the recorded duration divided by the speed,
+    without delay if the speed is None.
+    """
+
+    def __init__(self, exchanges: Iterable[TrafficExchange], /, *, speed: float | None = 1) -> None:
+        """Initialize."""
+        self.speed: float | None = speed
+        self._exchanges: dict[tuple[str, str], list[TrafficExchange]] = {}
+        self._next: dict[tuple[str, str], int] = {}
+
+        for exchange in exchanges:
+            self._exchanges.setdefault((exchange.method, exchange.path), []).append(exchange)
+
+    @property
+    def paths(self) -> set[str]:
+        """Return the recorded paths."""
+        return {path for _, path in self._exchanges}
+
+    def get(self, method: str, path: str, request: str | None, /) -> TrafficExchange:
+        """Return the recorded exchange for a request.
+
+        Raises LookupError if the path was not recorded.
+        """
+        exchanges: list[TrafficExchange] | None = self._exchanges.get((method, path))
+
+        if not exchanges:
+            msg: str = f"No recorded exchange for {method} {path}"
+            raise LookupError(msg)
+
+        start: int = self._next.get((method, path), 0)
+        index: int = next(
+            (index for index in range(start, len(exchanges)) if exchanges[index].request == request),
+            min(start, len(exchanges) - 1),
+        )
+        self._next[method, path] = index + 1
+
+        return exchanges[index]
+
+    async def async_respond(self, method: str, path: str, request: str | None, /) -> TrafficExchange:
+        """Return the recorded exchange for a request after the recorded duration."""
+        exchange: TrafficExchange = self.get(method, path, request)
+
+        if self.speed:
+            await sleep(exchange.duration / self.speed)
+
+        return exchange
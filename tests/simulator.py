@@ -0,0 +1,299 @@
+"""Simulated KEBA KeEnergy Web HMI for load and latency tests.
+
+The simulator answers the endpoints of the Web HMI that are used by the
+integration. The value of every variable is derived from the endpoint
+definitions of the API, so the integration can run end-to-end without hardware
+for any device topology.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import re
+from collections import Counter
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Final
+from typing import TYPE_CHECKING
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from keba_keenergy_api.constants import BoolEnum
+from keba_keenergy_api.constants import BufferTank
+from keba_keenergy_api.constants import ExternalHeatSource
+from keba_keenergy_api.constants import FloatEndpoint
+from keba_keenergy_api.constants import HeatCircuit
+from keba_keenergy_api.constants import HeatPump
+from keba_keenergy_api.constants import HotWaterTank
+from keba_keenergy_api.constants import IntegerEndpoint
+from keba_keenergy_api.constants import LineTablePool
+from keba_keenergy_api.constants import PassiveCooling
+from keba_keenergy_api.constants import Photovoltaics
+from keba_keenergy_api.constants import SolarCircuit
+from keba_keenergy_api.constants import SwitchValve
+from keba_keenergy_api.constants import System
+
+from tests.api_data import HMI_RESPONSE
+from tests.api_data import SYSTEM_RESPONSE
+from tests.api_data import TIMEZONE_RESPONSE
+
+if TYPE_CHECKING:
+    from keba_keenergy_api.constants import Endpoint
+
+INDEX_PATTERN: Final[re.Pattern[str]] = re.compile(r"\[(\d+)\]")
+
+DEFAULT_VALUES: Final[dict[type[Any], str]] = {float: "20.0", int: "1", str: "simulated"}
+
+NUMERIC_ATTRIBUTES: Final[dict[str, str]] = {"lowerLimit": "0", "upperLimit": "100"}
+
+ENDPOINTS: Final[dict[str, Endpoint]] = {
+    member.value.value: member.value
+    for enum in (
+        System,
+        BufferTank,
+        HotWaterTank,
+        HeatPump,
+        HeatCircuit,
+        SolarCircuit,
+        ExternalHeatSource,
+        SwitchValve,
+        PassiveCooling,
+        Photovoltaics,
+        LineTablePool,
+    )
+    for member in enum
+}
+
+
+@dataclass(frozen=True, slots=True)
+class SimulatorTopology:
+    """The installed devices of the simulated control unit."""
+
+    heat_circuits: int = 1
+    heat_pumps: int = 1
+    hot_water_tanks: int = 1
+    buffer_tanks: int = 0
+    solar_circuits: int = 0
+    external_heat_sources: int = 0
+    switch_valves: int = 0
+    photovoltaics: bool = False
+    heating_curves: int = 2
+
+    @property
+    def numbers(self) -> dict[str, int]:
+        """Return the number of devices by the system variable name."""
+        return {
+            System.HEAT_CIRCUIT_NUMBERS.value.value: self.heat_circuits,
+            System.HEAT_PUMP_NUMBERS.value.value: self.heat_pumps,
+            System.HOT_WATER_TANK_NUMBERS.value.value: self.hot_water_tanks,
+            System.BUFFER_TANK_NUMBERS.value.value: self.buffer_tanks,
+            System.SOLAR_CIRCUIT_NUMBERS.value.value: self.solar_circuits,
+            System.EXTERNAL_HEAT_SOURCE_NUMBERS.value.value: self.external_heat_sources,
+            System.SWITCH_VALVE_NUMBERS.value.value: self.switch_valves,
+        }
+
+
+@dataclass(slots=True)
+class SimulatorStats:
+    """Counters of the served requests."""
+
+    requests: Counter[str] = field(default_factory=Counter)
+    keys_read: int = 0
+    keys_written: int = 0
+    errors: int = 0
+    max_queue_depth: int = 0
+    writes: list[dict[str, str]] = field(default_factory=list)
+
+
+class KebaKeEnergySimulator:
+    """Simulate the Web HMI of a KEBA KeEnergy control unit.
+
+    The Web HMI serves one request at a time, so concurrent requests are queued.
+    Every request is delayed by the latency with a random jitter and by the
+    simulated CPU cost per read or written key. A share of the requests given by
+    the error rate fails with an internal server error. Read-only float values
+    change on a read with the change rate, written values are kept and read back.
+    """
+
+    def __init__(
+        self,
+        topology: SimulatorTopology | None = None,
+        /,
+        *,
+        serial_number: int = 12345678,
+        latency: float = 0,
+        jitter: float = 0,
+        error_rate: float = 0,
+        cpu_cost_per_key: float = 0,
+        change_rate: float = 0,
+        seed: int | None = 0,
+    ) -> None:
+        """Initialize."""
+        self.topology: SimulatorTopology = topology or SimulatorTopology()
+        self.serial_number: int = serial_number
+        self.latency: float = latency
+        self.jitter: float = jitter
+        self.error_rate: float = error_rate
+        self.cpu_cost_per_key: float = cpu_cost_per_key
+        self.change_rate: float = change_rate
+        self.stats: SimulatorStats = SimulatorStats()
+        self.values: dict[str, str] = {}
+
+        self._random: random.Random = random.Random(seed)  # noqa: S311
+        self._busy: asyncio.Lock = asyncio.Lock()
+        self._queue_depth: int = 0
+
+        self.app: web.Application = web.Application()
+        self.app.router.add_post("/deviceControl", self._handle_device_control)
+        self.app.router.add_post("/swupdate", self._handle_sw_update)
+        self.app.router.add_post("/dateTime", self._handle_date_time)
+        self.app.router.add_post("/var/readVarChildren", self._handle_read_var_children)
+        self.app.router.add_post("/var/readWriteVars", self._handle_read_write_vars)
+
+    @staticmethod
+    def _endpoint(name: str, /) -> Endpoint | None:
+        """Return the endpoint definition of a variable name with or without fixed indices."""
+        return ENDPOINTS.get(name) or ENDPOINTS.get(INDEX_PATTERN.sub("[%s]", name))
+
+    def _topology_value(self, name: str, endpoint: Endpoint, /) -> str | None:
+        indices: list[int] = [int(index) for index in INDEX_PATTERN.findall(name)]
+
+        if name in self.topology.numbers:
+            return str(self.topology.numbers[name])
+        if endpoint is System.HAS_PHOTOVOLTAICS.value:
+            return str(self.topology.photovoltaics).lower()
+        if endpoint is LineTablePool.HEATING_CURVE_NAME.value:
+            return f"HC{indices[0] + 1}" if indices[0] < self.topology.heating_curves else ""
+        if endpoint is HeatCircuit.HEATING_CURVE.value:
+            return f"HC{indices[0] % self.topology.heating_curves + 1}"
+
+        return None
+
+    def _default_value(self, name: str, endpoint: Endpoint, /) -> str:
+        if (value := self._topology_value(name, endpoint)) is not None:
+            return value
+        if endpoint.human_readable is BoolEnum and endpoint.value_type is str:
+            return "true"
+        if endpoint.human_readable is not None:
+            member_value: Any = next(iter(endpoint.human_readable)).value
+            return str(member_value[0] if isinstance(member_value, tuple) else member_value)
+
+        return DEFAULT_VALUES[endpoint.value_type]
+
+    def get_value(self, name: str, /) -> str:
+        """Return the current value of a variable."""
+        endpoint: Endpoint | None = self._endpoint(name)
+
+        if name not in self.values:
+            self.values[name] = self._default_value(name, endpoint) if endpoint else "0"
+        elif (
+            self.change_rate
+            and isinstance(endpoint, FloatEndpoint)
+            and endpoint.read_only
+            and self._random.random() < self.change_rate
+        ):
+            self.values[name] = str(round(float(self.values[name]) + self._random.uniform(-1, 1), 2))
+
+        return self.values[name]
+
+    def _read_var(self, name: str, /, *, attributes: bool) -> dict[str, Any]:
+        endpoint: Endpoint | None = self._endpoint(name)
+        response: dict[str, Any] = {"name": name}
+
+        if attributes:
+            response["attributes"] = (
+                {"longText": name.rsplit(".", 1)[-1]} | NUMERIC_ATTRIBUTES
+                if isinstance(endpoint, FloatEndpoint | IntegerEndpoint) and endpoint.human_readable is None
+                else {"longText": name.rsplit(".", 1)[-1]}
+            )
+
+        response["value"] = self.get_value(name)
+
+        return response
+
+    async def _async_process(self, path: str, keys: int, /) -> web.Response | None:
+        """Wait for the Web HMI and return an error response for a failed request."""
+        self.stats.requests[path] += 1
+        self._queue_depth += 1
+        self.stats.max_queue_depth = max(self.stats.max_queue_depth, self._queue_depth)
+
+        try:
+            async with self._busy:
+                delay: float = max(
+                    0,
+                    self.latency + self._random.uniform(-self.jitter, self.jitter) + self.cpu_cost_per_key * keys,
+                )
+
+                if delay:
+                    await asyncio.sleep(delay)
+        finally:
+            self._queue_depth -= 1
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.stats.errors += 1
+            return web.json_response(
+                {"developerMessage": "Simulated error"},
+                status=web.HTTPInternalServerError.status_code,
+            )
+
+        return None
+
+    async def _handle_device_control(self, request: web.Request) -> web.Response:
+        return await self._async_process(request.path_qs, 0) or web.json_response(
+            {
+                "ret": "OK",
+                "revNo": 2,
+                "orderNo": 0,
+                "serNo": self.serial_number,
+                "name": "AP 440/H-A",
+                "variantNo": 0,
+            },
+        )
+
+    async def _handle_sw_update(self, request: web.Request) -> web.Response:
+        return await self._async_process(request.path_qs, 0) or web.json_response(
+            HMI_RESPONSE if request.query.get("action") == "getHmiInstalled" else SYSTEM_RESPONSE,
+        )
+
+    async def _handle_date_time(self, request: web.Request) -> web.Response:
+        return await self._async_process(request.path_qs, 0) or web.json_response(TIMEZONE_RESPONSE)
+
+    async def _handle_read_var_children(self, request: web.Request) -> web.Response:
+        payload: dict[str, str] = json.loads(await request.text())
+
+        return await self._async_process(request.path_qs, 1) or web.json_response(
+            {"ret": "OK", "children": []} if self._endpoint(payload["parent"]) else {"ret": "ERROR"},
+        )
+
+    async def _handle_read_write_vars(self, request: web.Request) -> web.Response:
+        payload: list[dict[str, str]] = json.loads(await request.text())
+
+        if error := await self._async_process(request.path_qs, len(payload)):
+            return error
+
+        if request.query.get("action") == "set":
+            self.stats.keys_written += len(payload)
+            self.stats.writes.append({item["name"]: item["value"] for item in payload})
+            self.values.update({item["name"]: item["value"] for item in payload})
+            return web.json_response([])
+
+        self.stats.keys_read += len(payload)
+
+        return web.json_response([self._read_var(item["name"], attributes=item.get("attr") == "1") for item in payload])
+
+
+class KebaKeEnergySimulatorServer(TestServer):
+    """Serve a simulated Web HMI on the local host."""
+
+    def __init__(self, simulator: KebaKeEnergySimulator, /) -> None:
+        """Initialize."""
+        super().__init__(simulator.app, host="127.0.0.1")
+        self.simulator: KebaKeEnergySimulator = simulator
+
+    @property
+    def address(self) -> str:
+        """Return the host and port for the config entry."""
+        return f"{self.host}:{self.port}"
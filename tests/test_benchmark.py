@@ -0,0 +1,101 @@
+"""Soak benchmark with many control units against simulated Web HMIs.
+
+The benchmark is excluded from the default run, run it with `pytest -m performance`.
+The results are written as JSON to the reports directory.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from contextlib import AsyncExitStack
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.const import CONF_HOST
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.keba_keenergy.const import DOMAIN
+from tests import setup_integration
+from tests.benchmark import SoakBenchmark
+from tests.benchmark import SoakBenchmarkResult
+from tests.simulator import KebaKeEnergySimulator
+from tests.simulator import KebaKeEnergySimulatorServer
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+    from pathlib import Path
+    from _pytest.fixtures import SubRequest
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+pytestmark = pytest.mark.performance
+
+CYCLES: int = 20
+LOOP_LAG_P99_BUDGET_MS: float = 250
+
+
+def _write_result(path: Path, result: SoakBenchmarkResult, /) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(result.as_dict(), indent=2), encoding="utf-8")
+
+
+@pytest.fixture
+async def simulator_servers(request: SubRequest) -> AsyncGenerator[list[KebaKeEnergySimulatorServer]]:
+    """Serve one simulated Web HMI per control unit, the number is passed by indirect parametrization."""
+    async with AsyncExitStack() as stack:
+        yield [
+            await stack.enter_async_context(
+                KebaKeEnergySimulatorServer(
+                    KebaKeEnergySimulator(
+                        serial_number=10_000_000 + index,
+                        latency=0.01,
+                        jitter=0.005,
+                        change_rate=0.2,
+                        seed=index,
+                    ),
+                ),
+            )
+            for index in range(request.param)
+        ]
+
+
+@pytest.mark.parametrize("simulator_servers", [10, 100], indirect=True, ids=["10", "100"])
+async def test_soak_benchmark(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    simulator_servers: list[KebaKeEnergySimulatorServer],
+    request: pytest.FixtureRequest,
+) -> None:
+    config_entries: list[MockConfigEntry] = [
+        MockConfigEntry(
+            domain=DOMAIN,
+            title=f"KEBA KeEnergy ({server.address})",
+            data=config_entry.data | {CONF_HOST: server.address},
+            unique_id=str(server.simulator.serial_number),
+            options=config_entry.options,
+        )
+        for server in simulator_servers
+    ]
+
+    for entry in config_entries:
+        await setup_integration(hass, entry)
+
+    result: SoakBenchmarkResult = await SoakBenchmark(
+        hass,
+        [entry.runtime_data for entry in config_entries],
+        cycles=CYCLES,
+    ).async_run()
+
+    path: Path = request.config.rootpath / "reports" / f"soak_benchmark_{len(config_entries)}.json"
+    await hass.async_add_executor_job(_write_result, path, result)
+
+    _LOGGER.info("Soak benchmark: %s", json.dumps(result.as_dict() | {"memory_growth_top": None}))
+
+    # Every control unit polls once per cycle
+    assert result.ticks == len(config_entries) * CYCLES
+    assert result.loop_lag_ms["p99"] < LOOP_LAG_P99_BUDGET_MS
+
+    for entry in config_entries:
+        await hass.config_entries.async_unload(entry.entry_id)
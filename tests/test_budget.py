@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+from homeassistant.core import Context
+
+from custom_components.keba_keenergy.budget import FlashWriteBudget
+from custom_components.keba_keenergy.budget import WritePriority
+from custom_components.keba_keenergy.budget import get_iso_week
+from custom_components.keba_keenergy.budget import get_write_priority
+
+
+def test_get_iso_week() -> None:
+    assert get_iso_week(date(2026, 1, 1)) == (2026, 1)
+    assert get_iso_week(date(2027, 1, 1)) == (2026, 53)
+
+
+@pytest.mark.parametrize(
+    ("context", "expected"),
+    [
+        (None, WritePriority.AUTOMATION),
+        (Context(), WritePriority.AUTOMATION),
+        (Context(user_id="abcdef"), WritePriority.USER),
+    ],
+)
+def test_get_write_priority(context: Context | None, expected: WritePriority) -> None:
+    assert get_write_priority(context) == expected
+
+
+@pytest.mark.parametrize(
+    ("count", "automation", "service", "user"),
+    [
+        (0, True, True, True),
+        (19, True, True, True),
+        (20, False, True, True),
+        (29, False, True, True),
+        (30, False, False, True),
+        (35, False, False, True),
+    ],
+)
+def test_flash_write_budget(count: int, automation: bool, service: bool, user: bool) -> None:  # noqa: FBT001
+    budget: FlashWriteBudget = FlashWriteBudget(30, automation_reserve=10)
+
+    assert budget.remaining(count) == max(30 - count, 0)
+    assert budget.allows(WritePriority.AUTOMATION, count=count) is automation
+    assert budget.allows(WritePriority.SERVICE, count=count) is service
+    assert budget.allows(WritePriority.USER, count=count) is user
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from custom_components.keba_keenergy.capabilities import CapabilityTable
+
+
+def get_fixed_data() -> dict[str, Any]:
+    return {
+        "system": {
+            "has_outdoor_temperature": {"value": "on", "attributes": {}},
+            "has_photovoltaics": {"value": "off", "attributes": {}},
+        },
+        "heat_circuit": {
+            "has_room_temperature": [{"value": "on", "attributes": {}}, {"value": "off", "attributes": {}}],
+            "has_mixer": [{"value": "off", "attributes": {}}, {"value": "on", "attributes": {}}],
+            "mode": [{"value": "heating", "attributes": {}}, {"value": "heating_and_cooling", "attributes": {}}],
+        },
+        "heat_pump": {
+            "electric_energy_meter_type": [{"value": 0, "attributes": {}}, {"value": 2, "attributes": {}}],
+        },
+    }
+
+
+def test_capability_table() -> None:
+    capabilities: CapabilityTable = CapabilityTable.from_fixed_data(get_fixed_data())
+
+    assert capabilities.has_outdoor_temperature is True
+    assert capabilities.has_photovoltaics is False
+    assert capabilities.has_room_temperature == (True, False)
+    assert capabilities.has_mixer == (False, True)
+    assert capabilities.has_room_humidity == ()
+    assert capabilities.has_electrical_energy_meter == (False, True)
+    assert capabilities.is_heating_circuit == (True, True)
+    assert capabilities.is_cooling_circuit == (False, True)
+    assert capabilities.has_cooling_circuits is True
+
+
+@pytest.mark.parametrize(
+    ("index", "expected"),
+    [
+        (None, True),
+        (0, True),
+        (1, False),
+        (2, False),
+    ],
+)
+def test_capability_table_get(index: int | None, expected: bool) -> None:  # noqa: FBT001
+    capabilities: CapabilityTable = CapabilityTable.from_fixed_data(get_fixed_data())
+    assert CapabilityTable.get(capabilities.has_room_temperature, index=index) is expected
+
+
+def test_capability_table_without_fixed_data() -> None:
+    capabilities: CapabilityTable = CapabilityTable.from_fixed_data({})
+
+    assert capabilities == CapabilityTable()
+    assert capabilities.has_cooling_circuits is False
+    assert CapabilityTable.get(capabilities.is_cooling_circuit) is False
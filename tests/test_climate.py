@@ -267,11 +267,11 @@ async def test_turn_on(
 
 
 @pytest.mark.parametrize(
-    ("hvac_mode", "expected_hvac_mode"),
+    ("hvac_mode", "response", "expected_hvac_mode"),
     [
-        (HVACMode.AUTO, 1),
-        (HVACMode.HEAT, 2),
-        (HVACMode.OFF, 0),
+        (HVACMode.AUTO, MULTIPLE_POSITION_DATA_RESPONSE_1, 1),
+        (HVACMode.HEAT, MULTIPLE_POSITION_DATA_RESPONSE_2, 2),
+        (HVACMode.OFF, MULTIPLE_POSITION_DATA_RESPONSE_1, 0),
     ],
 )
 async def test_set_hvac_mode(
@@ -279,13 +279,14 @@ async def test_set_hvac_mode(
     config_entry: MockConfigEntry,
     fake_api: FakeKebaKeEnergyAPI,
     hvac_mode: str,
+    response: list[dict[str, Any]],
     expected_hvac_mode: str,
 ) -> None:
     fake_api.responses = [
         MULTIPLE_POSITIONS_RESPONSE,
         HEATING_CURVE_NAMES_RESPONSE,
         get_multiple_position_fixed_data_response(),
-        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        response,
         *HEATING_CURVES_RESPONSE_1_1,
         # Read API after services call
         MULTIPLE_POSITION_DATA_RESPONSE_1,
@@ -547,10 +547,7 @@ async def test_option_flow(
         get_multiple_position_fixed_data_response(),
         MULTIPLE_POSITION_DATA_RESPONSE_1,
         *HEATING_CURVES_RESPONSE_1_1,
-        # 2. coordinator
-        MULTIPLE_POSITIONS_RESPONSE,
-        HEATING_CURVE_NAMES_RESPONSE,
-        get_multiple_position_fixed_data_response(),
+        # 2. coordinator (fixed data from cache)
         MULTIPLE_POSITION_DATA_RESPONSE_1,
         *HEATING_CURVES_RESPONSE_1_1,
     ]
@@ -578,6 +575,16 @@ async def test_option_flow(
         "scan_interval_tick_switch_valve",
         "scan_interval_tick_external_heat_source",
         "scan_interval_tick_photovoltaics",
+        "adaptive_polling",
+        "adaptive_polling_max_tick",
+        "request_chunk_size",
+        "request_concurrency",
+        "request_chunk_auto_tune",
+        "poll_enabled_entities_only",
+        "values_only_polling",
+        "flash_write_budget",
+        "refresh_after_write",
+        "record_traffic",
     ]
 
     result_create_entry: ConfigFlowResult = await hass.config_entries.options.async_configure(
@@ -608,6 +615,16 @@ async def test_option_flow(
         "scan_interval_tick_switch_valve": 1,
         "scan_interval_tick_external_heat_source": 2,
         "scan_interval_tick_photovoltaics": 1,
+        "adaptive_polling": False,
+        "adaptive_polling_max_tick": 4,
+        "request_chunk_size": 0,
+        "request_concurrency": 2,
+        "request_chunk_auto_tune": False,
+        "poll_enabled_entities_only": False,
+        "values_only_polling": False,
+        "flash_write_budget": False,
+        "refresh_after_write": False,
+        "record_traffic": False,
     }
 
 
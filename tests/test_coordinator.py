@@ -1,28 +1,45 @@
 from __future__ import annotations
 
+import asyncio
 import json
+from collections import Counter
+from copy import deepcopy
 from datetime import timedelta
 from typing import Any
 from typing import TYPE_CHECKING
 from unittest.mock import AsyncMock
+from unittest.mock import Mock
 from unittest.mock import patch
 
 import pytest
 from homeassistant.const import CONF_HOST
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import issue_registry as ir
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.util import dt as dt_util
+from keba_keenergy_api.constants import HeatCircuit
+from keba_keenergy_api.constants import HeatPump
 from keba_keenergy_api.constants import SectionPrefix
+from keba_keenergy_api.constants import System
+from keba_keenergy_api.endpoints import Position
+from keba_keenergy_api.error import APIError
 from keba_keenergy_api.error import AuthenticationError
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 from pytest_homeassistant_custom_component.common import async_fire_time_changed
 
+from custom_components.keba_keenergy.budget import WritePriority
+from custom_components.keba_keenergy.budget import get_iso_week
 from custom_components.keba_keenergy.const import DOMAIN
+from custom_components.keba_keenergy.const import FLASH_WRITE_COUNTER_SAVE_DELAY
 from custom_components.keba_keenergy.coordinator import KebaKeEnergyDataUpdateCoordinator
+from custom_components.keba_keenergy.transport import KebaKeEnergyTransport
+from custom_components.keba_keenergy.transport import RequestLane
 from tests import setup_integration
 from tests.api_data import HEATING_CURVES_RESPONSE_1_1
 from tests.api_data import HEATING_CURVE_NAMES_RESPONSE
+from tests.api_data import MULTIPLE_POSITIONS_RESPONSE
+from tests.api_data import MULTIPLE_POSITION_DATA_RESPONSE_1
 from tests.api_data import MULTIPLE_POSITION_DATA_RESPONSE_3_1
 from tests.api_data import MULTIPLE_POSITION_DATA_RESPONSE_3_2
 from tests.api_data import SYSTEM_BUFFER_TANK_NUMBERS
@@ -36,11 +53,22 @@ from tests.api_data import get_multiple_position_fixed_data_response
 from tests.conftest import FakeKebaKeEnergyAPI
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
     from homeassistant.core import HomeAssistant
     from aiohttp import ClientSession
-    from pytest_homeassistant_custom_component.common import MockConfigEntry
     from syrupy.assertion import SnapshotAssertion
     from tests.conftest import FakeKebaKeEnergyAPI
+    from custom_components.keba_keenergy.cache import FixedData
+    from keba_keenergy_api.constants import Section
+
+# Typical round-trip time of a Web HMI request on a busy control unit
+INDEPENDENT_BOOTSTRAP_REQUESTS: tuple[str, ...] = (
+    "get_device_info",
+    "get_info",
+    "get_hmi_info",
+    "get_positions",
+    "get_available_heating_curves",
+)
 
 
 @pytest.mark.parametrize(
@@ -153,3 +181,774 @@ async def test_update_interval_ticks(
     assert coordinator._tick_counter == 3
 
     assert coordinator.data == snapshot
+
+
+async def test_poll_phases_of_entries(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_api: FakeKebaKeEnergyAPI,
+) -> None:
+    other_config_entry: MockConfigEntry = MockConfigEntry(
+        domain=DOMAIN,
+        title="KEBA KeEnergy (ap4401.local)",
+        data=config_entry.data,
+        unique_id="87654321",
+        options=config_entry.options,
+    )
+    fake_api.responses = [
+        # 1. coordinator
+        MULTIPLE_POSITIONS_RESPONSE,
+        HEATING_CURVE_NAMES_RESPONSE,
+        get_multiple_position_fixed_data_response(),
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+        # 2. coordinator
+        MULTIPLE_POSITIONS_RESPONSE,
+        HEATING_CURVE_NAMES_RESPONSE,
+        get_multiple_position_fixed_data_response(),
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+        # Polls of both coordinators
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+    ]
+    fake_api.register_requests(config_entry.data[CONF_HOST])
+
+    await setup_integration(hass, config_entry)
+    await setup_integration(hass, other_config_entry)
+
+    coordinators: list[KebaKeEnergyDataUpdateCoordinator] = [
+        config_entry.runtime_data,
+        other_config_entry.runtime_data,
+    ]
+
+    for coordinator in coordinators:
+        await coordinator.async_refresh()
+
+    # The next polls are scheduled half an update interval apart
+    next_refreshes: list[float] = [coordinator._unsub_refresh.__self__.when() for coordinator in coordinators]
+    interval: float = coordinators[0].scan_interval.total_seconds()
+
+    assert (next_refreshes[1] - next_refreshes[0]) % interval == pytest.approx(interval / 2)
+
+
+@pytest.mark.parametrize(
+    "config_entry",
+    [
+        {
+            "options": {
+                "scan_interval": 20,
+                "scan_interval_tick_system": 1,
+                "scan_interval_tick_heat_pump": 1,
+                "scan_interval_tick_heat_circuit": 2,
+                "scan_interval_tick_solar_circuit": 1,
+                "scan_interval_tick_hot_water_tank": 1,
+                "scan_interval_tick_buffer_tank": 1,
+                "scan_interval_tick_switch_valve": 1,
+                "scan_interval_tick_external_heat_source": 1,
+                "scan_interval_tick_photovoltaics": 1,
+                "adaptive_polling": True,
+                "adaptive_polling_max_tick": 4,
+            },
+        },
+    ],
+    indirect=True,
+)
+async def test_adaptive_polling(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_api: FakeKebaKeEnergyAPI,
+) -> None:
+    fake_api.responses = [
+        MULTIPLE_POSITIONS_RESPONSE,
+        HEATING_CURVE_NAMES_RESPONSE,
+        get_multiple_position_fixed_data_response(),
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+    ]
+    fake_api.register_requests(config_entry.data[CONF_HOST])
+
+    await setup_integration(hass, config_entry)
+
+    coordinator: KebaKeEnergyDataUpdateCoordinator = config_entry.runtime_data
+    data: dict[str, Any] = deepcopy(coordinator.data)
+
+    assert coordinator.adaptive_scheduler
+    assert coordinator.adaptive_scheduler.as_dict()["heat_pump"] == 1
+    assert coordinator.adaptive_scheduler.as_dict()["heat_circuit"] == 2
+
+    read_data: AsyncMock = AsyncMock(side_effect=lambda **_: deepcopy(data))
+
+    with patch.object(coordinator.api, "read_data", new=read_data):
+        # Three polls without any change double the multiplier
+        for _ in range(3):
+            await coordinator._async_update_data()
+
+        assert coordinator.adaptive_scheduler.as_dict()["heat_pump"] == 2
+
+        # A changed value halves the multiplier again
+        data["heat_pump"]["state"][0]["value"] = "heating"
+        coordinator._tick_counter = (
+            coordinator.request_planner.cycle + coordinator.request_planner.offsets[SectionPrefix.HEAT_PUMP] - 1
+        )
+        await coordinator._async_update_data()
+
+        assert HeatPump.STATE in read_data.call_args.kwargs["request"]
+        assert coordinator.adaptive_scheduler.as_dict()["heat_pump"] == 1
+
+
+async def test_fixed_data_cache(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_api: FakeKebaKeEnergyAPI,
+    hass_storage: dict[str, Any],
+) -> None:
+    fake_api.responses = [
+        # 1. coordinator
+        MULTIPLE_POSITIONS_RESPONSE,
+        HEATING_CURVE_NAMES_RESPONSE,
+        get_multiple_position_fixed_data_response(),
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+        # 2. coordinator (fixed data from cache)
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+        # Revalidation of the fixed data cache
+        MULTIPLE_POSITIONS_RESPONSE,
+        HEATING_CURVE_NAMES_RESPONSE,
+        get_multiple_position_fixed_data_response(),
+    ]
+    fake_api.register_requests(config_entry.data[CONF_HOST])
+
+    await setup_integration(hass, config_entry)
+
+    coordinator: KebaKeEnergyDataUpdateCoordinator = config_entry.runtime_data
+
+    assert not coordinator.fixed_data_from_cache
+    assert hass_storage[f"{DOMAIN}.fixed_data.12345678"]["data"]["hmi_sw_version"] == "2.2.0.0"
+
+    lanes: list[RequestLane] = []
+    call: Callable[..., Any] = KebaKeEnergyTransport.call
+
+    async def record_call(self: KebaKeEnergyTransport, fn: Callable[[], Any], /, *, lane: RequestLane) -> Any:
+        lanes.append(lane)
+        return await call(self, fn, lane=lane)
+
+    with patch.object(KebaKeEnergyTransport, "call", record_call):
+        assert await hass.config_entries.async_reload(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        cached_coordinator: KebaKeEnergyDataUpdateCoordinator = config_entry.runtime_data
+
+        assert cached_coordinator.fixed_data_from_cache
+        assert cached_coordinator.position == coordinator.position
+        assert cached_coordinator.request_data == coordinator.request_data
+        assert cached_coordinator.request_planner.as_dict() == coordinator.request_planner.as_dict()
+        assert cached_coordinator.available_heating_curves == coordinator.available_heating_curves
+        assert cached_coordinator.data == coordinator.data
+        assert hass_storage[f"{DOMAIN}.fixed_data.12345678"]["data"]["hmi_sw_version"] == "2.2.0.0"
+
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    # The revalidation sends all fixed data requests in the background lane of the transport
+    assert lanes == [RequestLane.BACKGROUND] * 8
+
+    # The revalidated cache is kept without a reload
+    assert config_entry.runtime_data is cached_coordinator
+    assert f"{DOMAIN}.fixed_data.12345678" in hass_storage
+
+
+async def test_fixed_data_cache_outdated(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_api: FakeKebaKeEnergyAPI,
+    hass_storage: dict[str, Any],
+) -> None:
+    fake_api.responses = [
+        # 1. coordinator
+        MULTIPLE_POSITIONS_RESPONSE,
+        HEATING_CURVE_NAMES_RESPONSE,
+        get_multiple_position_fixed_data_response(),
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+        # 2. coordinator (fixed data from outdated cache)
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+        # Revalidation of the fixed data cache
+        MULTIPLE_POSITIONS_RESPONSE,
+        HEATING_CURVE_NAMES_RESPONSE,
+        get_multiple_position_fixed_data_response(),
+        # 3. coordinator (reloaded after the revalidation)
+        MULTIPLE_POSITIONS_RESPONSE,
+        HEATING_CURVE_NAMES_RESPONSE,
+        get_multiple_position_fixed_data_response(),
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+    ]
+    fake_api.register_requests(config_entry.data[CONF_HOST])
+
+    await setup_integration(hass, config_entry)
+
+    # Simulate a cache from an older HMI software version
+    cache: dict[str, Any] = hass_storage[f"{DOMAIN}.fixed_data.12345678"]["data"]
+    cache["hmi_sw_version"] = "2.1.0.0"
+    cache["hmi_info"] = {**cache["hmi_info"], "name": "KeEnergy.WebHmi_2.1.0.0"}
+
+    assert await hass.config_entries.async_reload(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    coordinator: KebaKeEnergyDataUpdateCoordinator = config_entry.runtime_data
+
+    assert not coordinator.fixed_data_from_cache
+    assert coordinator.device_hmi_sw_version == "2.2.0.0"
+    assert hass_storage[f"{DOMAIN}.fixed_data.12345678"]["data"]["hmi_sw_version"] == "2.2.0.0"
+
+
+async def test_fixed_data_cache_outdated_capabilities(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_api: FakeKebaKeEnergyAPI,
+) -> None:
+    fake_api.responses = [
+        # 1. coordinator
+        MULTIPLE_POSITIONS_RESPONSE,
+        HEATING_CURVE_NAMES_RESPONSE,
+        get_multiple_position_fixed_data_response(),
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+        # 2. coordinator (fixed data from cache)
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+        # Revalidation of the fixed data cache (passive cooling was installed)
+        MULTIPLE_POSITIONS_RESPONSE,
+        HEATING_CURVE_NAMES_RESPONSE,
+        get_multiple_position_fixed_data_response(has_passive_cooling="true"),
+        # 3. coordinator (reloaded after the revalidation)
+        MULTIPLE_POSITIONS_RESPONSE,
+        HEATING_CURVE_NAMES_RESPONSE,
+        get_multiple_position_fixed_data_response(has_passive_cooling="true"),
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+    ]
+    fake_api.register_requests(config_entry.data[CONF_HOST])
+
+    await setup_integration(hass, config_entry)
+
+    assert not any(config_entry.runtime_data.capabilities.has_passive_cooling)
+
+    assert await hass.config_entries.async_reload(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    coordinator: KebaKeEnergyDataUpdateCoordinator = config_entry.runtime_data
+
+    # The changed capabilities invalidate the cache, although the HMI software version is the same
+    assert not coordinator.fixed_data_from_cache
+    assert any(coordinator.capabilities.has_passive_cooling)
+
+
+async def test_fixed_data_bootstrap_concurrency(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+) -> None:
+    session: ClientSession = async_get_clientsession(hass, verify_ssl=False)
+
+    coordinator: KebaKeEnergyDataUpdateCoordinator = KebaKeEnergyDataUpdateCoordinator(
+        hass,
+        config_entry,
+        host="10.0.0.100",
+        username=None,
+        password=None,
+        ssl=False,
+        session=session,
+    )
+
+    position: Position = Position(
+        heat_pump=1,
+        heat_circuit=2,
+        solar_circuit=0,
+        buffer_tank=1,
+        hot_water_tank=1,
+        external_heat_source=0,
+        switch_valve=0,
+    )
+    in_flight: Counter[str] = Counter()
+    max_in_flight: Counter[str] = Counter()
+    independent_requests_started: asyncio.Event = asyncio.Event()
+
+    def simulate(name: str, result: Any, *, independent: bool = False) -> AsyncMock:
+        """Simulate a control unit request, the independent requests wait until all of them are in flight."""
+
+        async def request(**kwargs: Any) -> Any:
+            in_flight[name] += 1
+            max_in_flight[name] = max(max_in_flight[name], in_flight[name])
+
+            if independent:
+                if sum(in_flight[key] for key in INDEPENDENT_BOOTSTRAP_REQUESTS) == len(INDEPENDENT_BOOTSTRAP_REQUESTS):
+                    independent_requests_started.set()
+
+                await independent_requests_started.wait()
+            else:
+                await asyncio.sleep(0)
+
+            in_flight[name] -= 1
+
+            return kwargs["request"] if result is None else result
+
+        return AsyncMock(side_effect=request)
+
+    with (
+        patch.object(
+            coordinator.api.system,
+            "get_device_info",
+            new=simulate("get_device_info", {"serNo": 12345678}, independent=True),
+        ),
+        patch.object(
+            coordinator.api.system,
+            "get_info",
+            new=simulate("get_info", {"name": "KeEnergy.MTec"}, independent=True),
+        ),
+        patch.object(
+            coordinator.api.system,
+            "get_hmi_info",
+            new=simulate("get_hmi_info", {"name": "KeEnergy.WebHmi_2.2.0.0"}, independent=True),
+        ),
+        patch.object(
+            coordinator.api.system,
+            "get_positions",
+            new=simulate("get_positions", position, independent=True),
+        ),
+        patch.object(
+            coordinator.api.heat_circuit,
+            "get_available_heating_curves",
+            new=simulate("get_available_heating_curves", ((0, "HC1"),), independent=True),
+        ),
+        patch.object(coordinator.api, "filter_request", new=simulate("filter_request", None)),
+        patch.object(coordinator.api, "read_data", new=simulate("read_data", {})),
+    ):
+        # A sequential bootstrap waits forever for the other independent requests
+        async with asyncio.timeout(5):
+            fixed_data: FixedData = await coordinator._async_fixed_data()
+
+    # All independent requests are in flight at the same time, both request filters
+    # start as soon as the positions are known.
+    assert fixed_data.position == position
+    assert fixed_data.request_data == coordinator.request_data
+    assert all(max_in_flight[key] == 1 for key in INDEPENDENT_BOOTSTRAP_REQUESTS)
+    assert max_in_flight["filter_request"] == 2
+    assert not +in_flight
+
+
+@pytest.mark.parametrize(
+    "config_entry",
+    [
+        {
+            "options": {
+                "scan_interval": 20,
+                "poll_enabled_entities_only": True,
+            },
+        },
+    ],
+    indirect=True,
+)
+async def test_poll_enabled_entities_only(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_api: FakeKebaKeEnergyAPI,
+) -> None:
+    fake_api.responses = [
+        MULTIPLE_POSITIONS_RESPONSE,
+        HEATING_CURVE_NAMES_RESPONSE,
+        get_multiple_position_fixed_data_response(),
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+    ]
+    fake_api.register_requests(config_entry.data[CONF_HOST])
+
+    await setup_integration(hass, config_entry)
+
+    coordinator: KebaKeEnergyDataUpdateCoordinator = config_entry.runtime_data
+    data: dict[str, Any] = deepcopy(coordinator.data)
+    full_request_size: int = len(coordinator.request_planner.full_plan.request)
+
+    read_data: AsyncMock = AsyncMock(side_effect=lambda **_: deepcopy(data))
+
+    with patch.object(coordinator.api, "read_data", new=read_data):
+        await coordinator._async_update_data()
+        request: list[Section] = read_data.call_args.kwargs["request"]
+
+        # Enabled entities and internal dependencies are polled, disabled entities not
+        assert len(request) < full_request_size
+        assert System.OPERATING_MODE in request
+        assert HeatPump.NAME in request
+        assert System.CPU_USAGE not in request
+
+        # Enabling an entity adds its keys to the next poll
+        remove_consumer: Callable[[], None] = coordinator.async_add_consumer("system", ["cpu_usage"])
+        await coordinator._async_update_data()
+
+        assert System.CPU_USAGE in read_data.call_args.kwargs["request"]
+
+        # Disabling the entity removes its keys again
+        remove_consumer()
+        await coordinator._async_update_data()
+
+        assert System.CPU_USAGE not in read_data.call_args.kwargs["request"]
+
+    assert coordinator.data["system"]["cpu_usage"] == data["system"]["cpu_usage"]
+
+
+@pytest.mark.parametrize(
+    "config_entry",
+    [
+        {
+            "options": {
+                "scan_interval": 20,
+                "values_only_polling": True,
+            },
+        },
+    ],
+    indirect=True,
+)
+async def test_values_only_polling(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_api: FakeKebaKeEnergyAPI,
+) -> None:
+    fake_api.responses = [
+        MULTIPLE_POSITIONS_RESPONSE,
+        HEATING_CURVE_NAMES_RESPONSE,
+        get_multiple_position_fixed_data_response(),
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+    ]
+    fake_api.register_requests(config_entry.data[CONF_HOST])
+
+    await setup_integration(hass, config_entry)
+
+    coordinator: KebaKeEnergyDataUpdateCoordinator = config_entry.runtime_data
+    data: dict[str, Any] = deepcopy(coordinator.data)
+
+    def without_attributes(values: Any) -> Any:
+        if isinstance(values, list):
+            return [without_attributes(value) for value in values]
+
+        return {"value": values["value"], "attributes": {}}
+
+    def read_data(**kwargs: Any) -> dict[str, Any]:
+        if kwargs["extra_attributes"]:
+            return deepcopy(data)
+
+        return {
+            section_id: {key: without_attributes(values) for key, values in section_data.items()}
+            for section_id, section_data in data.items()
+        }
+
+    mock_read_data: AsyncMock = AsyncMock(side_effect=read_data)
+
+    with patch.object(coordinator.api, "read_data", new=mock_read_data):
+        await coordinator._async_update_data()
+
+        assert mock_read_data.call_args.kwargs["extra_attributes"] is False
+
+        # The attributes of the previous data are carried forward
+        response: dict[str, Any] = await coordinator._async_update_data()
+
+        assert response == data
+
+        # A write refreshes only the attributes of the written sections
+        with patch.object(coordinator.api, "write_data", new=AsyncMock()):
+            await coordinator.async_write_data(request={HeatCircuit.OPERATING_MODE: [0, None]})
+            await hass.async_block_till_done()
+
+        assert mock_read_data.call_args.kwargs["extra_attributes"] is True
+        assert mock_read_data.call_args.kwargs["request"] == [HeatCircuit.OPERATING_MODE]
+
+        # The next poll reads the values only
+        await coordinator._async_update_data()
+
+        assert mock_read_data.call_args.kwargs["extra_attributes"] is False
+
+
+async def test_coalesced_writes(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_api: FakeKebaKeEnergyAPI,
+) -> None:
+    fake_api.responses = [
+        MULTIPLE_POSITIONS_RESPONSE,
+        HEATING_CURVE_NAMES_RESPONSE,
+        get_multiple_position_fixed_data_response(),
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+    ]
+    fake_api.register_requests(config_entry.data[CONF_HOST])
+
+    await setup_integration(hass, config_entry)
+
+    coordinator: KebaKeEnergyDataUpdateCoordinator = config_entry.runtime_data
+    weekly_write_count: int = coordinator._weekly_write_count
+    mock_write_data: AsyncMock = AsyncMock()
+
+    with patch.object(coordinator.api, "write_data", new=mock_write_data):
+        await asyncio.gather(
+            coordinator.async_write_data(request={HeatCircuit.OPERATING_MODE: [0, None]}),
+            coordinator.async_write_data(request={HeatCircuit.OPERATING_MODE: [None, 3]}),
+            coordinator.async_write_data(request={System.OPERATING_MODE: 1}),
+        )
+
+    # All requests within the coalescing window are one API write and one flash write
+    mock_write_data.assert_awaited_once_with(
+        request={
+            HeatCircuit.OPERATING_MODE: [0, 3],
+            System.OPERATING_MODE: 1,
+        },
+    )
+    assert coordinator._weekly_write_count == weekly_write_count + 1
+
+    # A failed write is reported to every caller
+    with patch.object(coordinator.api, "write_data", new=AsyncMock(side_effect=APIError("Write failed"))):
+        results: list[Any] = await asyncio.gather(
+            coordinator.async_write_data(request={HeatCircuit.OPERATING_MODE: [0, None]}),
+            coordinator.async_write_data(request={System.OPERATING_MODE: 1}),
+            return_exceptions=True,
+        )
+
+    assert [type(result) for result in results] == [HomeAssistantError, HomeAssistantError]
+
+
+@pytest.mark.parametrize(
+    "config_entry",
+    [
+        {
+            "options": {
+                "scan_interval": 20,
+                "flash_write_budget": True,
+            },
+        },
+    ],
+    indirect=True,
+)
+async def test_flash_write_budget(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_api: FakeKebaKeEnergyAPI,
+) -> None:
+    fake_api.responses = [
+        MULTIPLE_POSITIONS_RESPONSE,
+        HEATING_CURVE_NAMES_RESPONSE,
+        get_multiple_position_fixed_data_response(),
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+    ]
+    fake_api.register_requests(config_entry.data[CONF_HOST])
+
+    await setup_integration(hass, config_entry)
+
+    coordinator: KebaKeEnergyDataUpdateCoordinator = config_entry.runtime_data
+    entity_id: str = "sensor.keba_keenergy_12345678_remaining_flash_writes"
+
+    assert coordinator.remaining_flash_writes == 30
+    assert (state := hass.states.get(entity_id)) is not None
+    assert state.state == "30"
+
+    # Only the automation reserve is left
+    coordinator._write_count_week = get_iso_week(dt_util.now().date())
+    coordinator._weekly_write_count = 20
+
+    mock_write_data: AsyncMock = AsyncMock()
+
+    issue_registry: ir.IssueRegistry = ir.async_get(hass)
+
+    # Only the sensor of the remaining flash writes is updated after a write
+    listener: Mock = Mock()
+    coordinator.async_add_listener(listener)
+
+    with patch.object(coordinator.api, "write_data", new=mock_write_data):
+        assert coordinator.is_write_deferred(WritePriority.AUTOMATION) is True
+        assert coordinator.is_write_deferred(WritePriority.SERVICE) is False
+
+        assert (
+            await coordinator.async_write_data(
+                {HeatCircuit.OPERATING_MODE: [0, None]},
+                priority=WritePriority.AUTOMATION,
+            )
+            is False
+        )
+        assert (
+            await coordinator.async_write_data(
+                {HeatCircuit.OPERATING_MODE: [2, None]},
+                priority=WritePriority.AUTOMATION,
+            )
+            is False
+        )
+
+        # Automation writes are deferred and collapsed
+        mock_write_data.assert_not_awaited()
+        assert coordinator.deferred_writes == 2
+        assert coordinator.pending_deferred_writes == 1
+        assert coordinator.deferred_values == {"heat_circuit.operating_mode": [2, None]}
+
+        assert (state := hass.states.get(entity_id)) is not None
+        assert state.attributes["deferred_values"] == {"heat_circuit.operating_mode": [2, None]}
+
+        assert (issue := issue_registry.async_get_issue(DOMAIN, "deferred_flash_writes")) is not None
+        assert issue.translation_placeholders == {"sections": "heat_circuit.operating_mode"}
+
+        # The deferred writes are sent with the next user-initiated write
+        assert await coordinator.async_write_data({System.OPERATING_MODE: 1}, priority=WritePriority.USER) is True
+
+    mock_write_data.assert_awaited_once_with(
+        request={
+            HeatCircuit.OPERATING_MODE: [2, None],
+            System.OPERATING_MODE: 1,
+        },
+    )
+    assert coordinator.pending_deferred_writes == 0
+    assert coordinator.remaining_flash_writes == 9
+    assert (state := hass.states.get(entity_id)) is not None
+    assert state.state == "9"
+    assert issue_registry.async_get_issue(DOMAIN, "deferred_flash_writes") is None
+    listener.assert_not_called()
+
+    # Services are rejected if the budget is exhausted, user-initiated writes are always allowed
+    coordinator._weekly_write_count = 30
+
+    with pytest.raises(HomeAssistantError):
+        await coordinator.async_execute_write(write_fn=AsyncMock(), priority=WritePriority.SERVICE)
+
+    with (
+        patch.object(coordinator.api, "write_data", new=mock_write_data),
+        pytest.raises(HomeAssistantError) as error,
+    ):
+        await coordinator.async_write_data({System.OPERATING_MODE: 0}, priority=WritePriority.SERVICE)
+
+    # Service writes are not deferred silently
+    assert error.value.translation_key == "flash_write_budget_exhausted"
+    assert coordinator.pending_deferred_writes == 0
+
+    await coordinator.async_execute_write(write_fn=AsyncMock(), priority=WritePriority.USER)
+
+    assert coordinator.remaining_flash_writes == 0
+
+
+async def test_flash_write_counter_delayed_save(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_api: FakeKebaKeEnergyAPI,
+    hass_storage: dict[str, Any],
+) -> None:
+    fake_api.responses = [
+        MULTIPLE_POSITIONS_RESPONSE,
+        HEATING_CURVE_NAMES_RESPONSE,
+        get_multiple_position_fixed_data_response(),
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+    ]
+    fake_api.register_requests(config_entry.data[CONF_HOST])
+
+    await setup_integration(hass, config_entry)
+
+    coordinator: KebaKeEnergyDataUpdateCoordinator = config_entry.runtime_data
+
+    with patch.object(
+        coordinator._store,
+        "_async_write_data",
+        wraps=coordinator._store._async_write_data,
+    ) as mock_store_write_data:
+        for _ in range(100):
+            await coordinator.async_execute_write(write_fn=AsyncMock())
+
+        # The counter is not saved on every write
+        mock_store_write_data.assert_not_called()
+
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=FLASH_WRITE_COUNTER_SAVE_DELAY))
+        await hass.async_block_till_done()
+
+        assert mock_store_write_data.call_count == 1
+        assert hass_storage[DOMAIN]["data"]["flash_write_counter"]["count"] == 100
+
+        # A pending save is flushed on unload
+        await coordinator.async_execute_write(write_fn=AsyncMock())
+        await hass.config_entries.async_unload(config_entry.entry_id)
+
+        assert mock_store_write_data.call_count == 2
+        assert hass_storage[DOMAIN]["data"]["flash_write_counter"]["count"] == 101
+
+
+@pytest.mark.parametrize(
+    "config_entry",
+    [
+        {
+            "options": {
+                "scan_interval": 20,
+                "refresh_after_write": True,
+            },
+        },
+    ],
+    indirect=True,
+)
+async def test_refresh_after_write(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_api: FakeKebaKeEnergyAPI,
+) -> None:
+    fake_api.responses = [
+        MULTIPLE_POSITIONS_RESPONSE,
+        HEATING_CURVE_NAMES_RESPONSE,
+        get_multiple_position_fixed_data_response(),
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+    ]
+    fake_api.register_requests(config_entry.data[CONF_HOST])
+
+    await setup_integration(hass, config_entry)
+
+    coordinator: KebaKeEnergyDataUpdateCoordinator = config_entry.runtime_data
+    data: dict[str, Any] = coordinator.data
+    operating_modes: list[dict[str, Any]] = deepcopy(data[SectionPrefix.HEAT_CIRCUIT]["operating_mode"])
+    operating_modes[0]["value"] = "party"
+
+    mock_read_data: AsyncMock = AsyncMock(
+        return_value={SectionPrefix.HEAT_CIRCUIT: {"operating_mode": operating_modes}},
+    )
+    unsub_refresh: Any = coordinator._unsub_refresh
+    tick_counter: int = coordinator._tick_counter
+
+    with (
+        patch.object(coordinator.api, "write_data", new=AsyncMock()),
+        patch.object(coordinator.transport, "read_data", new=mock_read_data),
+    ):
+        await coordinator.async_write_data({HeatCircuit.OPERATING_MODE: [4, None]})
+        await hass.async_block_till_done()
+
+    # Only the written section is read back and merged into the current data
+    mock_read_data.assert_awaited_once_with(
+        [HeatCircuit.OPERATING_MODE],
+        position=coordinator.position,
+        extra_attributes=True,
+        lane=RequestLane.INTERACTIVE,
+    )
+    assert coordinator.data[SectionPrefix.HEAT_CIRCUIT]["operating_mode"][0]["value"] == "party"
+    assert (
+        coordinator.data[SectionPrefix.HEAT_CIRCUIT]["room_temperature"]
+        == data[SectionPrefix.HEAT_CIRCUIT]["room_temperature"]
+    )
+    assert coordinator.data[SectionPrefix.SYSTEM] is data[SectionPrefix.SYSTEM]
+
+    # The schedule of the regular polls is not reset
+    assert coordinator._unsub_refresh is unsub_refresh
+    assert coordinator._tick_counter == tick_counter
+
+    mock_read_data.reset_mock()
+
+    with patch.object(coordinator.transport, "read_data", new=mock_read_data):
+        await coordinator.async_refresh_keys(SectionPrefix.HEAT_CIRCUIT, ["operating_mode", "unknown"])
+
+    mock_read_data.assert_awaited_once_with(
+        [HeatCircuit.OPERATING_MODE],
+        position=coordinator.position,
+        extra_attributes=True,
+        lane=RequestLane.INTERACTIVE,
+    )
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from typing import Any
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.const import CONF_HOST
+
+from custom_components.keba_keenergy.diagnostics import async_get_config_entry_diagnostics
+from tests import setup_integration
+from tests.api_data import HEATING_CURVES_RESPONSE_1_1
+from tests.api_data import HEATING_CURVE_NAMES_RESPONSE
+from tests.api_data import MULTIPLE_POSITIONS_RESPONSE
+from tests.api_data import MULTIPLE_POSITION_DATA_RESPONSE_1
+from tests.api_data import get_multiple_position_fixed_data_response
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+    from tests.conftest import FakeKebaKeEnergyAPI
+
+
+@pytest.mark.parametrize(
+    "config_entry",
+    [
+        {
+            "options": {
+                "scan_interval": 20,
+                "scan_interval_tick_system": 1,
+                "scan_interval_tick_heat_pump": 1,
+                "scan_interval_tick_heat_circuit": 2,
+                "scan_interval_tick_solar_circuit": 1,
+                "scan_interval_tick_hot_water_tank": 3,
+                "scan_interval_tick_buffer_tank": 1,
+                "scan_interval_tick_switch_valve": 1,
+                "scan_interval_tick_external_heat_source": 1,
+                "scan_interval_tick_photovoltaics": 1,
+            },
+        },
+    ],
+    indirect=True,
+)
+async def test_diagnostics(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_api: FakeKebaKeEnergyAPI,
+) -> None:
+    fake_api.responses = [
+        MULTIPLE_POSITIONS_RESPONSE,
+        HEATING_CURVE_NAMES_RESPONSE,
+        get_multiple_position_fixed_data_response(),
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+    ]
+    fake_api.register_requests(config_entry.data[CONF_HOST])
+
+    await setup_integration(hass, config_entry)
+
+    diagnostics: dict[str, Any] = await async_get_config_entry_diagnostics(hass, config_entry)
+
+    assert diagnostics["entry"]["data"] == {CONF_HOST: "**REDACTED**", "ssl": False}
+    assert diagnostics["device"]["position"]["heat_circuit"] == 2
+    assert diagnostics["polling"]["tick"] == 1
+    assert diagnostics["polling"]["adaptive_multipliers"] is None
+    assert diagnostics["polling"]["poll_scheduler"] == {"entries": 1, "phase": 0, "max_concurrent_requests": 4}
+    assert diagnostics["transport"]["chunk_size"] == 0
+    assert diagnostics["transport"]["max_concurrency"] == 2
+    assert diagnostics["transport"]["tuner"] is None
+    assert diagnostics["transport"]["lanes"]["interactive"]["requests"] == 0
+    assert diagnostics["transport"]["lanes"]["background"]["requests"] == 1
+    assert diagnostics["writes"] == {
+        "remaining_flash_writes": None,
+        "deferred_writes": 0,
+        "pending_deferred_writes": 0,
+        "skipped_writes": 0,
+    }
+
+    request_plans: dict[str, Any] = diagnostics["polling"]["request_plans"]
+
+    assert request_plans["cycle"] == 6
+    assert request_plans["multipliers"]["heat_circuit"] == 2
+    assert request_plans["multipliers"]["hot_water_tank"] == 3
+    assert request_plans["offsets"]["heat_circuit"] == 0
+    assert request_plans["offsets"]["hot_water_tank"] == 0
+    assert [plan["phase"] for plan in request_plans["plans"]] == [0, 1, 2, 3, 4, 5]
+
+    all_sections: list[str] = request_plans["plans"][0]["sections"]
+
+    assert all_sections == [
+        "external_heat_source",
+        "heat_circuit",
+        "solar_circuit",
+        "heat_pump",
+        "buffer_tank",
+        "hot_water_tank",
+        "switch_valve",
+        "photovoltaics",
+        "system",
+    ]
+
+    for plan in request_plans["plans"]:
+        phase: int = plan["phase"]
+
+        assert plan["sections"] == [
+            section
+            for section in all_sections
+            if not (section == "heat_circuit" and phase % 2) and not (section == "hot_water_tank" and phase % 3)
+        ]
+
+    assert request_plans["plans"][1]["keys"] < request_plans["plans"][0]["keys"]
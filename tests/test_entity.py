@@ -1,6 +1,13 @@
 from __future__ import annotations
 
+import time
+from collections import Counter
+from dataclasses import replace
+from typing import Any
 from typing import TYPE_CHECKING
+from typing import cast
+from unittest.mock import AsyncMock
+from unittest.mock import Mock
 from unittest.mock import patch
 
 import pytest
@@ -13,11 +20,28 @@ from homeassistant.const import ATTR_ENTITY_ID
 from homeassistant.core import HomeAssistant
 from homeassistant.core import State
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity_platform import async_get_platforms
 from homeassistant.setup import async_setup_component
 from keba_keenergy_api.api import KebaKeEnergyAPI
+from keba_keenergy_api.constants import SectionPrefix
 from keba_keenergy_api.error import APIError
 
+from custom_components.keba_keenergy.binary_sensor import BINARY_SENSOR_TYPES
+from custom_components.keba_keenergy.binary_sensor import KebaKeEnergyBinarySensorEntity
+from custom_components.keba_keenergy.capabilities import CapabilityTable
+from custom_components.keba_keenergy.const import DOMAIN
+from custom_components.keba_keenergy.entity import KebaKeEnergyBaseEntity
+from custom_components.keba_keenergy.entity import _async_setup_entities
+from custom_components.keba_keenergy.number import KebaKeEnergyNumberEntity
+from custom_components.keba_keenergy.number import NUMBER_TYPES
+from custom_components.keba_keenergy.select import SELECT_TYPES
+from custom_components.keba_keenergy.sensor import KebaKeEnergySensorEntity
+from custom_components.keba_keenergy.sensor import SENSOR_TYPES
+from custom_components.keba_keenergy.snapshot import replace_value
+from custom_components.keba_keenergy.switch import KebaKeEnergySwitchEntity
+from custom_components.keba_keenergy.switch import SWITCH_TYPES
 from tests import init_translations
+from tests import scale_positions
 from tests import setup_integration
 from tests.api_data import ENTITY_UPDATED_DATA_RESPONSE
 from tests.api_data import HEATING_CURVES_RESPONSE_1_1
@@ -27,7 +51,12 @@ from tests.api_data import MULTIPLE_POSITION_DATA_RESPONSE_1
 from tests.api_data import get_multiple_position_fixed_data_response
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
     from pytest_homeassistant_custom_component.common import MockConfigEntry
+    from custom_components.keba_keenergy.coordinator import KebaKeEnergyConfigEntry
+    from custom_components.keba_keenergy.coordinator import KebaKeEnergyDataUpdateCoordinator
+    from keba_keenergy_api.endpoints import Position
+    from keba_keenergy_api.endpoints import Value
     from tests.conftest import FakeKebaKeEnergyAPI
 
 
@@ -127,3 +156,509 @@ async def test_entity_update_failed(
         translations["component.keba_keenergy.exceptions.communication_error.message"]
         == "Bei der Kommunikation mit der API ist ein Fehler aufgetreten: {error}"
     )
+
+
+async def test_entity_skips_unchanged_state_writes(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_api: FakeKebaKeEnergyAPI,
+) -> None:
+    fake_api.responses = [
+        MULTIPLE_POSITIONS_RESPONSE,
+        HEATING_CURVE_NAMES_RESPONSE,
+        get_multiple_position_fixed_data_response(),
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+    ]
+    fake_api.register_requests("10.0.0.100")
+
+    await setup_integration(hass, config_entry)
+
+    coordinator: KebaKeEnergyDataUpdateCoordinator = config_entry.runtime_data
+    entity_id: str = "sensor.keba_keenergy_12345678_heat_circuit_operating_mode_1"
+
+    # The first coordinator update renders all entities
+    coordinator.async_update_listeners()
+
+    assert coordinator.state_writes > 0
+    listeners: int = coordinator.state_writes + coordinator.skipped_state_writes
+
+    # Unchanged data writes no state
+    coordinator.async_update_listeners()
+
+    assert coordinator.state_writes == 0
+    assert coordinator.skipped_state_writes == listeners
+
+    # Only the entities of a changed value write their state
+    coordinator.async_set_updated_data(
+        replace_value(
+            coordinator.data,
+            "night",
+            section_id="heat_circuit",
+            key="operating_mode",
+            index=0,
+            key_index=None,
+        ),
+    )
+
+    assert 0 < coordinator.state_writes < listeners
+
+    state: State | None = hass.states.get(entity_id)
+    assert isinstance(state, State)
+    assert state.state == "night"
+
+
+async def test_entity_writes_state_of_changed_limits(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_api: FakeKebaKeEnergyAPI,
+) -> None:
+    fake_api.responses = [
+        MULTIPLE_POSITIONS_RESPONSE,
+        HEATING_CURVE_NAMES_RESPONSE,
+        get_multiple_position_fixed_data_response(),
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+    ]
+    fake_api.register_requests("10.0.0.100")
+
+    await setup_integration(hass, config_entry)
+
+    coordinator: KebaKeEnergyDataUpdateCoordinator = config_entry.runtime_data
+    entity_id: str = "number.keba_keenergy_12345678_hot_water_tank_standby_temperature_1"
+
+    state: State | None = hass.states.get(entity_id)
+    assert isinstance(state, State)
+    upper_limit: float = state.attributes["max"] + 5
+
+    # Only the upper limit of the value changes
+    values: list[Value] = list(coordinator.data["hot_water_tank"]["standby_temperature"])
+    values[0] = {**values[0], "attributes": {**values[0]["attributes"], "upper_limit": str(upper_limit)}}
+    coordinator.async_set_updated_data(
+        {**coordinator.data, "hot_water_tank": {**coordinator.data["hot_water_tank"], "standby_temperature": values}},
+    )
+
+    assert coordinator.state_writes > 0
+
+    state = hass.states.get(entity_id)
+    assert isinstance(state, State)
+    assert state.attributes["max"] == upper_limit
+
+
+def _legacy_get_entity_data(self: KebaKeEnergyBaseEntity, key: str, /) -> Value | None:
+    """Resolve the entity data on every access (implementation without accessors)."""
+    entity_data: list[list[Value]] | list[Value] | Value | None = self.coordinator.data[self.section_id].get(key)
+
+    if isinstance(entity_data, list):
+        entity_data = entity_data[self.index or 0]
+
+    if isinstance(entity_data, list) and self.key_index is not None:
+        entity_data = entity_data[self.key_index]
+
+    assert not isinstance(entity_data, list)
+    return entity_data
+
+
+def _render_states(entities: list[KebaKeEnergyBaseEntity], /, *, rounds: int) -> tuple[float, list[Any]]:
+    states: list[Any] = []
+    start: float = time.perf_counter()
+
+    for _ in range(rounds):
+        states = [entity._get_state_fingerprint() for entity in entities]
+
+    return time.perf_counter() - start, states
+
+
+class _CountingData(dict[str, Any]):
+    """Coordinator data that counts the lookups of the sections."""
+
+    lookups: int = 0
+
+    def __getitem__(self, key: str, /) -> Any:
+        self.lookups += 1
+        return super().__getitem__(key)
+
+
+async def _setup_rendered_entities(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_api: FakeKebaKeEnergyAPI,
+) -> list[KebaKeEnergyBaseEntity]:
+    fake_api.responses = [
+        MULTIPLE_POSITIONS_RESPONSE,
+        HEATING_CURVE_NAMES_RESPONSE,
+        get_multiple_position_fixed_data_response(),
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+    ]
+    fake_api.register_requests("10.0.0.100")
+
+    await setup_integration(hass, config_entry)
+
+    entities: list[KebaKeEnergyBaseEntity] = [
+        entity for platform in async_get_platforms(hass, DOMAIN) for entity in platform.entities.values()
+    ]
+    assert {entity.platform.domain for entity in entities} == {
+        "binary_sensor",
+        "climate",
+        "number",
+        "select",
+        "sensor",
+        "switch",
+        "water_heater",
+    }
+
+    return entities
+
+
+@pytest.mark.usefixtures("entity_registry_enabled_by_default")
+async def test_entity_state_rendering_lookups(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_api: FakeKebaKeEnergyAPI,
+) -> None:
+    entities: list[KebaKeEnergyBaseEntity] = await _setup_rendered_entities(hass, config_entry, fake_api)
+    coordinator: KebaKeEnergyDataUpdateCoordinator = config_entry.runtime_data
+
+    coordinator.data = legacy_data = _CountingData(coordinator.data)
+
+    with patch.object(KebaKeEnergyBaseEntity, "get_entity_data", new=_legacy_get_entity_data):
+        _render_states(entities, rounds=1)
+        legacy_data.lookups = 0
+        _, legacy_states = _render_states(entities, rounds=10)
+
+    coordinator.data = data = _CountingData(coordinator.data)
+
+    # The first rendering resolves the values of the new coordinator data
+    _render_states(entities, rounds=1)
+    data.lookups = 0
+    _, states = _render_states(entities, rounds=10)
+
+    # Both implementations render the same states, the accessors resolve the values once per coordinator data
+    assert states == legacy_states
+    assert data.lookups < legacy_data.lookups, f"Accessors: {data.lookups}, legacy: {legacy_data.lookups}"
+
+
+@pytest.mark.performance
+@pytest.mark.usefixtures("entity_registry_enabled_by_default")
+async def test_entity_state_rendering_benchmark(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_api: FakeKebaKeEnergyAPI,
+) -> None:
+    entities: list[KebaKeEnergyBaseEntity] = await _setup_rendered_entities(hass, config_entry, fake_api)
+
+    with patch.object(KebaKeEnergyBaseEntity, "get_entity_data", new=_legacy_get_entity_data):
+        legacy_duration, legacy_states = _render_states(entities, rounds=50)
+
+    duration, states = _render_states(entities, rounds=50)
+
+    # Both implementations render the same states, the accessors must not be slower
+    assert states == legacy_states
+    assert duration < legacy_duration * 1.5, f"Accessors: {duration:.3f}s, legacy: {legacy_duration:.3f}s"
+
+
+async def _setup_scaled_entities(coordinator: KebaKeEnergyDataUpdateCoordinator, /) -> list[Any]:
+    entities: list[Any] = []
+
+    for entity_types, entity_cls, entity_name in (
+        (BINARY_SENSOR_TYPES, KebaKeEnergyBinarySensorEntity, "binary_sensor"),
+        (NUMBER_TYPES, KebaKeEnergyNumberEntity, "number"),
+        (SELECT_TYPES, None, "select"),
+        (SENSOR_TYPES, KebaKeEnergySensorEntity, "sensor"),
+        (SWITCH_TYPES, KebaKeEnergySwitchEntity, "switch"),
+    ):
+        await _async_setup_entities(
+            cast("KebaKeEnergyConfigEntry", coordinator.config_entry),
+            entities.extend,
+            entity_types,
+            entity_cls,
+            entity_name,
+        )
+
+    return entities
+
+
+SCALED_SECTION_IDS: tuple[str, ...] = ("heat_circuit", "heat_pump", "buffer_tank", "hot_water_tank")
+
+
+async def _setup_scaling_coordinator(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_api: FakeKebaKeEnergyAPI,
+) -> tuple[KebaKeEnergyDataUpdateCoordinator, Callable[[int], None]]:
+    fake_api.responses = [
+        MULTIPLE_POSITIONS_RESPONSE,
+        HEATING_CURVE_NAMES_RESPONSE,
+        get_multiple_position_fixed_data_response(),
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+    ]
+    fake_api.register_requests("10.0.0.100")
+
+    await setup_integration(hass, config_entry)
+
+    coordinator: KebaKeEnergyDataUpdateCoordinator = config_entry.runtime_data
+    assert coordinator.position is not None
+
+    data: dict[str, Any] = coordinator.data
+    fixed_data: dict[str, Any] = coordinator._fixed_data
+    position: Position = coordinator.position
+
+    def scale(factor: int) -> None:
+        """Generate a synthetic control unit with more heat circuits, heat pumps and tanks."""
+        coordinator.data = scale_positions(data, factor=factor, section_ids=SCALED_SECTION_IDS)
+        coordinator.capabilities = CapabilityTable.from_fixed_data(
+            scale_positions(fixed_data, factor=factor, section_ids=SCALED_SECTION_IDS),
+        )
+        coordinator.position = replace(
+            position,
+            **{section_id: getattr(position, section_id) * factor for section_id in SCALED_SECTION_IDS},
+        )
+
+        for section_id in SCALED_SECTION_IDS:
+            coordinator.__dict__.pop(f"{section_id}_numbers", None)
+
+    return coordinator, scale
+
+
+@pytest.mark.usefixtures("entity_registry_enabled_by_default")
+async def test_entity_setup_scaling(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_api: FakeKebaKeEnergyAPI,
+) -> None:
+    coordinator, scale = await _setup_scaling_coordinator(hass, config_entry, fake_api)
+    results: dict[int, Counter[bool]] = {}
+
+    for factor in (1, 8):
+        scale(factor)
+
+        api_calls: int = fake_api.aioclient_mock.call_count
+        entities: list[Any] = await _setup_scaled_entities(coordinator)
+
+        # The entities are created from the coordinator data without API calls
+        assert fake_api.aioclient_mock.call_count == api_calls
+
+        results[factor] = Counter(entity.section_id in SCALED_SECTION_IDS for entity in entities)
+
+    # The entities of the scaled sections grow with the positions, all other entities are unchanged
+    assert results[8][True] == results[1][True] * 8, f"Entities: {results}"
+    assert results[8][False] == results[1][False], f"Entities: {results}"
+
+
+@pytest.mark.performance
+@pytest.mark.usefixtures("entity_registry_enabled_by_default")
+async def test_entity_setup_scaling_benchmark(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_api: FakeKebaKeEnergyAPI,
+) -> None:
+    coordinator, scale = await _setup_scaling_coordinator(hass, config_entry, fake_api)
+    results: dict[int, tuple[int, float]] = {}
+
+    for factor in (1, 8):
+        scale(factor)
+
+        durations: list[float] = []
+        entities: list[Any] = []
+
+        for _ in range(3):
+            start: float = time.perf_counter()
+            entities = await _setup_scaled_entities(coordinator)
+            durations.append(time.perf_counter() - start)
+
+        results[factor] = len(entities), min(durations)
+
+    entities_1, duration_1 = results[1]
+    entities_8, duration_8 = results[8]
+
+    assert entities_8 > entities_1 * 4
+
+    # The setup time per entity must not grow with the number of entities
+    assert duration_8 / entities_8 < duration_1 / entities_1 * 3, f"Setup times: {results}"
+
+
+async def test_entity_skips_writes_of_current_values(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_api: FakeKebaKeEnergyAPI,
+) -> None:
+    fake_api.responses = [
+        MULTIPLE_POSITIONS_RESPONSE,
+        HEATING_CURVE_NAMES_RESPONSE,
+        get_multiple_position_fixed_data_response(),
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+    ]
+    fake_api.register_requests("10.0.0.100")
+
+    await setup_integration(hass, config_entry)
+
+    coordinator: KebaKeEnergyDataUpdateCoordinator = config_entry.runtime_data
+    entity: Any = next(
+        entity
+        for platform in async_get_platforms(hass, DOMAIN)
+        for entity in platform.entities.values()
+        if entity.entity_id == "select.keba_keenergy_12345678_heat_circuit_operating_mode_2"
+    )
+    current_option: str = entity.current_option
+    other_option: str = next(option for option in entity.options if option != current_option)
+    mock_write_data: AsyncMock = AsyncMock()
+
+    with patch.object(coordinator.api, "write_data", new=mock_write_data):
+        # The control unit already holds the value
+        await entity._async_write_data(
+            entity.entity_description.value(current_option),
+            section=entity.section,
+            device_numbers=entity.device_numbers,
+        )
+
+        mock_write_data.assert_not_awaited()
+        assert coordinator.skipped_writes == 1
+
+        await entity._async_write_data(
+            entity.entity_description.value(other_option),
+            section=entity.section,
+            device_numbers=entity.device_numbers,
+        )
+
+    mock_write_data.assert_awaited_once()
+    assert coordinator.skipped_writes == 1
+    assert entity.current_option == other_option
+
+
+async def test_entity_retries_failed_writes_of_optimistic_values(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_api: FakeKebaKeEnergyAPI,
+) -> None:
+    fake_api.responses = [
+        MULTIPLE_POSITIONS_RESPONSE,
+        HEATING_CURVE_NAMES_RESPONSE,
+        get_multiple_position_fixed_data_response(),
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+    ]
+    fake_api.register_requests("10.0.0.100")
+
+    await setup_integration(hass, config_entry)
+
+    coordinator: KebaKeEnergyDataUpdateCoordinator = config_entry.runtime_data
+    entity: Any = next(
+        entity
+        for platform in async_get_platforms(hass, DOMAIN)
+        for entity in platform.entities.values()
+        if entity.entity_id == "select.keba_keenergy_12345678_heat_circuit_operating_mode_2"
+    )
+    other_option: str = next(option for option in entity.options if option != entity.current_option)
+    mock_write_data: AsyncMock = AsyncMock(side_effect=[APIError("Write failed"), None])
+
+    with patch.object(coordinator.api, "write_data", new=mock_write_data):
+        # The write fails after the optimistic update
+        with pytest.raises(HomeAssistantError):
+            await entity._async_write_data(
+                entity.entity_description.value(other_option),
+                section=entity.section,
+                device_numbers=entity.device_numbers,
+            )
+
+        assert entity.current_option == other_option
+
+        # The optimistic value is not confirmed, so the same value is written again
+        await entity._async_write_data(
+            entity.entity_description.value(other_option),
+            section=entity.section,
+            device_numbers=entity.device_numbers,
+        )
+
+        assert mock_write_data.await_count == 2
+        assert coordinator.skipped_writes == 0
+
+        # The successful write confirms the value
+        await entity._async_write_data(
+            entity.entity_description.value(other_option),
+            section=entity.section,
+            device_numbers=entity.device_numbers,
+        )
+
+    assert mock_write_data.await_count == 2
+    assert coordinator.skipped_writes == 1
+
+
+async def test_entity_optimistic_update_notifies_value_listeners(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_api: FakeKebaKeEnergyAPI,
+) -> None:
+    fake_api.responses = [
+        MULTIPLE_POSITIONS_RESPONSE,
+        HEATING_CURVE_NAMES_RESPONSE,
+        get_multiple_position_fixed_data_response(),
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+    ]
+    fake_api.register_requests("10.0.0.100")
+
+    await setup_integration(hass, config_entry)
+
+    coordinator: KebaKeEnergyDataUpdateCoordinator = config_entry.runtime_data
+    listener: Mock = Mock()
+    value_listener_1: Mock = Mock()
+    value_listener_2: Mock = Mock()
+
+    coordinator.async_add_listener(listener)
+    # A listener of the same key twice is called only once
+    coordinator.async_add_value_listener(
+        value_listener_1,
+        section_id=SectionPrefix.HEAT_CIRCUIT,
+        keys=["operating_mode", "operating_mode"],
+        index=0,
+    )
+    remove_value_listener_2 = coordinator.async_add_value_listener(
+        value_listener_2,
+        section_id=SectionPrefix.HEAT_CIRCUIT,
+        keys=["operating_mode"],
+        index=1,
+    )
+
+    unsub_refresh: Any = coordinator._unsub_refresh
+    coordinator.state_writes = 0
+    coordinator.skipped_state_writes = 0
+
+    with patch.object(coordinator.api, "write_data", new=AsyncMock()):
+        await hass.services.async_call(
+            domain=SELECT_DOMAIN,
+            service=SERVICE_SELECT_OPTION,
+            service_data={
+                ATTR_ENTITY_ID: "select.keba_keenergy_12345678_heat_circuit_operating_mode_1",
+                ATTR_OPTION: "night",
+            },
+            blocking=True,
+        )
+
+    # Only the listeners of the written value are updated
+    listener.assert_not_called()
+    value_listener_1.assert_called_once_with()
+    value_listener_2.assert_not_called()
+
+    # Optimistic updates are not counted as state writes of a coordinator update
+    assert coordinator.state_writes == 0
+    assert coordinator.skipped_state_writes == 0
+
+    # The select and the sensor of the operating mode of heating circuit 1
+    for entity_id in (
+        "select.keba_keenergy_12345678_heat_circuit_operating_mode_1",
+        "sensor.keba_keenergy_12345678_heat_circuit_operating_mode_1",
+    ):
+        state: State | None = hass.states.get(entity_id)
+        assert isinstance(state, State)
+        assert state.state == "night"
+
+    # The schedule of the regular polls is not reset
+    assert coordinator._unsub_refresh is unsub_refresh
+
+    remove_value_listener_2()
+
+    assert (SectionPrefix.HEAT_CIRCUIT, "operating_mode", 1) in coordinator._value_listeners
+    assert len(coordinator._value_listeners[SectionPrefix.HEAT_CIRCUIT, "operating_mode", 1]) == 2
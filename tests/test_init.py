@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from typing import Any
 from typing import TYPE_CHECKING
 
 import pytest
@@ -7,6 +8,7 @@ from homeassistant.config_entries import ConfigEntryState
 from homeassistant.const import CONF_HOST
 from homeassistant.const import CONF_SSL
 
+from custom_components.keba_keenergy.const import DOMAIN
 from tests import setup_integration
 from tests.api_data import HEATING_CURVES_RESPONSE_1_1
 from tests.api_data import HEATING_CURVE_NAMES_RESPONSE
@@ -78,5 +80,36 @@ async def test_unload_entry(
     await setup_integration(hass, config_entry)
 
     assert config_entry.state == ConfigEntryState.LOADED
+    assert len(hass.data[DOMAIN]) == 1
+
     await hass.config_entries.async_unload(config_entry.entry_id)
+
     assert config_entry.state == ConfigEntryState.NOT_LOADED
+    # The poll scheduler is removed with the last entry
+    assert DOMAIN not in hass.data
+
+
+async def test_remove_entry(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_api: FakeKebaKeEnergyAPI,
+    hass_storage: dict[str, Any],
+) -> None:
+    fake_api.responses = [
+        MULTIPLE_POSITIONS_RESPONSE,
+        HEATING_CURVE_NAMES_RESPONSE,
+        get_multiple_position_fixed_data_response(),
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+    ]
+    fake_api.register_requests(config_entry.data[CONF_HOST])
+
+    await setup_integration(hass, config_entry)
+
+    assert f"{DOMAIN}.fixed_data.12345678" in hass_storage
+
+    await hass.config_entries.async_remove(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    # The fixed data cache is removed with the entry
+    assert f"{DOMAIN}.fixed_data.12345678" not in hass_storage
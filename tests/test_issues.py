@@ -3,12 +3,17 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from unittest.mock import patch
 
+import pytest
 from homeassistant.components.select import ATTR_OPTION
 from homeassistant.components.select import DOMAIN as SELECT_DOMAIN
 from homeassistant.components.select import SERVICE_SELECT_OPTION
 from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import State
 from homeassistant.helpers import issue_registry as ir
+from homeassistant.util import dt as dt_util
+from keba_keenergy_api.api import KebaKeEnergyAPI
 
+from custom_components.keba_keenergy.budget import get_iso_week
 from custom_components.keba_keenergy.const import DOMAIN
 from tests import init_translations
 from tests import setup_integration
@@ -175,3 +180,87 @@ async def test_issues_translated(
 
 Sehr häufige Schreibzugriffe (zum Beispiel durch Automationen) können die Lebensdauer des Flash-Speichers des Geräts reduzieren."""  # noqa: E501
     )
+
+
+@pytest.mark.parametrize(
+    "config_entry",
+    [
+        {
+            "options": {
+                "scan_interval": 20,
+                "flash_write_budget": True,
+            },
+        },
+    ],
+    indirect=True,
+)
+async def test_deferred_writes_issue(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_api: FakeKebaKeEnergyAPI,
+) -> None:
+    fake_api.responses = [
+        MULTIPLE_POSITIONS_RESPONSE,
+        HEATING_CURVE_NAMES_RESPONSE,
+        get_multiple_position_fixed_data_response(),
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+    ]
+    fake_api.register_requests("10.0.0.100")
+
+    # Only the automation reserve is left
+    with patch(
+        "homeassistant.helpers.storage.Store.async_load",
+        return_value={
+            "flash_write_counter": {
+                "week": list(get_iso_week(dt_util.now().date())),
+                "count": 20,
+            },
+        },
+    ):
+        await setup_integration(hass, config_entry)
+        translations: dict[str, str] = await init_translations(hass, config_entry, category="issues")
+
+    entity_id: str = "select.keba_keenergy_12345678_buffer_tank_operating_mode_1"
+    state: State | None = hass.states.get(entity_id)
+    assert isinstance(state, State)
+    option: str = state.state
+
+    with patch.object(KebaKeEnergyAPI, "write_data") as mock_write_data:
+        await hass.services.async_call(
+            domain=SELECT_DOMAIN,
+            service=SERVICE_SELECT_OPTION,
+            service_data={
+                ATTR_ENTITY_ID: entity_id,
+                ATTR_OPTION: "heat_up" if option != "heat_up" else "off",
+            },
+            blocking=True,
+        )
+
+    # The deferred value is not applied optimistically
+    mock_write_data.assert_not_called()
+    state = hass.states.get(entity_id)
+    assert isinstance(state, State)
+    assert state.state == option
+
+    issue_registry = ir.async_get(hass)
+
+    issue = issue_registry.async_get_issue(
+        DOMAIN,
+        "deferred_flash_writes",
+    )
+
+    assert issue is not None
+    assert issue.severity == ir.IssueSeverity.WARNING
+
+    title: str = translations[f"component.keba_keenergy.issues.{issue.translation_key}.title"]
+    description: str = translations[f"component.keba_keenergy.issues.{issue.translation_key}.description"].format(
+        **(issue.translation_placeholders or {}),
+    )
+
+    assert title == "Write operations deferred"
+    assert description == (
+        """The flash write budget of this week is exhausted. The automation changes of buffer_tank.operating_mode are not written yet.
+
+The deferred values are written with the next allowed write, at the latest at the beginning of next week."""  # noqa: E501
+    )
@@ -0,0 +1,191 @@
+"""End-to-end performance tests against the simulated Web HMI.
+
+The tests are excluded from the default run, run them with `pytest -m performance`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from statistics import median
+from typing import Any
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.components.number import ATTR_VALUE
+from homeassistant.components.number import DOMAIN as NUMBER_DOMAIN
+from homeassistant.components.number.const import SERVICE_SET_VALUE
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.const import CONF_HOST
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.keba_keenergy.const import DOMAIN
+from custom_components.keba_keenergy.transport import RequestLane
+from tests import setup_integration
+from tests.simulator import KebaKeEnergySimulator
+from tests.simulator import KebaKeEnergySimulatorServer
+from tests.simulator import SimulatorTopology
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+    from _pytest.fixtures import SubRequest
+    from homeassistant.core import HomeAssistant
+    from custom_components.keba_keenergy.coordinator import KebaKeEnergyDataUpdateCoordinator
+
+pytestmark = pytest.mark.performance
+
+SMALL_TOPOLOGY: SimulatorTopology = SimulatorTopology()
+LARGE_TOPOLOGY: SimulatorTopology = SimulatorTopology(
+    heat_circuits=8,
+    heat_pumps=4,
+    hot_water_tanks=4,
+    buffer_tanks=4,
+    solar_circuits=2,
+    external_heat_sources=2,
+    switch_valves=2,
+    photovoltaics=True,
+    heating_curves=8,
+)
+
+POLLS: int = 10
+POLL_DURATION_BUDGET: float = 2
+WRITE_DURATION_BUDGET: float = 0.5
+
+
+@pytest.fixture
+async def simulator_server(request: SubRequest) -> AsyncGenerator[KebaKeEnergySimulatorServer]:
+    """Serve a simulated Web HMI, the simulator options are passed by indirect parametrization."""
+    options: dict[str, Any] = dict(getattr(request, "param", {}))
+    simulator: KebaKeEnergySimulator = KebaKeEnergySimulator(options.pop("topology", None), **options)
+
+    async with KebaKeEnergySimulatorServer(simulator) as server:
+        yield server
+
+
+@pytest.fixture
+def simulator_config_entry(
+    config_entry: MockConfigEntry,
+    simulator_server: KebaKeEnergySimulatorServer,
+) -> MockConfigEntry:
+    """Return the config entry for the simulated Web HMI."""
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title=config_entry.title,
+        data=config_entry.data | {CONF_HOST: simulator_server.address},
+        unique_id=str(simulator_server.simulator.serial_number),
+        options=config_entry.options,
+    )
+
+
+@pytest.mark.parametrize(
+    "simulator_server",
+    [
+        {"topology": SMALL_TOPOLOGY, "latency": 0.005, "jitter": 0.002},
+        {"topology": LARGE_TOPOLOGY, "latency": 0.005, "jitter": 0.002, "cpu_cost_per_key": 0.0001},
+    ],
+    indirect=True,
+    ids=["small", "large"],
+)
+async def test_poll_duration(
+    hass: HomeAssistant,
+    simulator_config_entry: MockConfigEntry,
+    simulator_server: KebaKeEnergySimulatorServer,
+) -> None:
+    await setup_integration(hass, simulator_config_entry)
+
+    coordinator: KebaKeEnergyDataUpdateCoordinator = simulator_config_entry.runtime_data
+    topology: SimulatorTopology = simulator_server.simulator.topology
+
+    assert len(hass.states.async_entity_ids("climate")) == topology.heat_circuits
+    assert len(hass.states.async_entity_ids("water_heater")) == topology.hot_water_tanks
+
+    durations: list[float] = []
+
+    for _ in range(POLLS):
+        start: float = time.monotonic()
+        await coordinator.async_refresh()
+        durations.append(time.monotonic() - start)
+
+        assert coordinator.last_update_success
+
+    assert median(durations) < POLL_DURATION_BUDGET
+    assert simulator_server.simulator.stats.errors == 0
+
+    await hass.config_entries.async_unload(simulator_config_entry.entry_id)
+
+
+@pytest.mark.parametrize(
+    "simulator_server",
+    [{"topology": LARGE_TOPOLOGY, "latency": 0.01, "cpu_cost_per_key": 0.001}],
+    indirect=True,
+)
+@pytest.mark.parametrize(
+    "config_entry",
+    [{"options": {"scan_interval": 20, "request_chunk_size": 50}}],
+    indirect=True,
+)
+@pytest.mark.usefixtures("entity_registry_enabled_by_default")
+async def test_write_during_poll(
+    hass: HomeAssistant,
+    simulator_config_entry: MockConfigEntry,
+    simulator_server: KebaKeEnergySimulatorServer,
+) -> None:
+    await setup_integration(hass, simulator_config_entry)
+
+    coordinator: KebaKeEnergyDataUpdateCoordinator = simulator_config_entry.runtime_data
+    poll: asyncio.Task[None] = hass.async_create_task(coordinator.async_refresh())
+
+    # Wait until the poll is sent to the Web HMI
+    await asyncio.sleep(0.02)
+
+    start: float = time.monotonic()
+    await hass.services.async_call(
+        domain=NUMBER_DOMAIN,
+        service=SERVICE_SET_VALUE,
+        service_data={
+            ATTR_ENTITY_ID: "number.keba_keenergy_12345678_heat_circuit_target_temperature_offset_1",
+            ATTR_VALUE: 0.5,
+        },
+        blocking=True,
+    )
+    duration: float = time.monotonic() - start
+
+    await poll
+
+    assert simulator_server.simulator.values["APPL.CtrlAppl.sParam.heatCircuit[0].param.offsetRoomTemp"] == "0.5"
+    # The write is sent between the chunks of the poll
+    assert duration < WRITE_DURATION_BUDGET
+    assert coordinator.transport.scheduler.stats[RequestLane.INTERACTIVE].requests == 1
+
+    await hass.config_entries.async_unload(simulator_config_entry.entry_id)
+
+
+@pytest.mark.parametrize(
+    "simulator_server",
+    [{"latency": 0.005, "seed": 1}],
+    indirect=True,
+)
+@pytest.mark.no_fail_on_keba_errors
+async def test_poll_with_errors(
+    hass: HomeAssistant,
+    simulator_config_entry: MockConfigEntry,
+    simulator_server: KebaKeEnergySimulatorServer,
+) -> None:
+    await setup_integration(hass, simulator_config_entry)
+
+    # Every second request fails on average
+    simulator_server.simulator.error_rate = 0.5
+
+    coordinator: KebaKeEnergyDataUpdateCoordinator = simulator_config_entry.runtime_data
+    results: list[bool] = []
+
+    for _ in range(POLLS):
+        await coordinator.async_refresh()
+        results.append(coordinator.last_update_success)
+
+    # Failed polls do not break the following polls
+    assert False in results
+    assert True in results
+    assert coordinator.data is not None
+
+    await hass.config_entries.async_unload(simulator_config_entry.entry_id)
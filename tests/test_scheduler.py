@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from keba_keenergy_api.constants import BufferTank
+from keba_keenergy_api.constants import HeatCircuit
+from keba_keenergy_api.constants import HeatPump
+from keba_keenergy_api.constants import PassiveCooling
+from keba_keenergy_api.constants import SectionPrefix
+from keba_keenergy_api.constants import System
+from keba_keenergy_api.endpoints import Position
+
+from custom_components.keba_keenergy.scheduler import AdaptiveTickScheduler
+from custom_components.keba_keenergy.scheduler import EntryPollScheduler
+from custom_components.keba_keenergy.scheduler import RequestPlanner
+from custom_components.keba_keenergy.scheduler import get_request_size
+from custom_components.keba_keenergy.scheduler import get_section_id
+from custom_components.keba_keenergy.scheduler import has_changed
+
+
+@pytest.mark.parametrize(
+    ("section", "expected_section_id"),
+    [
+        (System.CPU_USAGE, "system"),
+        (HeatPump.STATE, "heat_pump"),
+        (PassiveCooling.TEMPERATURE, "passive_cooling"),
+    ],
+)
+def test_get_section_id(section: Any, expected_section_id: str) -> None:
+    assert get_section_id(section) == expected_section_id
+
+
+def test_has_changed_ignores_attributes() -> None:
+    previous: dict[str, Any] = {
+        "heat_pump": {"state": [{"value": "standby", "attributes": {"lower_limit": "0"}}]},
+        "passive_cooling": {"temperature": [{"value": 20.5, "attributes": {}}]},
+    }
+    current: dict[str, Any] = {
+        "heat_pump": {"state": [{"value": "standby", "attributes": {"lower_limit": "1"}}]},
+        "passive_cooling": {"temperature": [{"value": 20.5, "attributes": {}}]},
+    }
+
+    assert not has_changed([HeatPump.STATE, PassiveCooling.TEMPERATURE], previous=previous, current=current)
+
+    current["passive_cooling"]["temperature"][0]["value"] = 21
+
+    assert has_changed([HeatPump.STATE, PassiveCooling.TEMPERATURE], previous=previous, current=current)
+
+
+def test_adaptive_tick_scheduler() -> None:
+    scheduler: AdaptiveTickScheduler = AdaptiveTickScheduler(
+        {SectionPrefix.SYSTEM: 1, SectionPrefix.BUFFER_TANK: 2},
+        max_multiplier=4,
+        stable_polls=2,
+    )
+
+    assert scheduler.as_dict() == {"system": 1, "buffer_tank": 2}
+
+    for _ in range(2):
+        scheduler.observe(SectionPrefix.SYSTEM, changed=False)
+        scheduler.observe(SectionPrefix.BUFFER_TANK, changed=False)
+
+    assert scheduler.as_dict() == {"system": 2, "buffer_tank": 4}
+
+    for _ in range(4):
+        scheduler.observe(SectionPrefix.SYSTEM, changed=False)
+        scheduler.observe(SectionPrefix.BUFFER_TANK, changed=False)
+
+    # The multiplier never exceeds the maximum
+    assert scheduler.as_dict() == {"system": 4, "buffer_tank": 4}
+
+    scheduler.observe(SectionPrefix.SYSTEM, changed=True)
+    scheduler.observe(SectionPrefix.BUFFER_TANK, changed=True)
+    scheduler.observe(SectionPrefix.BUFFER_TANK, changed=True)
+
+    # The multiplier never falls below the configured tick
+    assert scheduler.as_dict() == {"system": 2, "buffer_tank": 2}
+    assert scheduler.multiplier(SectionPrefix.HEAT_PUMP) == 1
+
+
+def test_request_planner() -> None:
+    groups: dict[SectionPrefix, list[Any]] = {
+        SectionPrefix.HEAT_PUMP: [HeatPump.STATE, PassiveCooling.TEMPERATURE],
+        SectionPrefix.BUFFER_TANK: [BufferTank.CURRENT_TOP_TEMPERATURE],
+        SectionPrefix.SYSTEM: [System.CPU_USAGE],
+    }
+    request_planner: RequestPlanner = RequestPlanner(
+        groups,
+        {SectionPrefix.HEAT_PUMP: 1, SectionPrefix.BUFFER_TANK: 2, SectionPrefix.SYSTEM: 3},
+        max_cycle=10,
+    )
+
+    assert request_planner.cycle == 6
+    assert request_planner.full_plan.request == [
+        HeatPump.STATE,
+        PassiveCooling.TEMPERATURE,
+        BufferTank.CURRENT_TOP_TEMPERATURE,
+        System.CPU_USAGE,
+    ]
+    assert [plan.prefixes for plan in request_planner.plans] == [
+        (SectionPrefix.HEAT_PUMP, SectionPrefix.BUFFER_TANK, SectionPrefix.SYSTEM),
+        (SectionPrefix.HEAT_PUMP,),
+        (SectionPrefix.HEAT_PUMP, SectionPrefix.BUFFER_TANK),
+        (SectionPrefix.HEAT_PUMP, SectionPrefix.SYSTEM),
+        (SectionPrefix.HEAT_PUMP, SectionPrefix.BUFFER_TANK),
+        (SectionPrefix.HEAT_PUMP,),
+    ]
+
+    # Plans with the same section groups are shared
+    assert request_planner.plans[0] is request_planner.full_plan
+    assert request_planner.plans[1] is request_planner.plans[5]
+    assert request_planner.get(7) is request_planner.plans[1]
+
+    assert request_planner.as_dict()["plans"][3] == {
+        "phase": 3,
+        "sections": ["heat_pump", "system"],
+        "keys": 3,
+        "values": 3,
+    }
+
+
+def test_request_planner_with_long_cycle() -> None:
+    groups: dict[SectionPrefix, list[Any]] = {
+        SectionPrefix.BUFFER_TANK: [BufferTank.CURRENT_TOP_TEMPERATURE],
+        SectionPrefix.SYSTEM: [System.CPU_USAGE],
+    }
+    request_planner: RequestPlanner = RequestPlanner(
+        groups,
+        {SectionPrefix.BUFFER_TANK: 7, SectionPrefix.SYSTEM: 11},
+        max_cycle=10,
+    )
+
+    assert request_planner.cycle == 77
+    assert request_planner.plans == ()
+    assert request_planner.get(77) is request_planner.full_plan
+    assert request_planner.get(14).prefixes == (SectionPrefix.BUFFER_TANK,)
+    assert request_planner.get(15).request == []
+
+
+def test_get_request_size() -> None:
+    position: Position = Position(
+        heat_pump=2,
+        heat_circuit=3,
+        solar_circuit=0,
+        buffer_tank=0,
+        hot_water_tank=0,
+        external_heat_source=0,
+        switch_valve=0,
+    )
+
+    assert get_request_size([System.CPU_USAGE, System.RAM_USAGE], position=position) == 2
+    assert get_request_size([HeatPump.STATE, PassiveCooling.TEMPERATURE], position=position) == 4
+    assert get_request_size([HeatCircuit.TARGET_TEMPERATURE, HeatCircuit.HEATING_CURVE], position=position) == (
+        3 + 3 * HeatCircuit.HEATING_CURVE.value.quantity
+    )
+    assert get_request_size([BufferTank.CURRENT_TOP_TEMPERATURE], position=position) == 0
+    assert get_request_size([HeatPump.STATE], position=None) == 0
+
+
+@pytest.mark.parametrize(
+    ("multipliers", "weights", "expected_peak"),
+    [
+        (
+            {
+                SectionPrefix.HEAT_PUMP: 4,
+                SectionPrefix.HEAT_CIRCUIT: 4,
+                SectionPrefix.BUFFER_TANK: 4,
+                SectionPrefix.HOT_WATER_TANK: 4,
+            },
+            {
+                SectionPrefix.HEAT_PUMP: 10,
+                SectionPrefix.HEAT_CIRCUIT: 10,
+                SectionPrefix.BUFFER_TANK: 10,
+                SectionPrefix.HOT_WATER_TANK: 10,
+            },
+            10,
+        ),
+        (
+            {
+                SectionPrefix.SYSTEM: 1,
+                SectionPrefix.HEAT_PUMP: 2,
+                SectionPrefix.HEAT_CIRCUIT: 2,
+                SectionPrefix.BUFFER_TANK: 4,
+                SectionPrefix.HOT_WATER_TANK: 4,
+                SectionPrefix.SOLAR_CIRCUIT: 8,
+            },
+            {
+                SectionPrefix.SYSTEM: 8,
+                SectionPrefix.HEAT_PUMP: 56,
+                SectionPrefix.HEAT_CIRCUIT: 88,
+                SectionPrefix.BUFFER_TANK: 24,
+                SectionPrefix.HOT_WATER_TANK: 26,
+                SectionPrefix.SOLAR_CIRCUIT: 22,
+            },
+            110,
+        ),
+        (
+            {
+                SectionPrefix.SYSTEM: 2,
+                SectionPrefix.HEAT_PUMP: 3,
+                SectionPrefix.HEAT_CIRCUIT: 6,
+            },
+            {
+                SectionPrefix.SYSTEM: 10,
+                SectionPrefix.HEAT_PUMP: 10,
+                SectionPrefix.HEAT_CIRCUIT: 10,
+            },
+            20,
+        ),
+    ],
+)
+def test_request_planner_spreads_load_over_cycle(
+    multipliers: dict[SectionPrefix, int],
+    weights: dict[SectionPrefix, int],
+    expected_peak: int,
+) -> None:
+    groups: dict[SectionPrefix, list[Any]] = {prefix: [] for prefix in multipliers}
+    request_planner: RequestPlanner = RequestPlanner(groups, multipliers, max_cycle=720, weights=weights)
+
+    loads: list[int] = [request_planner.get_load(phase) for phase in range(request_planner.cycle)]
+    aligned_loads: list[int] = [
+        sum(weights[prefix] for prefix, multiplier in multipliers.items() if phase % multiplier == 0)
+        for phase in range(request_planner.cycle)
+    ]
+
+    # The total load over the cycle is the same as without offsets, but the peak is lower
+    assert sum(loads) == sum(aligned_loads)
+    assert max(loads) == expected_peak
+    assert max(loads) < max(aligned_loads)
+
+    # Every section group is still requested with its own multiplier
+    for prefix, multiplier in multipliers.items():
+        phases: list[int] = [
+            phase for phase in range(request_planner.cycle) if prefix in request_planner.get(phase).prefixes
+        ]
+
+        assert len(phases) == request_planner.cycle // multiplier
+        assert all(phase % multiplier == request_planner.offsets[prefix] for phase in phases)
+
+
+def test_entry_poll_scheduler() -> None:
+    scheduler: EntryPollScheduler = EntryPollScheduler(max_concurrent_requests=4)
+
+    for entry_id in ("c", "a", "b", "a"):
+        scheduler.add(entry_id)
+
+    # The phases are spread evenly by the order of the entry ids
+    assert len(scheduler) == 3
+    assert [scheduler.get_phase(entry_id, interval=30) for entry_id in ("a", "b", "c")] == [0, 10, 20]
+    assert scheduler.get_phase("unknown", interval=30) == 0
+
+    # The next slot is at least half an interval away
+    assert scheduler.get_delay("b", now=100, interval=30) == pytest.approx(30)
+    assert scheduler.get_delay("b", now=95, interval=30) == pytest.approx(35)
+    assert scheduler.get_delay("c", now=100, interval=30) == pytest.approx(40)
+
+    scheduler.remove("b")
+    scheduler.remove("b")
+
+    assert scheduler.get_phase("c", interval=30) == 15
+    assert scheduler.as_dict("c", interval=30) == {"entries": 2, "phase": 15, "max_concurrent_requests": 4}
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from typing import Any
+
+from custom_components.keba_keenergy.snapshot import AttributeStore
+from custom_components.keba_keenergy.snapshot import carry_forward_attributes
+from custom_components.keba_keenergy.snapshot import merge_snapshot
+from custom_components.keba_keenergy.snapshot import replace_value
+
+
+def get_snapshot() -> dict[str, Any]:
+    return {
+        "system": {
+            "operating_mode": {"value": "auto", "attributes": {"upper_limit": "5"}},
+        },
+        "heat_circuit": {
+            "target_temperature": [
+                {"value": 20.0, "attributes": {"unit": "°C"}},
+                {"value": 21.0, "attributes": {"unit": "°C"}},
+            ],
+            "heating_curve": [
+                [{"value": 1, "attributes": {}}, {"value": 2, "attributes": {}}],
+                [{"value": 3, "attributes": {}}, {"value": 4, "attributes": {}}],
+            ],
+        },
+        "hot_water_tank": {
+            "target_temperature": [{"value": 50.0, "attributes": {"unit": "°C"}}],
+        },
+    }
+
+
+def test_merge_snapshot_shares_skipped_sections() -> None:
+    previous: dict[str, Any] = get_snapshot()
+    response: dict[str, Any] = {
+        "system": {"operating_mode": {"value": "heat", "attributes": {}}},
+        "heat_circuit": {},
+        "hot_water_tank": {},
+    }
+
+    snapshot: dict[str, Any] = merge_snapshot(previous, response)
+
+    assert snapshot["system"]["operating_mode"]["value"] == "heat"
+    assert snapshot["heat_circuit"] is previous["heat_circuit"]
+    assert snapshot["hot_water_tank"] is previous["hot_water_tank"]
+    assert merge_snapshot(None, response) is response
+
+
+def test_merge_snapshot_carries_forward_skipped_keys() -> None:
+    previous: dict[str, Any] = get_snapshot()
+    response: dict[str, Any] = {
+        "heat_circuit": {"target_temperature": [{"value": 22.0, "attributes": {}}, {"value": 23.0, "attributes": {}}]},
+    }
+
+    snapshot: dict[str, Any] = merge_snapshot(previous, response)
+
+    assert snapshot["heat_circuit"]["target_temperature"][0]["value"] == 22.0
+    assert snapshot["heat_circuit"]["heating_curve"] is previous["heat_circuit"]["heating_curve"]
+    assert snapshot["system"] is previous["system"]
+
+
+def test_replace_value_copies_only_the_path() -> None:
+    previous: dict[str, Any] = get_snapshot()
+    snapshot: dict[str, Any] = replace_value(
+        previous,
+        22.5,
+        section_id="heat_circuit",
+        key="target_temperature",
+        index=1,
+        key_index=None,
+    )
+
+    assert snapshot["heat_circuit"]["target_temperature"][1]["value"] == 22.5
+    assert previous["heat_circuit"]["target_temperature"][1]["value"] == 21.0
+
+    assert snapshot is not previous
+    assert snapshot["heat_circuit"] is not previous["heat_circuit"]
+    assert snapshot["system"] is previous["system"]
+    assert snapshot["hot_water_tank"] is previous["hot_water_tank"]
+    assert snapshot["heat_circuit"]["heating_curve"] is previous["heat_circuit"]["heating_curve"]
+    assert snapshot["heat_circuit"]["target_temperature"][0] is previous["heat_circuit"]["target_temperature"][0]
+    assert (
+        snapshot["heat_circuit"]["target_temperature"][1]["attributes"]
+        is previous["heat_circuit"]["target_temperature"][1]["attributes"]
+    )
+
+
+def test_replace_value_with_key_index() -> None:
+    previous: dict[str, Any] = get_snapshot()
+    snapshot: dict[str, Any] = replace_value(
+        previous,
+        5,
+        section_id="heat_circuit",
+        key="heating_curve",
+        index=1,
+        key_index=0,
+    )
+
+    assert snapshot["heat_circuit"]["heating_curve"] == [
+        [{"value": 1, "attributes": {}}, {"value": 2, "attributes": {}}],
+        [{"value": 5, "attributes": {}}, {"value": 4, "attributes": {}}],
+    ]
+    assert previous["heat_circuit"]["heating_curve"][1][0]["value"] == 3
+    assert snapshot["heat_circuit"]["heating_curve"][0] is previous["heat_circuit"]["heating_curve"][0]
+
+
+def test_replace_value_without_position() -> None:
+    previous: dict[str, Any] = get_snapshot()
+    snapshot: dict[str, Any] = replace_value(
+        previous,
+        "heat",
+        section_id="system",
+        key="operating_mode",
+        index=0,
+        key_index=None,
+    )
+
+    assert snapshot["system"]["operating_mode"] == {"value": "heat", "attributes": {"upper_limit": "5"}}
+    assert previous["system"]["operating_mode"]["value"] == "auto"
+
+
+def test_attribute_store() -> None:
+    attribute_store: AttributeStore = AttributeStore(max_size=3)
+
+    first: dict[str, Any] = attribute_store.deduplicate(get_snapshot())
+    second: dict[str, Any] = attribute_store.deduplicate(get_snapshot())
+
+    assert first == get_snapshot()
+    assert second == get_snapshot()
+    assert (
+        first["heat_circuit"]["target_temperature"][0]["attributes"]
+        is first["heat_circuit"]["target_temperature"][1]["attributes"]
+        is second["heat_circuit"]["target_temperature"][0]["attributes"]
+        is second["hot_water_tank"]["target_temperature"][0]["attributes"]
+    )
+    assert len(attribute_store) == 3
+
+    points: dict[str, Any] = {"points": [{"x": 1}]}
+
+    # Unhashable attributes are not stored
+    assert attribute_store.get(points) is points
+    assert len(attribute_store) == 3
+
+    # The least recently used attributes are evicted when the maximum size is reached
+    percent: dict[str, Any] = attribute_store.get({"unit": "%"})
+
+    assert len(attribute_store) == 3
+    assert attribute_store.get({"unit": "°C"}) is first["heat_circuit"]["target_temperature"][0]["attributes"]
+    assert attribute_store.get({}) is first["heat_circuit"]["heating_curve"][0][0]["attributes"]
+    assert attribute_store.get({"upper_limit": "5"}) is not first["system"]["operating_mode"]["attributes"]
+
+    assert len(attribute_store) == 3
+    assert attribute_store.get({"unit": "%"}) is not percent
+
+
+def test_attribute_store_shares_attributes_across_polls() -> None:
+    attribute_store: AttributeStore = AttributeStore(max_size=3)
+    snapshots: list[dict[str, Any]] = []
+
+    for value in range(10):
+        snapshot: dict[str, Any] = get_snapshot()
+        snapshot["system"]["operating_mode"]["attributes"] = {"upper_limit": str(value)}
+        snapshots.append(attribute_store.deduplicate(snapshot))
+
+        # The size is bounded and the attributes in use are not evicted
+        assert len(attribute_store) == 3
+
+    previous, current = snapshots[-2:]
+
+    assert (
+        previous["heat_circuit"]["target_temperature"][0]["attributes"]
+        is current["heat_circuit"]["target_temperature"][0]["attributes"]
+    )
+    assert (
+        previous["heat_circuit"]["heating_curve"][1][1]["attributes"]
+        is current["heat_circuit"]["heating_curve"][1][1]["attributes"]
+    )
+
+
+def test_carry_forward_attributes() -> None:
+    previous: dict[str, Any] = get_snapshot()
+    previous["system"]["operating_mode"]["attributes"] = {"upper_limit": "5", "raw_value": 1}
+    response: dict[str, Any] = {
+        "system": {"operating_mode": {"value": "heat", "attributes": {"raw_value": 2}}},
+        "heat_circuit": {
+            "target_temperature": [{"value": 22.0, "attributes": {}}, {"value": 23.0, "attributes": {}}],
+            "heating_curve": [
+                [{"value": 5, "attributes": {}}, {"value": 6, "attributes": {}}],
+                [{"value": 7, "attributes": {}}, {"value": 8, "attributes": {}}],
+            ],
+        },
+        "hot_water_tank": {"target_temperature": [{"value": 52.0, "attributes": {}}]},
+    }
+
+    snapshot: dict[str, Any] = carry_forward_attributes(previous, response)
+
+    assert snapshot["system"]["operating_mode"]["attributes"] == {"upper_limit": "5", "raw_value": 2}
+    assert (
+        snapshot["heat_circuit"]["target_temperature"][1]["attributes"]
+        is previous["heat_circuit"]["target_temperature"][1]["attributes"]
+    )
+    assert (
+        snapshot["heat_circuit"]["heating_curve"][1][0]["attributes"]
+        is previous["heat_circuit"]["heating_curve"][1][0]["attributes"]
+    )
+    assert snapshot["hot_water_tank"]["target_temperature"][0]["value"] == 52.0
+    assert snapshot["hot_water_tank"]["target_temperature"][0]["attributes"] == {"unit": "°C"}
+    assert carry_forward_attributes(None, response) is response
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock
+from unittest.mock import patch
+
+import pytest
+from aiohttp import ClientSession
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from homeassistant.const import CONF_HOST
+
+from custom_components.keba_keenergy.const import DOMAIN
+from custom_components.keba_keenergy.traffic import TrafficExchange
+from custom_components.keba_keenergy.traffic import TrafficRecorder
+from custom_components.keba_keenergy.traffic import load_traffic
+from tests import setup_integration
+from tests.api_data import DEVICE_INFO_RESPONSE
+from tests.api_data import FILTER_REQUESTS
+from tests.api_data import HEATING_CURVES_RESPONSE_1_1
+from tests.api_data import HEATING_CURVE_NAMES_RESPONSE
+from tests.api_data import HMI_RESPONSE
+from tests.api_data import MULTIPLE_POSITIONS_RESPONSE
+from tests.api_data import MULTIPLE_POSITION_DATA_RESPONSE_1
+from tests.api_data import SYSTEM_RESPONSE
+from tests.api_data import TIMEZONE_RESPONSE
+from tests.api_data import get_multiple_position_fixed_data_response
+from tests.replay import TrafficReplay
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+    from tests.conftest import FakeKebaKeEnergyAPI
+
+
+def _exchange(path: str, response: Any, /, *, request: str | None = None, duration: float = 0) -> TrafficExchange:
+    return TrafficExchange(
+        time=0,
+        duration=duration,
+        method="POST",
+        path=path,
+        request=request,
+        status=200,
+        response=json.dumps(response),
+    )
+
+
+async def test_record_traffic(tmp_path: Path) -> None:
+    async def handle_read_write_vars(request: web.Request) -> web.Response:
+        return web.json_response([{"name": await request.text(), "value": "1"}])
+
+    app: web.Application = web.Application()
+    app.router.add_post("/var/readWriteVars", handle_read_write_vars)
+
+    recorder: TrafficRecorder = TrafficRecorder(max_exchanges=2)
+
+    async with TestServer(app) as server, ClientSession(trace_configs=[recorder.trace_config]) as session:
+        for name in ("APPL.CtrlAppl.sParam.param.operatingMode", "APPL.CtrlAppl.sParam.param.activeOpMode"):
+            async with session.post(server.make_url("/var/readWriteVars?action=get"), data=name) as response:
+                # The response can still be read after the recording
+                assert await response.json() == [{"name": name, "value": "1"}]
+
+        async with session.post(server.make_url("/var/readWriteVars"), data="[]") as response:
+            assert response.status == 200
+
+    # Only the last exchanges are kept
+    assert [(exchange.path, exchange.request, exchange.status) for exchange in recorder.exchanges] == [
+        ("/var/readWriteVars?action=get", "APPL.CtrlAppl.sParam.param.activeOpMode", 200),
+        ("/var/readWriteVars", "[]", 200),
+    ]
+    assert recorder.exchanges[0].time <= recorder.exchanges[1].time
+    assert recorder.exchanges[0].duration >= 0
+
+    path: Path = tmp_path / "traffic.jsonl.gz"
+    recorder.save(path)
+
+    loaded: list[TrafficExchange] = load_traffic(path)
+
+    assert [(exchange.method, exchange.path, exchange.request, exchange.response) for exchange in loaded] == [
+        (exchange.method, exchange.path, exchange.request, exchange.response) for exchange in recorder.exchanges
+    ]
+
+
+async def test_record_traffic_undecodable_response() -> None:
+    async def handle_read_write_vars(_request: web.Request) -> web.Response:
+        return web.Response(body=b"\xff\xfe", content_type="application/json", charset="utf-8")
+
+    app: web.Application = web.Application()
+    app.router.add_post("/var/readWriteVars", handle_read_write_vars)
+
+    recorder: TrafficRecorder = TrafficRecorder(max_exchanges=2)
+
+    async with (
+        TestServer(app) as server,
+        ClientSession(trace_configs=[recorder.trace_config]) as session,
+        session.post(server.make_url("/var/readWriteVars"), data="[]") as response,
+    ):
+        # The failed recording does not fail the request
+        assert await response.read() == b"\xff\xfe"
+
+    assert not recorder.exchanges
+
+
+async def test_replay_traffic() -> None:
+    replay: TrafficReplay = TrafficReplay(
+        [
+            _exchange("/var/readWriteVars", [{"value": "1"}], request="a", duration=0.2),
+            _exchange("/var/readWriteVars", [{"value": "2"}], request="b", duration=0.4),
+            _exchange("/var/readWriteVars", [{"value": "3"}], request="a", duration=0.6),
+        ],
+        speed=None,
+    )
+
+    # Equal requests are served in the recorded order, other requests by the next exchange
+    assert replay.get("POST", "/var/readWriteVars", "b").response == '[{"value": "2"}]'
+    assert replay.get("POST", "/var/readWriteVars", "c").response == '[{"value": "3"}]'
+
+    # The last exchange is repeated
+    assert replay.get("POST", "/var/readWriteVars", "a").response == '[{"value": "3"}]'
+
+    with pytest.raises(LookupError):
+        replay.get("POST", "/var/readVarChildren", None)
+
+    # The recorded duration is accelerated by the speed
+    replay = TrafficReplay(replay._exchanges["POST", "/var/readWriteVars"], speed=10)
+
+    with patch("custom_components.keba_keenergy.traffic.sleep", new=AsyncMock()) as mock_sleep:
+        await replay.async_respond("POST", "/var/readWriteVars", "b")
+
+    mock_sleep.assert_awaited_once_with(pytest.approx(0.04))
+
+
+async def test_replay_traffic_integration(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_api: FakeKebaKeEnergyAPI,
+) -> None:
+    replay: TrafficReplay = TrafficReplay(
+        [
+            _exchange("/deviceControl?action=getDeviceInfo", DEVICE_INFO_RESPONSE),
+            _exchange("/swupdate?action=getSystemInstalled", SYSTEM_RESPONSE),
+            _exchange("/swupdate?action=getHmiInstalled", HMI_RESPONSE),
+            _exchange("/dateTime?action=getTimeZone", TIMEZONE_RESPONSE),
+            _exchange("/var/readVarChildren", FILTER_REQUESTS),
+            *(
+                _exchange("/var/readWriteVars", response)
+                for response in (
+                    MULTIPLE_POSITIONS_RESPONSE,
+                    HEATING_CURVE_NAMES_RESPONSE,
+                    get_multiple_position_fixed_data_response(),
+                    MULTIPLE_POSITION_DATA_RESPONSE_1,
+                    *HEATING_CURVES_RESPONSE_1_1,
+                )
+            ),
+        ],
+        speed=None,
+    )
+    fake_api.register_replay(config_entry.data[CONF_HOST], replay)
+
+    await setup_integration(hass, config_entry)
+
+    state = hass.states.get("sensor.keba_keenergy_12345678_heat_circuit_operating_mode_1")
+    assert state is not None
+    assert state.state == "day"
+
+
+@pytest.mark.parametrize(
+    "config_entry",
+    [
+        {
+            "options": {
+                "scan_interval": 20,
+                "record_traffic": True,
+            },
+        },
+    ],
+    indirect=True,
+)
+async def test_record_traffic_option(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_api: FakeKebaKeEnergyAPI,
+    tmp_path: Path,
+) -> None:
+    hass.config.config_dir = str(tmp_path)
+    fake_api.responses = [
+        MULTIPLE_POSITIONS_RESPONSE,
+        HEATING_CURVE_NAMES_RESPONSE,
+        get_multiple_position_fixed_data_response(),
+        MULTIPLE_POSITION_DATA_RESPONSE_1,
+        *HEATING_CURVES_RESPONSE_1_1,
+    ]
+    fake_api.register_requests(config_entry.data[CONF_HOST])
+
+    await setup_integration(hass, config_entry)
+
+    assert config_entry.runtime_data.traffic_recorder is not None
+
+    await hass.config_entries.async_unload(config_entry.entry_id)
+
+    # The recording is saved when the entry is unloaded
+    path: Path = tmp_path / f"{DOMAIN}.traffic.{config_entry.unique_id}.jsonl.gz"
+    assert await hass.async_add_executor_job(load_traffic, path) == []
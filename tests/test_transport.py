@@ -0,0 +1,353 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+from keba_keenergy_api.constants import BufferTank
+from keba_keenergy_api.constants import HeatCircuit
+from keba_keenergy_api.constants import HeatPump
+from keba_keenergy_api.constants import PassiveCooling
+from keba_keenergy_api.constants import Section
+from keba_keenergy_api.constants import SectionPrefix
+from keba_keenergy_api.constants import System
+from keba_keenergy_api.endpoints import Position
+from keba_keenergy_api.error import APIError
+
+from custom_components.keba_keenergy.scheduler import get_section_id
+from custom_components.keba_keenergy.transport import ChunkSizeTuner
+from custom_components.keba_keenergy.transport import KebaKeEnergyTransport
+from custom_components.keba_keenergy.transport import RequestLane
+from custom_components.keba_keenergy.transport import RequestScheduler
+from custom_components.keba_keenergy.transport import split_request
+
+POSITION: Position = Position(
+    heat_pump=2,
+    heat_circuit=4,
+    solar_circuit=0,
+    buffer_tank=1,
+    hot_water_tank=0,
+    external_heat_source=0,
+    switch_valve=0,
+)
+
+REQUEST: list[Section] = [
+    System.CPU_USAGE,
+    System.RAM_USAGE,
+    HeatPump.STATE,
+    HeatPump.FLOW_TEMPERATURE,
+    PassiveCooling.TEMPERATURE,
+    HeatCircuit.TARGET_TEMPERATURE,
+    HeatCircuit.HEATING_CURVE,
+    BufferTank.CURRENT_TOP_TEMPERATURE,
+]
+
+
+class FakeReadAPI:
+    def __init__(self, *, delay: float = 0.01, fail_on: Section | None = None) -> None:
+        self.delay: float = delay
+        self.fail_on: Section | None = fail_on
+        self.requests: list[list[Section]] = []
+        self.running: int = 0
+        self.max_running: int = 0
+        self.cancelled: int = 0
+
+    async def read_data(
+        self,
+        *,
+        request: list[Section],
+        position: Position | None,  # noqa: ARG002
+        extra_attributes: bool,  # noqa: ARG002
+    ) -> dict[str, Any]:
+        self.requests.append(request)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+
+        try:
+            if self.fail_on in request:
+                msg: str = "boom"
+                raise APIError(msg)
+
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.running -= 1
+
+        response: dict[str, Any] = {prefix.value: {} for prefix in SectionPrefix}
+
+        for section in request:
+            response[get_section_id(section)][section.name.lower()] = [{"value": 1, "attributes": {}}]
+
+        return response
+
+
+@pytest.mark.parametrize(
+    ("chunk_size", "expected_chunks"),
+    [
+        (0, [REQUEST]),
+        (
+            6,
+            [
+                [System.CPU_USAGE, System.RAM_USAGE, HeatPump.STATE, HeatPump.FLOW_TEMPERATURE],
+                [PassiveCooling.TEMPERATURE, HeatCircuit.TARGET_TEMPERATURE],
+                [HeatCircuit.HEATING_CURVE, BufferTank.CURRENT_TOP_TEMPERATURE],
+            ],
+        ),
+        (
+            3,
+            [
+                [System.CPU_USAGE, System.RAM_USAGE],
+                [HeatPump.STATE],
+                [HeatPump.FLOW_TEMPERATURE],
+                [PassiveCooling.TEMPERATURE],
+                # A section with more values than the chunk size is not split
+                [HeatCircuit.TARGET_TEMPERATURE],
+                [HeatCircuit.HEATING_CURVE],
+                [BufferTank.CURRENT_TOP_TEMPERATURE],
+            ],
+        ),
+        (1000, [REQUEST]),
+    ],
+)
+def test_split_request(chunk_size: int, expected_chunks: list[list[Section]]) -> None:
+    assert split_request(REQUEST, chunk_size=chunk_size, position=POSITION) == expected_chunks
+    assert split_request([], chunk_size=chunk_size, position=POSITION) == []
+
+
+async def test_transport_reads_chunks_with_concurrency_limit() -> None:
+    api: FakeReadAPI = FakeReadAPI()
+    transport: KebaKeEnergyTransport = KebaKeEnergyTransport(api, chunk_size=2, max_concurrency=2)  # type: ignore[arg-type]
+
+    response: dict[str, Any] = await transport.read_data(REQUEST, position=POSITION)
+
+    assert len(api.requests) == 7
+    assert api.max_running == 2
+    assert sorted(response["system"]) == ["cpu_usage", "ram_usage"]
+    assert sorted(response["heat_pump"]) == ["flow_temperature", "state"]
+    assert sorted(response["heat_circuit"]) == ["heating_curve", "target_temperature"]
+    assert list(response["passive_cooling"]) == ["temperature"]
+    assert list(response["buffer_tank"]) == ["current_top_temperature"]
+    assert response["solar_circuit"] == {}
+
+
+async def test_transport_without_chunks() -> None:
+    api: FakeReadAPI = FakeReadAPI()
+    transport: KebaKeEnergyTransport = KebaKeEnergyTransport(api, chunk_size=0, max_concurrency=2)  # type: ignore[arg-type]
+
+    await transport.read_data(REQUEST, position=POSITION)
+
+    assert api.requests == [REQUEST]
+    assert transport.as_dict() == {
+        "chunk_size": 0,
+        "max_concurrency": 2,
+        "tuner": None,
+        "lanes": {
+            "interactive": {
+                "requests": 0,
+                "queue_depth": 0,
+                "max_queue_depth": 0,
+                "mean_wait_ms": 0,
+                "max_wait_ms": 0,
+            },
+            "background": {
+                "requests": 1,
+                "queue_depth": 0,
+                "max_queue_depth": 0,
+                "mean_wait_ms": pytest.approx(0, abs=5),
+                "max_wait_ms": pytest.approx(0, abs=5),
+            },
+        },
+    }
+
+
+async def test_request_scheduler_serves_interactive_lane_first() -> None:
+    scheduler: RequestScheduler = RequestScheduler(max_concurrency=1)
+    order: list[str] = []
+
+    async def send(name: str, lane: RequestLane) -> None:
+        async with scheduler.slot(lane):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    tasks: list[asyncio.Task[None]] = [
+        asyncio.create_task(send(f"poll {index}", RequestLane.BACKGROUND)) for index in range(3)
+    ]
+    await asyncio.sleep(0)
+
+    cancelled: asyncio.Task[None] = asyncio.create_task(send("cancelled", RequestLane.INTERACTIVE))
+    tasks.append(asyncio.create_task(send("write", RequestLane.INTERACTIVE)))
+    await asyncio.sleep(0)
+
+    # A cancelled request gives up its place in the queue
+    cancelled.cancel()
+    await asyncio.gather(*tasks)
+
+    # The write is sent after the running request and before the waiting polls
+    assert order == ["poll 0", "write", "poll 1", "poll 2"]
+
+    stats: dict[str, Any] = scheduler.as_dict()
+
+    assert stats["interactive"]["requests"] == 1
+    assert stats["interactive"]["max_queue_depth"] == 2
+    assert stats["background"]["requests"] == 3
+    assert stats["background"]["max_queue_depth"] == 2
+    assert stats["background"]["queue_depth"] == 0
+    assert stats["background"]["max_wait_ms"] >= stats["interactive"]["max_wait_ms"]
+
+
+async def test_transport_yields_between_chunks() -> None:
+    api: FakeReadAPI = FakeReadAPI()
+    transport: KebaKeEnergyTransport = KebaKeEnergyTransport(api, chunk_size=2, max_concurrency=1)  # type: ignore[arg-type]
+
+    poll: asyncio.Task[dict[str, Any]] = asyncio.create_task(transport.read_data(REQUEST, position=POSITION))
+    await asyncio.sleep(0.005)
+
+    await transport.read_data([PassiveCooling.TEMPERATURE], position=POSITION, lane=RequestLane.INTERACTIVE)
+    await poll
+
+    # The interactive read is sent after the first chunk of the poll
+    assert len(api.requests) == 8
+    assert api.requests[1] == [PassiveCooling.TEMPERATURE]
+    assert api.max_running == 1
+
+
+async def test_transports_share_request_limit() -> None:
+    api: FakeReadAPI = FakeReadAPI()
+    request_limit: asyncio.Semaphore = asyncio.Semaphore(1)
+    transports: list[KebaKeEnergyTransport] = [
+        KebaKeEnergyTransport(api, chunk_size=2, max_concurrency=2, request_limit=request_limit)  # type: ignore[arg-type]
+        for _ in range(2)
+    ]
+
+    await asyncio.gather(*(transport.read_data(REQUEST, position=POSITION) for transport in transports))
+
+    assert len(api.requests) == 14
+    assert api.max_running == 1
+
+    # Interactive requests do not wait for other control units
+    async with request_limit:
+        await transports[0].read_data([PassiveCooling.TEMPERATURE], position=POSITION, lane=RequestLane.INTERACTIVE)
+
+
+async def test_interactive_request_does_not_wait_for_other_control_units() -> None:
+    api_a: FakeReadAPI = FakeReadAPI()
+    api_b: FakeReadAPI = FakeReadAPI(delay=0.5)
+    request_limit: asyncio.Semaphore = asyncio.Semaphore(1)
+    transport_a: KebaKeEnergyTransport = KebaKeEnergyTransport(
+        api_a,  # type: ignore[arg-type]
+        chunk_size=0,
+        max_concurrency=1,
+        request_limit=request_limit,
+    )
+    transport_b: KebaKeEnergyTransport = KebaKeEnergyTransport(
+        api_b,  # type: ignore[arg-type]
+        chunk_size=0,
+        max_concurrency=1,
+        request_limit=request_limit,
+    )
+
+    poll_b: asyncio.Task[dict[str, Any]] = asyncio.create_task(transport_b.read_data(REQUEST, position=POSITION))
+    await asyncio.sleep(0)
+    poll_a: asyncio.Task[dict[str, Any]] = asyncio.create_task(transport_a.read_data(REQUEST, position=POSITION))
+    await asyncio.sleep(0)
+
+    # The queued poll of control unit A waits for the shared limit without holding the slot of A
+    await asyncio.wait_for(
+        transport_a.read_data([PassiveCooling.TEMPERATURE], position=POSITION, lane=RequestLane.INTERACTIVE),
+        timeout=0.25,
+    )
+
+    assert api_a.requests == [[PassiveCooling.TEMPERATURE]]
+    assert api_b.running == 1
+    assert not poll_a.done()
+
+    await asyncio.gather(poll_a, poll_b)
+
+    assert api_a.requests == [[PassiveCooling.TEMPERATURE], REQUEST]
+
+
+async def test_transport_cancels_chunks_on_error() -> None:
+    api: FakeReadAPI = FakeReadAPI(fail_on=System.CPU_USAGE)
+    transport: KebaKeEnergyTransport = KebaKeEnergyTransport(api, chunk_size=2, max_concurrency=4)  # type: ignore[arg-type]
+
+    with pytest.raises(APIError):
+        await transport.read_data(REQUEST, position=POSITION)
+
+    # The running chunks are cancelled and the waiting chunks are never sent
+    assert api.running == 0
+    assert api.cancelled == len(api.requests) - 1
+    assert len(api.requests) < len(split_request(REQUEST, chunk_size=2, position=POSITION))
+
+
+def test_chunk_size_tuner() -> None:
+    tuner: ChunkSizeTuner = ChunkSizeTuner((0, 50, 100), samples=2, retune_interval=3)
+    latencies: dict[int, float] = {0: 3.0, 50: 1.0, 100: 2.0}
+    chunk_sizes: list[int] = []
+
+    for _ in range(6):
+        assert tuner.as_dict()["tuning"] is True
+        chunk_size: int = tuner.get_chunk_size("plan")
+        chunk_sizes.append(chunk_size)
+        tuner.record(chunk_size, plan="plan", values=100, duration=latencies[chunk_size])
+
+        # Other plans are not compared with the plan
+        tuner.record(tuner.get_chunk_size("other"), plan="other", values=10, duration=100.0)
+
+    # The candidates take turns on the reads of the plan
+    assert chunk_sizes == [0, 50, 100, 0, 50, 100]
+    assert tuner.best_chunk_size == 50
+    assert tuner.chunk_size == 50
+    assert tuner.get_chunk_size("other") == 50
+    assert tuner.as_dict() == {
+        "best_chunk_size": 50,
+        "tuning": False,
+        "latency_per_value": {"0": 0.03, "50": 0.01, "100": 0.02},
+    }
+
+    # Empty requests are not recorded
+    tuner.record(50, plan="plan", values=0, duration=1.0)
+
+    for _ in range(3):
+        tuner.record(50, plan="plan", values=100, duration=1.0)
+
+    # Start tuning again after the retune interval
+    assert tuner.as_dict()["tuning"] is True
+    assert tuner.get_chunk_size("plan") == 0
+
+
+async def test_transport_with_chunk_size_tuner() -> None:
+    api: FakeReadAPI = FakeReadAPI(delay=0)
+    tuner: ChunkSizeTuner = ChunkSizeTuner((0, 4), samples=1, retune_interval=100)
+    request_limit: asyncio.Semaphore = asyncio.Semaphore(1)
+    transport: KebaKeEnergyTransport = KebaKeEnergyTransport(  # type: ignore[arg-type]
+        api,
+        chunk_size=0,
+        max_concurrency=1,
+        tuner=tuner,
+        request_limit=request_limit,
+    )
+
+    await transport.read_data(REQUEST, position=POSITION)
+
+    assert len(api.requests) == 1
+
+    # Interactive reads are not measured
+    await transport.read_data([PassiveCooling.TEMPERATURE], position=POSITION, lane=RequestLane.INTERACTIVE)
+
+    assert tuner.as_dict()["tuning"] is True
+
+    # The wait for the shared request limit is not measured
+    async with request_limit:
+        read: asyncio.Task[Any] = asyncio.create_task(transport.read_data(REQUEST, position=POSITION))
+        await asyncio.sleep(0.1)
+
+    await read
+
+    assert len(api.requests) > 3
+    assert tuner.best_chunk_size in {0, 4}
+    assert all(
+        latency_per_value is not None and latency_per_value < 0.1 / len(REQUEST)
+        for latency_per_value in tuner.as_dict()["latency_per_value"].values()
+    )
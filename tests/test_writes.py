@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from typing import Any
+from typing import TYPE_CHECKING
+
+import pytest
+from keba_keenergy_api.constants import HeatCircuit
+from keba_keenergy_api.constants import Section
+from keba_keenergy_api.constants import System
+
+from custom_components.keba_keenergy.writes import WriteBatch
+from custom_components.keba_keenergy.writes import merge_write_request
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+def test_merge_write_request() -> None:
+    target: dict[Section, Any] = {
+        System.OPERATING_MODE: 1,
+        HeatCircuit.TARGET_TEMPERATURE_DAY: [20, None, None],
+    }
+
+    merge_write_request(target, {HeatCircuit.TARGET_TEMPERATURE_DAY: [None, None, 22]})
+    merge_write_request(target, {HeatCircuit.TARGET_TEMPERATURE_DAY: (21, None, None)})
+    merge_write_request(target, {System.OPERATING_MODE: 3, HeatCircuit.TARGET_TEMPERATURE_NIGHT: [None, 16]})
+
+    assert target == {
+        System.OPERATING_MODE: 3,
+        HeatCircuit.TARGET_TEMPERATURE_DAY: [21, None, 22],
+        HeatCircuit.TARGET_TEMPERATURE_NIGHT: [None, 16],
+    }
+
+
+def test_merge_write_request_replaces_mismatched_values() -> None:
+    target: dict[Section, Any] = {HeatCircuit.TARGET_TEMPERATURE_DAY: [20, None]}
+
+    merge_write_request(target, {HeatCircuit.TARGET_TEMPERATURE_DAY: 21})
+
+    assert target == {HeatCircuit.TARGET_TEMPERATURE_DAY: 21}
+
+
+async def test_write_batch() -> None:
+    batch: WriteBatch = WriteBatch()
+
+    first: asyncio.Future[bool] = batch.add({System.OPERATING_MODE: 1}, ignore_weekly_write_count=True)
+    second: asyncio.Future[bool] = batch.add({HeatCircuit.OPERATING_MODE: [None, 2]}, ignore_weekly_write_count=False)
+
+    assert len(batch) == 2
+    assert batch.request == {System.OPERATING_MODE: 1, HeatCircuit.OPERATING_MODE: [None, 2]}
+    assert batch.ignore_weekly_write_count is False
+
+    batch.set_result()
+
+    assert await first is True
+    assert await second is True
+
+
+async def test_write_batch_deferred() -> None:
+    batch: WriteBatch = WriteBatch()
+
+    future: asyncio.Future[bool] = batch.add({System.OPERATING_MODE: 1}, ignore_weekly_write_count=False)
+
+    batch.set_result(written=False)
+
+    assert await future is False
+
+
+async def test_write_batch_exception() -> None:
+    batch: WriteBatch = WriteBatch()
+
+    futures: list[asyncio.Future[bool]] = [
+        batch.add({System.OPERATING_MODE: 1}, ignore_weekly_write_count=True),
+        batch.add({System.OPERATING_MODE: 2}, ignore_weekly_write_count=True),
+    ]
+
+    assert batch.ignore_weekly_write_count is True
+
+    batch.set_exception(ValueError("Write failed"))
+
+    for future in futures:
+        with pytest.raises(ValueError, match="Write failed"):
+            await future